@@ -3,18 +3,22 @@ from datetime import datetime
 from colorama import Fore, Style
 
 from autogpt.app import execute_command, get_command
+from autogpt.commands import web_requests
 from autogpt.config import Config
 from autogpt.json_utils.json_fix_llm import fix_json_using_multiple_techniques
 from autogpt.json_utils.utilities import LLM_DEFAULT_RESPONSE_FORMAT, validate_json
 from autogpt.llm import chat_with_ai, create_chat_completion, create_chat_message
+from autogpt.llm.api_manager import ApiManager
 from autogpt.llm.token_counter import count_string_tokens
 from autogpt.log_cycle.log_cycle import (
+    API_USAGE_FILE_NAME,
     FULL_MESSAGE_HISTORY_FILE_NAME,
     NEXT_ACTION_FILE_NAME,
     USER_INPUT_FILE_NAME,
     LogCycleHandler,
 )
 from autogpt.logs import logger, print_assistant_thoughts
+from autogpt.prompts.system_prompt import SystemPrompt
 from autogpt.speech import say_text
 from autogpt.spinner import Spinner
 from autogpt.utils import clean_input
@@ -92,6 +96,8 @@ class Agent:
             # Discontinue if continuous limit is reached
             self.cycle_count += 1
             self.log_cycle_handler.log_count_within_cycle = 0
+            ApiManager().start_cycle()
+            web_requests.start_cycle()
             self.log_cycle_handler.log_cycle(
                 self.config.ai_name,
                 self.created_at,
@@ -107,7 +113,11 @@ class Agent:
                 logger.typewriter_log(
                     "Continuous Limit Reached: ", Fore.YELLOW, f"{cfg.continuous_limit}"
                 )
+                self._log_api_usage()
                 break
+            # Rebuild the system prompt only if commands or plugins have changed
+            if isinstance(self.system_prompt, SystemPrompt):
+                self.system_prompt = self.config.get_system_prompt()
             # Send message to AI, get response
             with Spinner("Thinking... "):
                 assistant_reply = chat_with_ai(
@@ -233,6 +243,7 @@ class Agent:
                     )
                 elif user_input == "EXIT":
                     logger.info("Exiting...")
+                    self._log_api_usage()
                     break
             else:
                 # Print authorized commands left value
@@ -294,6 +305,18 @@ class Agent:
                     "SYSTEM: ", Fore.YELLOW, "Unable to execute command"
                 )
 
+            self._log_api_usage()
+
+    def _log_api_usage(self) -> None:
+        # Called at the end of every cycle, including the ones that stop the loop
+        self.log_cycle_handler.log_cycle(
+            self.config.ai_name,
+            self.created_at,
+            self.cycle_count,
+            ApiManager().get_cycle_breakdown(),
+            API_USAGE_FILE_NAME,
+        )
+
     def _resolve_pathlike_command_args(self, command_args):
         if "directory" in command_args and command_args["directory"] in {"", "/"}:
             command_args["directory"] = str(self.workspace.root)
@@ -0,0 +1,225 @@
+"""A pool of warm webdrivers shared by the browsing commands."""
+from __future__ import annotations
+
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from autogpt.logs import logger
+
+
+@dataclass
+class _PooledDriver:
+    driver: WebDriver
+    pages: int = 0
+
+
+class BrowserPool:
+    """
+    Keeps up to `size` webdrivers running, so a command does not wait for a
+    browser to start.
+
+    A command acquires a driver and releases it when done. Released drivers are
+    reset before they are handed out again: their cookies and the storage of the
+    last page are cleared, extra windows are closed and they are left on a blank
+    page. A driver is quit and replaced after `max_pages` commands, when it can
+    no longer be reset or when it stops responding, as browsers leak memory
+    and crash over time. Replacements are started in the background.
+
+    Drivers are created on first use. The pool quits all drivers at exit.
+    """
+
+    def __init__(
+        self, create_driver: Callable[[], WebDriver], size: int, max_pages: int
+    ) -> None:
+        """
+        Args:
+            create_driver: Starts a new webdriver.
+            size: The maximum number of drivers running at the same time.
+            max_pages: The number of commands after which a driver is replaced,
+                0 to keep drivers until they crash.
+        """
+        self.create_driver = create_driver
+        self.size = size
+        self.max_pages = max_pages
+        self.created = 0
+        self.recycled = 0
+        self._idle: List[_PooledDriver] = []
+        self._in_use: Dict[int, _PooledDriver] = {}
+        # The number of drivers running or starting
+        self._running = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._warming: Optional[threading.Thread] = None
+        atexit.register(self.shutdown)
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Get a driver, starting one if none is idle and the pool is not full.
+
+        Args:
+            timeout: The number of seconds to wait for a driver when all are in
+                use, None to wait until one is released.
+
+        Returns:
+            The driver, to be given back with release.
+
+        Raises:
+            TimeoutError: If no driver was released within the timeout.
+            RuntimeError: If the pool was shut down.
+        """
+        while True:
+            with self._condition:
+                pooled = self._take(timeout)
+            if pooled is None:
+                pooled = self._start()
+            elif not _is_alive(pooled.driver):
+                logger.debug("Replacing a webdriver that stopped responding")
+                self._discard(pooled)
+                continue
+            with self._condition:
+                self._in_use[id(pooled.driver)] = pooled
+            return pooled.driver
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Give a driver back to the pool, resetting or replacing it.
+
+        Drivers that were not acquired from the pool are quit.
+        """
+        with self._condition:
+            pooled = self._in_use.pop(id(driver), None)
+        if pooled is None:
+            _quit(driver)
+            return
+
+        pooled.pages += 1
+        if self._closed:
+            self._discard(pooled)
+            return
+        if self.max_pages and pooled.pages >= self.max_pages:
+            self.recycled += 1
+            self._discard(pooled)
+            self._warm_up()
+            return
+        try:
+            _reset(driver)
+        except Exception as e:
+            # A driver whose chromedriver died raises urllib3 errors, not
+            # WebDriverException
+            logger.debug(f"Replacing a webdriver that could not be reset: {e}")
+            self._discard(pooled)
+            self._warm_up()
+            return
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def shutdown(self) -> None:
+        """Quit the idle drivers, and the drivers in use once they are released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def _take(self, timeout: Optional[float]) -> Optional[_PooledDriver]:
+        # Returns an idle driver, or None after reserving a slot for a new one
+        while True:
+            if self._closed:
+                raise RuntimeError("The browser pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+            if self._running < self.size:
+                self._running += 1
+                return None
+            if not self._condition.wait(timeout):
+                raise TimeoutError(f"No browser was released within {timeout} seconds")
+
+    def _start(self) -> _PooledDriver:
+        try:
+            driver = self.create_driver()
+        except BaseException:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify()
+            raise
+        self.created += 1
+        return _PooledDriver(driver)
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        try:
+            _quit(pooled.driver)
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify()
+
+    def _warm_up(self) -> None:
+        # Starts a replacement in the background, so the next command finds it
+        if self._warming is not None and self._warming.is_alive():
+            return
+        self._warming = threading.Thread(
+            target=self._start_idle, name="browser-pool-warm-up", daemon=True
+        )
+        self._warming.start()
+
+    def _start_idle(self) -> None:
+        with self._condition:
+            if self._closed or self._idle or self._running >= self.size:
+                return
+            self._running += 1
+        try:
+            pooled = self._start()
+        except Exception as e:
+            logger.debug(f"Could not start a webdriver: {e}")
+            return
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+        if closed:
+            self._discard(pooled)
+
+
+def _is_alive(driver: WebDriver) -> bool:
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def _reset(driver: WebDriver) -> None:
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    try:
+        driver.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();"
+        )
+    except WebDriverException:
+        # Pages like about:blank have no storage
+        pass
+    # Chromium based drivers clear the cookies of all sites in one call, others
+    # only clear the cookies of the current page
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    else:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def _quit(driver: WebDriver) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug(f"Could not quit a webdriver: {e}")
@@ -54,6 +54,9 @@ class CommandRegistry:
 
     def __init__(self):
         self.commands = {}
+        # Bumped whenever the set of commands changes, so prompts built from the
+        # registry know when they are stale
+        self.version = 0
 
     def _import_module(self, module_name: str) -> Any:
         return importlib.import_module(module_name)
@@ -67,10 +70,12 @@ class CommandRegistry:
                 f"Command '{cmd.name}' already registered and will be overwritten!"
             )
         self.commands[cmd.name] = cmd
+        self.version += 1
 
     def unregister(self, command_name: str):
         if command_name in self.commands:
             del self.commands[command_name]
+            self.version += 1
         else:
             raise KeyError(f"Command '{command_name}' not found in registry.")
 
@@ -283,7 +283,9 @@ def list_files(directory: str) -> list[str]:
     """
     found_files = []
 
-    for root, _, files in os.walk(directory):
+    for root, dirs, files in os.walk(directory):
+        # Hidden directories hold caches and tool state, not the agent's files
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
         for file in files:
             if file.startswith("."):
                 continue
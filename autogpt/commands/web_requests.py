@@ -1,18 +1,39 @@
 """Browse a webpage and summarize it using the LLM model"""
 from __future__ import annotations
 
+import threading
+from typing import Dict, Optional
+
 import requests
-from bs4 import BeautifulSoup
 from requests import Response
 
 from autogpt.config import Config
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
-from autogpt.url_utils.validators import validate_url
+from autogpt.processing.html import PageContent, extract_page, format_hyperlinks
+from autogpt.url_utils.http_cache import CachingHTTPAdapter, DiskCacheStore
+from autogpt.url_utils.validators import normalize_url, validate_url
 
 CFG = Config()
 
 session = requests.Session()
 session.headers.update({"User-Agent": CFG.user_agent})
+if CFG.http_cache_max_entries:
+    http_cache = CachingHTTPAdapter(
+        DiskCacheStore(max_entries=CFG.http_cache_max_entries)
+    )
+    session.mount("http://", http_cache)
+    session.mount("https://", http_cache)
+
+# The pages fetched in the current agent cycle, so the text and the links of a
+# page are scraped from one response. Pages are not kept outside of a cycle.
+_cycle_pages: Optional[Dict[str, PageContent]] = None
+_cycle_pages_lock = threading.Lock()
+
+
+def start_cycle() -> None:
+    """Start a new agent cycle, forgetting the pages fetched in the previous one"""
+    global _cycle_pages
+    with _cycle_pages_lock:
+        _cycle_pages = {}
 
 
 @validate_url
@@ -50,32 +71,62 @@ def get_response(
         return None, f"Error: {str(re)}"
 
 
-def scrape_text(url: str) -> str:
-    """Scrape text from a webpage
+def scrape_page(response: Response, url: str) -> PageContent:
+    """Extract the text and links of a response with the configured HTML parser
 
     Args:
-        url (str): The URL to scrape text from
+        response (Response): The response to extract from
+        url (str): The URL of the page, to resolve relative links against
 
     Returns:
-        str: The scraped text
+        PageContent: The text and hyperlinks of the page
     """
+    return extract_page(
+        response.text, url, CFG.browse_html_parser, CFG.browse_remove_boilerplate
+    )
+
+
+def fetch_page(url: str) -> tuple[None, str] | tuple[PageContent, None]:
+    """Get the text and links of a webpage, fetching it once per agent cycle
+
+    Args:
+        url (str): The URL of the page
+
+    Returns:
+        tuple[None, str] | tuple[PageContent, None]: The page and error message
+    """
+    key = normalize_url(url)
+    with _cycle_pages_lock:
+        cycle_pages = _cycle_pages
+    if cycle_pages is not None and key in cycle_pages:
+        return cycle_pages[key], None
+
     response, error_message = get_response(url)
     if error_message:
-        return error_message
+        return None, error_message
     if not response:
-        return "Error: Could not get response"
+        return None, "Error: Could not get response"
+
+    page = scrape_page(response, url)
+    if cycle_pages is not None:
+        cycle_pages[key] = page
+    return page, None
 
-    soup = BeautifulSoup(response.text, "html.parser")
 
-    for script in soup(["script", "style"]):
-        script.extract()
+def scrape_text(url: str) -> str:
+    """Scrape text from a webpage
+
+    Args:
+        url (str): The URL to scrape text from
 
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
+    Returns:
+        str: The scraped text
+    """
+    page, error_message = fetch_page(url)
+    if error_message:
+        return error_message
 
-    return text
+    return page.text
 
 
 def scrape_links(url: str) -> str | list[str]:
@@ -87,19 +138,11 @@ def scrape_links(url: str) -> str | list[str]:
     Returns:
        str | list[str]: The scraped links
     """
-    response, error_message = get_response(url)
+    page, error_message = fetch_page(url)
     if error_message:
         return error_message
-    if not response:
-        return "Error: Could not get response"
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    hyperlinks = extract_hyperlinks(soup, url)
 
-    return format_hyperlinks(hyperlinks)
+    return format_hyperlinks(page.links)
 
 
 def create_message(chunk, question):
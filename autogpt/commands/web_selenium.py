@@ -1,11 +1,14 @@
 """Selenium web scraping module."""
 from __future__ import annotations
 
+import functools
+import itertools
 import logging
+import threading
 from pathlib import Path
 from sys import platform
+from typing import Optional
 
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -21,14 +24,22 @@ from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 import autogpt.processing.text as summary
+from autogpt.commands.browser_pool import BrowserPool
 from autogpt.commands.command import command
 from autogpt.config import Config
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
+from autogpt.processing.html import PageContent, extract_page, format_hyperlinks
 from autogpt.url_utils.validators import validate_url
 
 FILE_DIR = Path(__file__).parent.parent
 CFG = Config()
 
+# The number of seconds to wait for a browser when all pooled browsers are in use
+BROWSER_ACQUIRE_TIMEOUT = 60
+# Chrome instances running at the same time need their own debugging port
+_debugging_ports = itertools.count()
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
 
 @command(
     "browse_website",
@@ -47,21 +58,25 @@ def browse_website(url: str, question: str) -> str:
         Tuple[str, WebDriver]: The answer and links to the user and the webdriver
     """
     try:
-        driver, text = scrape_text_with_selenium(url)
+        driver, page = scrape_page_with_selenium(url)
     except WebDriverException as e:
         # These errors are often quite long and include lots of context.
         # Just grab the first line.
         msg = e.msg.split("\n")[0]
         return f"Error: {msg}"
+    except TimeoutError as e:
+        return f"Error: {e}"
 
-    add_header(driver)
-    summary_text = summary.summarize_text(url, text, question, driver)
-    links = scrape_links_with_selenium(driver, url)
+    try:
+        add_header(driver)
+        summary_text = summary.summarize_text(url, page.text, question, driver)
+    finally:
+        close_browser(driver)
+    links = format_hyperlinks(page.links)
 
     # Limit links to 5
     if len(links) > 5:
         links = links[:5]
-    close_browser(driver)
     return f"Answer gathered from website: {summary_text} \n \n Links: {links}"
 
 
@@ -74,6 +89,79 @@ def scrape_text_with_selenium(url: str) -> tuple[WebDriver, str]:
     Returns:
         Tuple[WebDriver, str]: The webdriver and the text scraped from the website
     """
+    driver, page = scrape_page_with_selenium(url)
+    return driver, page.text
+
+
+def scrape_page_with_selenium(url: str) -> tuple[WebDriver, PageContent]:
+    """Scrape the text and links of a website using selenium, parsing it once
+
+    Args:
+        url (str): The url of the website to scrape
+
+    Returns:
+        Tuple[WebDriver, PageContent]: The webdriver and the text and links
+            scraped from the website
+    """
+    driver = open_browser()
+    try:
+        driver.get(url)
+
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+
+        # Get the HTML content directly from the browser's DOM
+        page_source = driver.execute_script("return document.body.outerHTML;")
+        page = extract_page(
+            page_source, url, CFG.browse_html_parser, CFG.browse_remove_boilerplate
+        )
+    except BaseException:
+        close_browser(driver)
+        raise
+    return driver, page
+
+
+def open_browser() -> WebDriver:
+    """Get a browser, from the browser pool unless pooling is disabled
+
+    Returns:
+        WebDriver: The webdriver, to be given back with close_browser
+
+    Raises:
+        TimeoutError: If no pooled browser was freed within BROWSER_ACQUIRE_TIMEOUT
+    """
+    pool = get_browser_pool()
+    if pool is None:
+        return create_driver()
+    return pool.acquire(timeout=BROWSER_ACQUIRE_TIMEOUT)
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Get the browser pool, created on first use
+
+    Returns:
+        Optional[BrowserPool]: The pool, or None if BROWSER_POOL_SIZE is 0
+    """
+    global _browser_pool
+    if not CFG.browser_pool_size:
+        return None
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            size = CFG.browser_pool_size
+            if CFG.selenium_web_browser == "safari":
+                # Safari only allows one automated session at a time
+                size = 1
+            _browser_pool = BrowserPool(create_driver, size, CFG.browser_pool_max_pages)
+        return _browser_pool
+
+
+def create_driver() -> WebDriver:
+    """Start a new webdriver for the configured browser
+
+    Returns:
+        WebDriver: The webdriver
+    """
     logging.getLogger("selenium").setLevel(logging.CRITICAL)
 
     options_available = {
@@ -93,52 +181,49 @@ def scrape_text_with_selenium(url: str) -> tuple[WebDriver, str]:
             options.headless = True
             options.add_argument("--disable-gpu")
         driver = webdriver.Firefox(
-            executable_path=GeckoDriverManager().install(), options=options
+            executable_path=install_driver("firefox"), options=options
         )
     elif CFG.selenium_web_browser == "safari":
         # Requires a bit more setup on the users end
         # See https://developer.apple.com/documentation/webkit/testing_with_webdriver_in_safari
         driver = webdriver.Safari(options=options)
     elif CFG.selenium_web_browser == "edge":
-        driver = webdriver.Edge(
-            executable_path=EdgeChromiumDriverManager().install(), options=options
-        )
+        driver = webdriver.Edge(executable_path=install_driver("edge"), options=options)
     else:
         if platform == "linux" or platform == "linux2":
             options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--remote-debugging-port=9222")
+            port = 9222 + next(_debugging_ports) % 100
+            options.add_argument(f"--remote-debugging-port={port}")
 
         options.add_argument("--no-sandbox")
         if CFG.selenium_headless:
             options.add_argument("--headless=new")
             options.add_argument("--disable-gpu")
 
-        chromium_driver_path = Path("/usr/bin/chromedriver")
-
         driver = webdriver.Chrome(
-            executable_path=chromium_driver_path
-            if chromium_driver_path.exists()
-            else ChromeDriverManager().install(),
-            options=options,
+            executable_path=install_driver("chrome"), options=options
         )
-    driver.get(url)
+    return driver
 
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.TAG_NAME, "body"))
-    )
 
-    # Get the HTML content directly from the browser's DOM
-    page_source = driver.execute_script("return document.body.outerHTML;")
-    soup = BeautifulSoup(page_source, "html.parser")
+@functools.lru_cache(maxsize=None)
+def install_driver(browser: str) -> str:
+    """Get the path of the driver of a browser, downloading it once per process
 
-    for script in soup(["script", "style"]):
-        script.extract()
+    Args:
+        browser (str): "chrome", "firefox" or "edge"
 
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
-    return driver, text
+    Returns:
+        str: The path of the driver
+    """
+    if browser == "firefox":
+        return GeckoDriverManager().install()
+    if browser == "edge":
+        return EdgeChromiumDriverManager().install()
+    chromium_driver_path = Path("/usr/bin/chromedriver")
+    if chromium_driver_path.exists():
+        return str(chromium_driver_path)
+    return ChromeDriverManager().install()
 
 
 def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
@@ -150,19 +235,12 @@ def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
     Returns:
         List[str]: The links scraped from the website
     """
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    hyperlinks = extract_hyperlinks(soup, url)
-
-    return format_hyperlinks(hyperlinks)
+    page = extract_page(driver.page_source, url, CFG.browse_html_parser)
+    return format_hyperlinks(page.links)
 
 
 def close_browser(driver: WebDriver) -> None:
-    """Close the browser
+    """Close the browser, or give it back to the browser pool
 
     Args:
         driver (WebDriver): The webdriver to close
@@ -170,7 +248,11 @@ def close_browser(driver: WebDriver) -> None:
     Returns:
         None
     """
-    driver.quit()
+    pool = get_browser_pool()
+    if pool is None:
+        driver.quit()
+    else:
+        pool.release(driver)
 
 
 def add_header(driver: WebDriver) -> None:
@@ -7,13 +7,16 @@ from __future__ import annotations
 import os
 import platform
 from pathlib import Path
-from typing import Any, Optional, Type
+from typing import TYPE_CHECKING, Any, Optional, Type
 
 import distro
 import yaml
 
 from autogpt.prompts.generator import PromptGenerator
 
+if TYPE_CHECKING:
+    from autogpt.prompts.system_prompt import SystemPrompt
+
 # Soon this will go in a folder where it remembers more stuff about the run(s)
 SAVE_FILE = str(Path(os.getcwd()) / "ai_settings.yaml")
 
@@ -55,6 +58,7 @@ class AIConfig:
         self.api_budget = api_budget
         self.prompt_generator = None
         self.command_registry = None
+        self._system_prompt = None
 
     @staticmethod
     def load(config_file: str = SAVE_FILE) -> "AIConfig":
@@ -166,3 +170,44 @@ class AIConfig:
         self.prompt_generator = prompt_generator
         full_prompt += f"\n\n{prompt_generator.generate_prompt_string()}"
         return full_prompt
+
+    def get_system_prompt(
+        self, prompt_generator: Optional[PromptGenerator] = None
+    ) -> SystemPrompt:
+        """
+        Returns the full prompt, building it only if its inputs have changed.
+
+        The prompt is rebuilt when the AI settings, the command registry, the
+        loaded plugins or the local command setting change since the last call,
+        and always when a prompt generator is passed.
+
+        Parameters:
+            prompt_generator (PromptGenerator): The generator to build the prompt
+              with. DEFAULT: the default prompt generator
+
+        Returns:
+            SystemPrompt: The rendered prompt with its cached token counts.
+        """
+        from autogpt.config import Config
+        from autogpt.prompts.system_prompt import SystemPrompt
+
+        cfg = Config()
+        cache_key = (
+            self.ai_name,
+            self.ai_role,
+            tuple(self.ai_goals),
+            self.api_budget,
+            id(self.command_registry),
+            getattr(self.command_registry, "version", None),
+            tuple(id(plugin) for plugin in cfg.plugins),
+            cfg.execute_local_commands,
+        )
+        if (
+            prompt_generator is not None
+            or self._system_prompt is None
+            or self._system_prompt.cache_key != cache_key
+        ):
+            self._system_prompt = SystemPrompt(
+                self.construct_full_prompt(prompt_generator), cache_key
+            )
+        return self._system_prompt
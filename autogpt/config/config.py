@@ -42,6 +42,8 @@ class Config(metaclass=Singleton):
         self.smart_llm_model = os.getenv("SMART_LLM_MODEL", "gpt-4")
         self.fast_token_limit = int(os.getenv("FAST_TOKEN_LIMIT", 4000))
         self.smart_token_limit = int(os.getenv("SMART_TOKEN_LIMIT", 8000))
+        self.use_model_routing = os.getenv("USE_MODEL_ROUTING", "False") == "True"
+        self.model_routing_latency_slos = os.getenv("MODEL_ROUTING_LATENCY_SLOS", "")
         self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
         self.embedding_tokenizer = os.getenv("EMBEDDING_TOKENIZER", "cl100k_base")
         self.embedding_token_limit = int(os.getenv("EMBEDDING_TOKEN_LIMIT", 8191))
@@ -49,6 +51,18 @@ class Config(metaclass=Singleton):
         self.browse_spacy_language_model = os.getenv(
             "BROWSE_SPACY_LANGUAGE_MODEL", "en_core_web_sm"
         )
+        self.browse_sentence_segmenter = os.getenv("BROWSE_SENTENCE_SEGMENTER", "spacy")
+        self.browse_html_parser = os.getenv("BROWSE_HTML_PARSER", "lxml")
+        self.browse_remove_boilerplate = (
+            os.getenv("BROWSE_REMOVE_BOILERPLATE", "False") == "True"
+        )
+        self.browse_summary_concurrency = int(
+            os.getenv("BROWSE_SUMMARY_CONCURRENCY", "4")
+        )
+        self.summary_cache_max_entries = int(
+            os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1000")
+        )
+        self.summary_cache_ttl = float(os.getenv("SUMMARY_CACHE_TTL", "3600"))
 
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.temperature = float(os.getenv("TEMPERATURE", "0"))
@@ -121,6 +135,8 @@ class Config(metaclass=Singleton):
         # Selenium browser settings
         self.selenium_web_browser = os.getenv("USE_WEB_BROWSER", "chrome")
         self.selenium_headless = os.getenv("HEADLESS_BROWSER", "True") == "True"
+        self.browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+        self.browser_pool_max_pages = int(os.getenv("BROWSER_POOL_MAX_PAGES", "20"))
 
         # User agent header to use when making HTTP requests
         # Some websites might just completely deny request with an error code if
@@ -130,6 +146,8 @@ class Config(metaclass=Singleton):
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) AppleWebKit/537.36"
             " (KHTML, like Gecko) Chrome/83.0.4103.97 Safari/537.36",
         )
+        self.http_cache_dir = os.getenv("HTTP_CACHE_DIR", "")
+        self.http_cache_max_entries = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "1000"))
 
         self.redis_host = os.getenv("REDIS_HOST", "localhost")
         self.redis_port = os.getenv("REDIS_PORT", "6379")
@@ -139,6 +157,40 @@ class Config(metaclass=Singleton):
         # Note that indexes must be created on db 0 in redis, this is not configurable.
 
         self.memory_backend = os.getenv("MEMORY_BACKEND", "local")
+        self.memory_write_behind = os.getenv("MEMORY_WRITE_BEHIND", "False") == "True"
+        self.memory_write_behind_queue_size = int(
+            os.getenv("MEMORY_WRITE_BEHIND_QUEUE_SIZE", "1000")
+        )
+        self.memory_write_behind_batch_size = int(
+            os.getenv("MEMORY_WRITE_BEHIND_BATCH_SIZE", "64")
+        )
+        memory_dedup_backends = os.getenv("MEMORY_DEDUP_BACKENDS")
+        if memory_dedup_backends:
+            self.memory_dedup_backends = memory_dedup_backends.split(",")
+        else:
+            self.memory_dedup_backends = []
+        self.memory_dedup_threshold = float(os.getenv("MEMORY_DEDUP_THRESHOLD", "0"))
+        self.local_memory_fsync_every = int(os.getenv("LOCAL_MEMORY_FSYNC_EVERY", "0"))
+        self.wipe_local_memory_on_start = (
+            os.getenv("WIPE_LOCAL_MEMORY_ON_START", "True") == "True"
+        )
+        self.local_memory_max_entries = int(os.getenv("LOCAL_MEMORY_MAX_ENTRIES", "0"))
+        self.local_memory_max_bytes = int(os.getenv("LOCAL_MEMORY_MAX_BYTES", "0"))
+        self.local_memory_ttl = float(os.getenv("LOCAL_MEMORY_TTL", "0"))
+        self.use_local_memory_ann_index = (
+            os.getenv("USE_LOCAL_MEMORY_ANN_INDEX", "False") == "True"
+        )
+        self.local_memory_ivf_nprobe = int(os.getenv("LOCAL_MEMORY_IVF_NPROBE", "8"))
+        self.use_local_memory_hybrid_search = (
+            os.getenv("USE_LOCAL_MEMORY_HYBRID_SEARCH", "False") == "True"
+        )
+        self.local_memory_lexical_weight = float(
+            os.getenv("LOCAL_MEMORY_LEXICAL_WEIGHT", "0.5")
+        )
+        self.local_memory_quantization = os.getenv("LOCAL_MEMORY_QUANTIZATION", "")
+        self.local_memory_rerank_factor = int(
+            os.getenv("LOCAL_MEMORY_RERANK_FACTOR", "10")
+        )
 
         self.plugins_dir = os.getenv("PLUGINS_DIR", "plugins")
         self.plugins: List[AutoGPTPluginTemplate] = []
@@ -231,6 +283,10 @@ class Config(metaclass=Singleton):
         """Set the smart token limit value."""
         self.smart_token_limit = value
 
+    def set_use_model_routing(self, value: bool) -> None:
+        """Set whether LLM calls are routed between the fast and smart models."""
+        self.use_model_routing = value
+
     def set_embedding_model(self, value: str) -> None:
         """Set the model to use for creating embeddings."""
         self.embedding_model = value
@@ -11,7 +11,13 @@ from regex import regex
 
 from autogpt.config import Config
 from autogpt.json_utils.json_fix_general import correct_json
+from autogpt.json_utils.json_fix_tolerant import parse_tolerant_json
+from autogpt.json_utils.utilities import (
+    LLM_DEFAULT_RESPONSE_FORMAT,
+    get_schema_validator,
+)
 from autogpt.llm import call_ai_function
+from autogpt.llm.metrics import JSON_FIX_CALL_SITE
 from autogpt.logs import logger
 from autogpt.speech import say_text
 
@@ -63,7 +69,7 @@ def auto_fix_json(json_string: str, schema: str) -> str:
     if not json_string.startswith("`"):
         json_string = "```json\n" + json_string + "\n```"
     result_string = call_ai_function(
-        function_string, args, description_string, model=CFG.fast_llm_model
+        function_string, args, description_string, call_site=JSON_FIX_CALL_SITE
     )
     logger.debug("------------ JSON FIX ATTEMPT ---------------")
     logger.debug(f"Original JSON: {json_string}")
@@ -109,6 +115,18 @@ def fix_json_using_multiple_techniques(assistant_reply: str) -> Dict[Any, Any]:
     except json.JSONDecodeError:  # noqa: E722
         pass
 
+    # Repair the JSON locally before falling back to an extra LLM round trip. A
+    # repair can drop or misplace fields, so it is only used if it fits the schema
+    with contextlib.suppress(json.JSONDecodeError):
+        assistant_reply_json = parse_tolerant_json(assistant_reply)
+        if get_schema_validator(LLM_DEFAULT_RESPONSE_FORMAT).is_valid(
+            assistant_reply_json
+        ):
+            logger.debug(
+                "Assistant reply JSON (tolerant): %s", str(assistant_reply_json)
+            )
+            return assistant_reply_json
+
     # Parse and print Assistant response
     assistant_reply_json = fix_and_parse_json(assistant_reply)
     logger.debug("Assistant reply JSON: %s", str(assistant_reply_json))
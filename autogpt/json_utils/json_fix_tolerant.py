@@ -0,0 +1,270 @@
+"""A single-pass, error tolerant JSON parser for LLM replies.
+
+It repairs the most common ways an LLM breaks JSON while parsing, instead of
+repeatedly calling json.loads on patched strings or asking the LLM to fix its
+own output:
+
+- markdown code fences and prose around the JSON
+- trailing and missing commas
+- unescaped double quotes inside strings
+- invalid escape sequences and raw newlines inside strings
+- single-quoted strings, unquoted keys and Python literals (True, None, ...)
+- truncated replies and missing closing braces or brackets
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Tuple
+
+_NUMBER_PATTERN = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_BARE_WORD_PATTERN = re.compile(r"[A-Za-z_$][\w$\-]*")
+_UNQUOTED_KEY_PATTERN = re.compile(r"\s*[A-Za-z_$][\w$\-]*\s*:")
+_NEXT_LINE_KEY_PATTERN = re.compile(r'[ \t]*\r?\n\s*"[^"\n]*"\s*:')
+_FENCE_PATTERN = re.compile(r"```[a-zA-Z]*\s*")
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "True": True,
+    "False": False,
+    "None": None,
+    "NaN": None,
+    "undefined": None,
+}
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_VALUE_START = '"{[-0123456789tfnTFN'
+_WHITESPACE = " \t\n\r"
+
+
+class _TolerantParser:
+    """Recursive descent parser that never fails on a recoverable error."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.length = len(text)
+        self.pos = 0
+
+    def _skip_whitespace(self) -> None:
+        while self.pos < self.length and self.text[self.pos] in _WHITESPACE:
+            self.pos += 1
+
+    def _peek_after_whitespace(self, pos: int) -> str:
+        while pos < self.length and self.text[pos] in _WHITESPACE:
+            pos += 1
+        return self.text[pos] if pos < self.length else ""
+
+    def parse_value(self, closer: str = "") -> Any:
+        self._skip_whitespace()
+        if self.pos >= self.length:
+            return None
+        char = self.text[self.pos]
+        if char == "{":
+            return self.parse_object()
+        if char == "[":
+            return self.parse_array()
+        if char in "\"'":
+            return self.parse_string(closer)
+        if match := _NUMBER_PATTERN.match(self.text, self.pos):
+            self.pos = match.end()
+            return json.loads(match.group())
+        if match := _BARE_WORD_PATTERN.match(self.text, self.pos):
+            self.pos = match.end()
+            word = match.group()
+            return _LITERALS.get(word, word)
+        if char in ",}]":
+            # A missing value, leave the separator or closer to the container
+            return None
+        # Unknown character, skip it so parsing can continue
+        self.pos += 1
+        return None
+
+    def parse_object(self) -> dict:
+        self.pos += 1  # skip "{"
+        result = {}
+        while True:
+            self._skip_whitespace()
+            if self.pos >= self.length:
+                return result
+            char = self.text[self.pos]
+            if char == "}":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                continue
+            if char == "]":
+                # Mismatched closer, treat it as the end of the object
+                self.pos += 1
+                return result
+
+            key = self._parse_key()
+            self._skip_whitespace()
+            if self.pos < self.length and self.text[self.pos] in ":=":
+                self.pos += 1
+            result[key] = self.parse_value(closer="}")
+
+    def _parse_key(self) -> str:
+        char = self.text[self.pos]
+        if char in "\"'":
+            return self.parse_string(closer=":")
+        if match := _BARE_WORD_PATTERN.match(self.text, self.pos):
+            self.pos = match.end()
+            return match.group()
+        end = self.pos
+        while end < self.length and self.text[end] not in ":,}":
+            end += 1
+        key = self.text[self.pos : end].strip()
+        self.pos = end
+        return key
+
+    def parse_array(self) -> list:
+        self.pos += 1  # skip "["
+        result = []
+        while True:
+            self._skip_whitespace()
+            if self.pos >= self.length:
+                return result
+            char = self.text[self.pos]
+            if char == "]":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                continue
+            if char == "}":
+                self.pos += 1
+                return result
+            result.append(self.parse_value(closer="]"))
+
+    def _is_string_end(self, pos: int, closer: str) -> bool:
+        """Decide whether the quote at pos closes the string or is part of it.
+
+        A quote only closes the string if it is followed by something that can
+        come after a value (or a key), otherwise it is an unescaped quote.
+        """
+        next_char = self._peek_after_whitespace(pos + 1)
+        if next_char == "" or next_char == closer:
+            return True
+        if closer == ":":
+            return next_char in "}"
+        if next_char in "}]":
+            return True
+        if next_char == ",":
+            comma = self.text.index(",", pos + 1)
+            after_comma = self._peek_after_whitespace(comma + 1)
+            if closer == "}":
+                if not after_comma or after_comma in "\"'}":
+                    return True
+                # Single-quoted, Python-like replies tend to use unquoted keys
+                return self.text[pos] == "'" and bool(
+                    _UNQUOTED_KEY_PATTERN.match(self.text, comma + 1)
+                )
+            return after_comma == "" or after_comma in _VALUE_START + "]"
+        if next_char == ":":
+            return closer != "}"
+        if closer == "}" and next_char == '"':
+            # A missing comma between two pretty-printed object members
+            return bool(_NEXT_LINE_KEY_PATTERN.match(self.text, pos + 1))
+        return False
+
+    def parse_string(self, closer: str = "") -> str:
+        quote = self.text[self.pos]
+        self.pos += 1
+        chunks: List[str] = []
+        start = self.pos
+        text = self.text
+        while self.pos < self.length:
+            char = text[self.pos]
+            if char == "\\":
+                chunks.append(text[start : self.pos])
+                escaped = text[self.pos + 1 : self.pos + 2]
+                if escaped in _ESCAPES:
+                    chunks.append(_ESCAPES[escaped])
+                    self.pos += 2
+                elif escaped == "u" and re.fullmatch(
+                    r"[0-9a-fA-F]{4}", text[self.pos + 2 : self.pos + 6]
+                ):
+                    chunks.append(chr(int(text[self.pos + 2 : self.pos + 6], 16)))
+                    self.pos += 6
+                elif escaped == "'":
+                    chunks.append("'")
+                    self.pos += 2
+                else:
+                    # Invalid escape, keep the backslash as a literal character
+                    chunks.append("\\")
+                    self.pos += 1
+                start = self.pos
+                continue
+            if char == quote and self._is_string_end(self.pos, closer):
+                chunks.append(text[start : self.pos])
+                self.pos += 1
+                return "".join(chunks)
+            self.pos += 1
+        # Truncated reply, the string runs until the end of the text
+        chunks.append(text[start:])
+        return "".join(chunks).rstrip()
+
+
+def _strip_fences(text: str) -> str:
+    if "```" not in text:
+        return text
+    parts = _FENCE_PATTERN.split(text)
+    # Prefer the first fenced block that contains JSON
+    for part in parts[1:]:
+        if "{" in part or "[" in part:
+            return part
+    return text.replace("```", "")
+
+
+def parse_tolerant_json_with_position(text: str) -> Tuple[Any, int]:
+    """Parse the first JSON object or array in text, repairing it if needed.
+
+    Args:
+        text (str): The text containing the (possibly malformed) JSON.
+
+    Returns:
+        Tuple[Any, int]: The parsed value and the position where parsing ended.
+
+    Raises:
+        json.JSONDecodeError: If the text contains no JSON object or array.
+    """
+    text = _strip_fences(text.strip())
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        raise json.JSONDecodeError("No JSON object found", text, 0)
+    parser = _TolerantParser(text)
+    parser.pos = min(starts)
+    value = parser.parse_value()
+    return value, parser.pos
+
+
+def parse_tolerant_json(text: str) -> Any:
+    """Parse the first JSON object or array in text, repairing it if needed.
+
+    Well-formed JSON is parsed with json.loads; everything else is repaired in
+    a single pass without any LLM calls.
+
+    Args:
+        text (str): The text containing the (possibly malformed) JSON.
+
+    Returns:
+        Any: The parsed JSON value.
+
+    Raises:
+        json.JSONDecodeError: If the text contains no JSON object or array.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    return parse_tolerant_json_with_position(text)[0]
@@ -1,7 +1,9 @@
 """Utilities for the json_fixes package."""
+import functools
 import json
 import os.path
 import re
+from typing import Optional
 
 from jsonschema import Draft7Validator
 
@@ -29,7 +31,36 @@ def extract_char_position(error_message: str) -> int:
     else:
         raise ValueError("Character position not found in the error message.")
 
-from typing import Optional
+
+@functools.lru_cache(maxsize=None)
+def load_schema(schema_name: str) -> dict:
+    """Load a JSON schema from the json_utils package, reading the file only once.
+
+    Args:
+        schema_name (str): The name of the schema file, without the extension.
+
+    Returns:
+        dict: The JSON schema.
+    """
+    scheme_file = os.path.join(os.path.dirname(__file__), f"{schema_name}.json")
+    with open(scheme_file, "r") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema_validator(schema_name: str) -> Draft7Validator:
+    """Get the validator for a JSON schema, building it only once.
+
+    Args:
+        schema_name (str): The name of the schema file, without the extension.
+
+    Returns:
+        Draft7Validator: The validator for the schema.
+    """
+    schema = load_schema(schema_name)
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
+
 
 #def validate_json(json_object: object, schema_name: str) -> dict | None:
 def validate_json(json_object: object, schema_name: str) -> Optional[dict]:
@@ -38,27 +69,43 @@ def validate_json(json_object: object, schema_name: str) -> Optional[dict]:
     :param schema_name: str
     :type json_object: object
     """
-    scheme_file = os.path.join(os.path.dirname(__file__), f"{schema_name}.json")
-    with open(scheme_file, "r") as f:
-        schema = json.load(f)
-    validator = Draft7Validator(schema)
-
-    if errors := sorted(validator.iter_errors(json_object), key=lambda e: e.path):
-        logger.error("The JSON object is invalid.")
-        if CFG.debug_mode:
-            logger.error(
-                json.dumps(json_object, indent=4)
-            )  # Replace 'json_object' with the variable containing the JSON data
-            logger.error("The following issues were found:")
-
-            for error in errors:
-                logger.error(f"Error: {error.message}")
-    else:
+    validator = get_schema_validator(schema_name)
+
+    if validator.is_valid(json_object):
         logger.debug("The JSON object is valid.")
+        return json_object
+
+    errors = sorted(validator.iter_errors(json_object), key=lambda e: e.path)
+    logger.error("The JSON object is invalid.")
+    if CFG.debug_mode:
+        logger.error(
+            json.dumps(json_object, indent=4)
+        )  # Replace 'json_object' with the variable containing the JSON data
+        logger.error("The following issues were found:")
+
+        for error in errors:
+            logger.error(f"Error: {error.message}")
 
     return json_object
 
 
+def parse_and_validate_json(json_string: str, schema_name: str) -> Optional[dict]:
+    """
+    Parse a JSON string and validate it against a schema in one step.
+
+    Args:
+        json_string (str): The JSON string to parse.
+        schema_name (str): The name of the schema to validate against.
+
+    Returns:
+        Optional[dict]: The parsed JSON, or None if the string is not valid JSON.
+    """
+    try:
+        json_loaded = json.loads(json_string)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return validate_json(json_loaded, schema_name)
+
 
 def validate_json_string(json_string: str, schema_name: str) -> Optional[dict]:
     """
@@ -66,12 +113,7 @@ def validate_json_string(json_string: str, schema_name: str) -> Optional[dict]:
     :param schema_name: str
     :type json_object: object
     """
-
-    try:
-        json_loaded = json.loads(json_string)
-        return validate_json(json_loaded, schema_name)
-    except:
-        return None
+    return parse_and_validate_json(json_string, schema_name)
 
 
 def is_string_valid_json(json_string: str, schema_name: str) -> bool:
@@ -81,4 +123,4 @@ def is_string_valid_json(json_string: str, schema_name: str) -> bool:
     :type json_object: object
     """
 
-    return validate_json_string(json_string, schema_name) is not None
\ No newline at end of file
+    return parse_and_validate_json(json_string, schema_name) is not None
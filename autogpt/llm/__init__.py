@@ -14,9 +14,15 @@ from autogpt.llm.llm_utils import (
     chunked_tokens,
     create_chat_completion,
     get_ada_embedding,
+    get_ada_embeddings,
 )
+from autogpt.llm.model_router import ModelRouter, RoutingDecision
 from autogpt.llm.modelsinfo import COSTS
-from autogpt.llm.token_counter import count_message_tokens, count_string_tokens
+from autogpt.llm.token_counter import (
+    count_message_tokens,
+    count_string_tokens,
+    count_strings_tokens,
+)
 
 __all__ = [
     "ApiManager",
@@ -33,8 +39,12 @@ __all__ = [
     "call_ai_function",
     "create_chat_completion",
     "get_ada_embedding",
+    "get_ada_embeddings",
     "chunked_tokens",
+    "ModelRouter",
+    "RoutingDecision",
     "COSTS",
     "count_message_tokens",
     "count_string_tokens",
+    "count_strings_tokens",
 ]
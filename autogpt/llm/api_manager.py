@@ -1,25 +1,57 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import defaultdict, deque
+
 import openai
 
 from autogpt.config import Config
+from autogpt.llm.metrics import (
+    DEFAULT_CALL_SITE,
+    ERROR_STATUS,
+    SUCCESS_STATUS,
+    CallMetrics,
+    metrics_to_json,
+    metrics_to_list,
+    metrics_to_prometheus,
+)
 from autogpt.llm.modelsinfo import COSTS
 from autogpt.logs import logger
 from autogpt.singleton import Singleton
 
+# Number of recent calls per model used to compute the observed latency
+LATENCY_WINDOW = 20
+
 
 class ApiManager(metaclass=Singleton):
+    """
+    Keeps track of API usage, cost and latency.
+
+    All counters are guarded by a lock so calls can be made from several threads.
+    Besides the running totals, every call is recorded under its (model, call
+    site, status) labels, both for the whole run and for the current cycle.
+    """
+
     def __init__(self):
+        self._lock = threading.RLock()
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
         self.total_cost = 0
         self.total_budget = 0
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.metrics = defaultdict(CallMetrics)
+        self.cycle_metrics = defaultdict(CallMetrics)
 
     def reset(self):
-        self.total_prompt_tokens = 0
-        self.total_completion_tokens = 0
-        self.total_cost = 0
-        self.total_budget = 0.0
+        with self._lock:
+            self.total_prompt_tokens = 0
+            self.total_completion_tokens = 0
+            self.total_cost = 0
+            self.total_budget = 0.0
+            self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+            self.metrics = defaultdict(CallMetrics)
+            self.cycle_metrics = defaultdict(CallMetrics)
 
     def create_chat_completion(
         self,
@@ -28,6 +60,7 @@ class ApiManager(metaclass=Singleton):
         temperature: float = None,
         max_tokens: int | None = None,
         deployment_id=None,
+        call_site: str = DEFAULT_CALL_SITE,
     ) -> str:
         """
         Create a chat completion and update the cost.
@@ -36,37 +69,59 @@ class ApiManager(metaclass=Singleton):
         model (str): The model to use for the API call.
         temperature (float): The temperature to use for the API call.
         max_tokens (int): The maximum number of tokens for the API call.
+        call_site (str): The code path making the call, used to label metrics.
         Returns:
         str: The AI's response.
         """
         cfg = Config()
         if temperature is None:
             temperature = cfg.temperature
-        if deployment_id is not None:
-            response = openai.ChatCompletion.create(
-                deployment_id=deployment_id,
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                api_key=cfg.openai_api_key,
-            )
-        else:
-            response = openai.ChatCompletion.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                api_key=cfg.openai_api_key,
-            )
+        start_time = time.monotonic()
+        try:
+            if deployment_id is not None:
+                response = openai.ChatCompletion.create(
+                    deployment_id=deployment_id,
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    api_key=cfg.openai_api_key,
+                )
+            else:
+                response = openai.ChatCompletion.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    api_key=cfg.openai_api_key,
+                )
+        except Exception:
+            self.record_error(model, call_site, time.monotonic() - start_time)
+            raise
+        latency = time.monotonic() - start_time
         if not hasattr(response, "error"):
             logger.debug(f"Response: {response}")
             prompt_tokens = response.usage.prompt_tokens
             completion_tokens = response.usage.completion_tokens
-            self.update_cost(prompt_tokens, completion_tokens, model)
+            self.update_cost(
+                prompt_tokens,
+                completion_tokens,
+                model,
+                call_site=call_site,
+                latency=latency,
+            )
+        else:
+            self.record_error(model, call_site, latency)
         return response
 
-    def update_cost(self, prompt_tokens, completion_tokens, model):
+    def update_cost(
+        self,
+        prompt_tokens,
+        completion_tokens,
+        model,
+        call_site: str = DEFAULT_CALL_SITE,
+        latency: float | None = None,
+    ):
         """
         Update the total cost, prompt tokens, and completion tokens.
 
@@ -74,14 +129,113 @@ class ApiManager(metaclass=Singleton):
         prompt_tokens (int): The number of tokens used in the prompt.
         completion_tokens (int): The number of tokens used in the completion.
         model (str): The model used for the API call.
+        call_site (str): The code path that made the call.
+        latency (float): The duration of the call in seconds, if it was measured.
         """
-        self.total_prompt_tokens += prompt_tokens
-        self.total_completion_tokens += completion_tokens
-        self.total_cost += (
+        cost = (
             prompt_tokens * COSTS[model]["prompt"]
             + completion_tokens * COSTS[model]["completion"]
         ) / 1000
-        logger.debug(f"Total running cost: ${self.total_cost:.3f}")
+        with self._lock:
+            self.total_prompt_tokens += prompt_tokens
+            self.total_completion_tokens += completion_tokens
+            self.total_cost += cost
+            labels = (model, call_site, SUCCESS_STATUS)
+            for metrics in (self.metrics[labels], self.cycle_metrics[labels]):
+                metrics.calls += 1
+                metrics.prompt_tokens += prompt_tokens
+                metrics.completion_tokens += completion_tokens
+                metrics.cost += cost
+                if latency is not None:
+                    metrics.latency.observe(latency)
+            if latency is not None:
+                self.latencies[model].append(latency)
+            total_cost = self.total_cost
+        logger.debug(f"Total running cost: ${total_cost:.3f}")
+
+    def record_error(self, model: str, call_site: str, latency: float) -> None:
+        """
+        Record an API call that failed.
+
+        Args:
+        model (str): The model used for the API call.
+        call_site (str): The code path that made the call.
+        latency (float): The time until the call failed in seconds.
+        """
+        with self._lock:
+            labels = (model, call_site, ERROR_STATUS)
+            for metrics in (self.metrics[labels], self.cycle_metrics[labels]):
+                metrics.calls += 1
+                metrics.latency.observe(latency)
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        """
+        Record the wall-clock latency of an API call.
+
+        Args:
+        model (str): The model used for the API call.
+        seconds (float): The duration of the API call in seconds.
+        """
+        with self._lock:
+            self.latencies[model].append(seconds)
+
+    def get_average_latency(self, model: str) -> float | None:
+        """
+        Get the average latency of the most recent API calls to a model.
+
+        Args:
+        model (str): The model to get the latency for.
+
+        Returns:
+        float | None: The average latency in seconds, or None if the model has
+            not been called yet.
+        """
+        with self._lock:
+            recent = list(self.latencies.get(model, ()))
+        if not recent:
+            return None
+        return sum(recent) / len(recent)
+
+    def start_cycle(self) -> None:
+        """Start a new agent cycle, clearing the per-cycle breakdown."""
+        with self._lock:
+            self.cycle_metrics = defaultdict(CallMetrics)
+
+    def get_cycle_breakdown(self) -> list:
+        """
+        Get the API usage of the current cycle.
+
+        Returns:
+        list: One entry per (model, call site, status) with its counters.
+        """
+        with self._lock:
+            return metrics_to_list(self.cycle_metrics)
+
+    def snapshot(self) -> dict:
+        """
+        Get a consistent copy of all totals and labeled metrics.
+
+        Returns:
+        dict: The running totals and one entry per (model, call site, status).
+        """
+        with self._lock:
+            return {
+                "total_prompt_tokens": self.total_prompt_tokens,
+                "total_completion_tokens": self.total_completion_tokens,
+                "total_cost": self.total_cost,
+                "total_budget": self.total_budget,
+                "calls": metrics_to_list(self.metrics),
+            }
+
+    def export_json(self) -> str:
+        """Export the labeled metrics as JSON."""
+        with self._lock:
+            return metrics_to_json(self.metrics)
+
+    def export_prometheus(self) -> str:
+        """Export the labeled metrics in the Prometheus text format."""
+        with self._lock:
+            return metrics_to_prometheus(self.metrics)
 
     def set_total_budget(self, total_budget):
         """
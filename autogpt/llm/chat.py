@@ -7,9 +7,12 @@ from autogpt.config import Config
 from autogpt.llm.api_manager import ApiManager
 from autogpt.llm.base import Message
 from autogpt.llm.llm_utils import create_chat_completion
+from autogpt.llm.metrics import PLANNING_CALL_SITE
+from autogpt.llm.model_router import ModelRouter
 from autogpt.llm.token_counter import count_message_tokens
 from autogpt.log_cycle.log_cycle import CURRENT_CONTEXT_FILE_NAME
 from autogpt.logs import logger
+from autogpt.prompts.system_prompt import SystemPrompt
 
 cfg = Config()
 
@@ -28,12 +31,27 @@ def create_chat_message(role, content) -> Message:
     return {"role": role, "content": content}
 
 
+def count_prompt_tokens(prompt, model) -> int:
+    """
+    Count the tokens a system prompt uses as a message, without the reply priming.
+
+    Prompts built by AIConfig.get_system_prompt cache their count per model, so
+    they are only encoded once.
+    """
+    if isinstance(prompt, SystemPrompt):
+        return prompt.count_tokens(model)
+    return count_message_tokens(
+        [create_chat_message("system", prompt)], model
+    ) - count_message_tokens([], model)
+
+
 def generate_context(prompt, relevant_memory, full_message_history, model):
+    time_message = create_chat_message(
+        "system", f"The current time and date is {time.strftime('%c')}"
+    )
     current_context = [
         create_chat_message("system", prompt),
-        create_chat_message(
-            "system", f"The current time and date is {time.strftime('%c')}"
-        ),
+        time_message,
         # create_chat_message(
         #     "system",
         #     f"This reminds you of these events from your past:\n{relevant_memory}\n\n",
@@ -43,8 +61,10 @@ def generate_context(prompt, relevant_memory, full_message_history, model):
     # Add messages from the full message history until we reach the token limit
     next_message_to_add_index = len(full_message_history) - 1
     insertion_index = len(current_context)
-    # Count the currently used tokens
-    current_tokens_used = count_message_tokens(current_context, model)
+    # Count the currently used tokens, only encoding the small date/time message
+    current_tokens_used = count_prompt_tokens(prompt, model) + count_message_tokens(
+        [time_message], model
+    )
     return (
         next_message_to_add_index,
         current_tokens_used,
@@ -77,7 +97,20 @@ def chat_with_ai(
             Returns:
             str: The AI's response.
             """
-            model = cfg.fast_llm_model  # TODO: Change model from hardcode to argument
+            # The message history is trimmed to whatever fits, so only the parts
+            # of the context that are always sent decide which model is needed.
+            decision = ModelRouter().route(
+                PLANNING_CALL_SITE,
+                prompt_tokens=lambda: count_prompt_tokens(prompt, cfg.fast_llm_model)
+                + count_message_tokens(
+                    [create_chat_message("user", user_input)], cfg.fast_llm_model
+                )
+                + 500,
+                completion_tokens=1000,
+            )
+            model = decision.model
+            if decision.escalated:
+                token_limit = decision.token_limit
             # Reserve 1000 tokens for the response
             logger.debug(f"Token limit: {token_limit}")
             send_token_limit = token_limit - 1000
@@ -94,7 +127,8 @@ def chat_with_ai(
             #         shuffle(relevant_memories)
             #     relevant_memory = str(relevant_memories)
             relevant_memory = ""
-            logger.debug(f"Memory Stats: {permanent_memory.get_stats()}")
+            if cfg.debug_mode:
+                logger.debug(f"Memory Stats: {permanent_memory.cached_stats()}")
 
             (
                 next_message_to_add_index,
@@ -245,6 +279,7 @@ def chat_with_ai(
                 model=model,
                 messages=current_context,
                 max_tokens=tokens_remaining,
+                call_site=PLANNING_CALL_SITE,
             )
 
             # Update full message history
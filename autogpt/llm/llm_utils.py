@@ -14,8 +14,18 @@ from openai.error import APIError, RateLimitError, Timeout
 from autogpt.config import Config
 from autogpt.llm.api_manager import ApiManager
 from autogpt.llm.base import Message
+from autogpt.llm.metrics import (
+    AI_FUNCTION_CALL_SITE,
+    DEFAULT_CALL_SITE,
+    EMBEDDING_CALL_SITE,
+)
+from autogpt.llm.model_router import ModelRouter
+from autogpt.llm.token_counter import count_message_tokens
 from autogpt.logs import logger
 
+# The number of texts (or text chunks) embedded per OpenAI API request
+EMBEDDING_BATCH_SIZE = 256
+
 
 def retry_openai_api(
     num_retries: int = 10,
@@ -71,7 +81,11 @@ def retry_openai_api(
 
 
 def call_ai_function(
-    function: str, args: list, description: str, model: str | None = None
+    function: str,
+    args: list,
+    description: str,
+    model: str | None = None,
+    call_site: str = AI_FUNCTION_CALL_SITE,
 ) -> str:
     """Call an AI function
 
@@ -83,13 +97,13 @@ def call_ai_function(
         args (list): The arguments to pass to the function
         description (str): The description of the function
         model (str, optional): The model to use. Defaults to None.
+        call_site (str, optional): The code path making the call, used for routing
+            and metrics. Defaults to "ai_function".
 
     Returns:
         str: The response from the function
     """
     cfg = Config()
-    if model is None:
-        model = cfg.fast_llm_model
     # For each arg, if any are None, convert to "None":
     args = [str(arg) if arg is not None else "None" for arg in args]
     # parse args to comma separated string
@@ -102,8 +116,21 @@ def call_ai_function(
         },
         {"role": "user", "content": args},
     ]
+    if model is None:
+        model = (
+            ModelRouter()
+            .route(
+                call_site,
+                prompt_tokens=lambda: count_message_tokens(
+                    messages, cfg.fast_llm_model
+                ),
+            )
+            .model
+        )
 
-    return create_chat_completion(model=model, messages=messages, temperature=0)
+    return create_chat_completion(
+        model=model, messages=messages, temperature=0, call_site=call_site
+    )
 
 
 # Overly simple abstraction until we create something better
@@ -113,6 +140,7 @@ def create_chat_completion(
     model: Optional[str] = None,
     temperature: float = None,
     max_tokens: Optional[int] = None,
+    call_site: str = DEFAULT_CALL_SITE,
 ) -> str:
     """Create a chat completion using the OpenAI API
 
@@ -121,6 +149,8 @@ def create_chat_completion(
         model (str, optional): The model to use. Defaults to None.
         temperature (float, optional): The temperature to use. Defaults to 0.9.
         max_tokens (int, optional): The max tokens to use. Defaults to None.
+        call_site (str, optional): The code path making the call, used to label
+            API metrics. Defaults to "other".
 
     Returns:
         str: The response from the chat completion
@@ -161,6 +191,7 @@ def create_chat_completion(
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
+                    call_site=call_site,
                 )
             else:
                 response = api_manager.create_chat_completion(
@@ -168,6 +199,7 @@ def create_chat_completion(
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
+                    call_site=call_site,
                 )
             break
         except RateLimitError:
@@ -272,6 +304,7 @@ def create_embedding(
         tokenizer_name=cfg.embedding_tokenizer,
         chunk_length=cfg.embedding_token_limit,
     ):
+        start_time = time.monotonic()
         embedding = openai.Embedding.create(
             input=[chunk],
             api_key=cfg.openai_api_key,
@@ -282,10 +315,28 @@ def create_embedding(
             prompt_tokens=embedding.usage.prompt_tokens,
             completion_tokens=0,
             model=cfg.embedding_model,
+            call_site=EMBEDDING_CALL_SITE,
+            latency=time.monotonic() - start_time,
         )
         chunk_embeddings.append(embedding["data"][0]["embedding"])
         chunk_lengths.append(len(chunk))
 
+    return average_chunk_embeddings(chunk_embeddings, chunk_lengths)
+
+
+def average_chunk_embeddings(
+    chunk_embeddings: List[List[float]], chunk_lengths: List[int]
+) -> List[float]:
+    """Combine the embeddings of the chunks of a text into one embedding.
+
+    Args:
+        chunk_embeddings (List[List[float]]): The embedding of each chunk.
+        chunk_lengths (List[int]): The number of tokens in each chunk.
+
+    Returns:
+        List[float]: The average of the chunk embeddings weighted by their length,
+            normalized to length one.
+    """
     # do weighted avg
     chunk_embeddings = np.average(chunk_embeddings, axis=0, weights=chunk_lengths)
     chunk_embeddings = chunk_embeddings / np.linalg.norm(
@@ -293,3 +344,84 @@ def create_embedding(
     )  # normalize the length to one
     chunk_embeddings = chunk_embeddings.tolist()
     return chunk_embeddings
+
+
+def get_ada_embeddings(texts: List[str]) -> List[List[float]]:
+    """Get the embeddings of several texts from the ada model in batched requests.
+
+    Args:
+        texts (List[str]): The texts to embed.
+
+    Returns:
+        List[List[float]]: The embedding of each text.
+    """
+    if not texts:
+        return []
+    cfg = Config()
+    model = cfg.embedding_model
+    texts = [text.replace("\n", " ") for text in texts]
+
+    if cfg.use_azure:
+        kwargs = {"engine": cfg.get_azure_deployment_id_for_model(model)}
+    else:
+        kwargs = {"model": model}
+
+    return create_embeddings(texts, **kwargs)
+
+
+@retry_openai_api()
+def create_embeddings(
+    texts: List[str],
+    *_,
+    **kwargs,
+) -> List[List[float]]:
+    """Create the embeddings of several texts with as few OpenAI API calls as possible
+
+    The chunks of all texts are sent together, EMBEDDING_BATCH_SIZE per request.
+
+    Args:
+        texts (List[str]): The texts to embed.
+        kwargs: Other arguments to pass to the OpenAI API embedding creation call.
+
+    Returns:
+        List[List[float]]: The embedding of each text.
+    """
+    cfg = Config()
+    chunks = []
+    chunk_owners = []
+    for text_index, text in enumerate(texts):
+        for chunk in chunked_tokens(
+            text,
+            tokenizer_name=cfg.embedding_tokenizer,
+            chunk_length=cfg.embedding_token_limit,
+        ):
+            chunks.append(chunk)
+            chunk_owners.append(text_index)
+
+    chunk_embeddings = []
+    for batch in batched(chunks, EMBEDDING_BATCH_SIZE):
+        start_time = time.monotonic()
+        embedding = openai.Embedding.create(
+            input=list(batch),
+            api_key=cfg.openai_api_key,
+            **kwargs,
+        )
+        api_manager = ApiManager()
+        api_manager.update_cost(
+            prompt_tokens=embedding.usage.prompt_tokens,
+            completion_tokens=0,
+            model=cfg.embedding_model,
+            call_site=EMBEDDING_CALL_SITE,
+            latency=time.monotonic() - start_time,
+        )
+        data = sorted(embedding["data"], key=lambda item: item["index"])
+        chunk_embeddings.extend(item["embedding"] for item in data)
+
+    text_chunks = [([], []) for _ in texts]
+    for owner, chunk, chunk_embedding in zip(chunk_owners, chunks, chunk_embeddings):
+        text_chunks[owner][0].append(chunk_embedding)
+        text_chunks[owner][1].append(len(chunk))
+    return [
+        average_chunk_embeddings(embeddings, lengths)
+        for embeddings, lengths in text_chunks
+    ]
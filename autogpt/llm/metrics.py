@@ -0,0 +1,121 @@
+"""Labeled counters and latency histograms for LLM API calls."""
+from __future__ import annotations
+
+import bisect
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Names of the code paths that call the LLM API, used to label metrics
+PLANNING_CALL_SITE = "planning"
+SUMMARY_CALL_SITE = "summary"
+AI_FUNCTION_CALL_SITE = "ai_function"
+JSON_FIX_CALL_SITE = "json_fix"
+BROWSE_SUMMARY_CALL_SITE = "browse_summary"
+EMBEDDING_CALL_SITE = "embedding"
+DEFAULT_CALL_SITE = "other"
+
+SUCCESS_STATUS = "success"
+ERROR_STATUS = "error"
+
+# (model, call_site, status)
+MetricLabels = Tuple[str, str, str]
+
+
+@dataclass
+class LatencyHistogram:
+    """Cumulative latency histogram in the Prometheus bucket layout."""
+
+    bucket_counts: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    count: int = 0
+    sum: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative_buckets(self) -> Dict[str, int]:
+        """Map each bucket upper bound, including "+Inf", to its cumulative count."""
+        buckets = {}
+        running = 0
+        for bound, bucket_count in zip(
+            [*map(str, LATENCY_BUCKETS), "+Inf"], self.bucket_counts
+        ):
+            running += bucket_count
+            buckets[bound] = running
+        return buckets
+
+
+@dataclass
+class CallMetrics:
+    """Counters for every API call sharing the same labels."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": self.cost,
+            "latency_count": self.latency.count,
+            "latency_sum": self.latency.sum,
+            "latency_buckets": self.latency.cumulative_buckets(),
+        }
+
+
+def metrics_to_list(metrics: Dict[MetricLabels, CallMetrics]) -> List[dict]:
+    """Flatten labeled metrics into a JSON serializable list."""
+    return [
+        {"model": model, "call_site": call_site, "status": status, **m.to_dict()}
+        for (model, call_site, status), m in sorted(metrics.items())
+    ]
+
+
+def metrics_to_json(metrics: Dict[MetricLabels, CallMetrics]) -> str:
+    return json.dumps(metrics_to_list(metrics), indent=4)
+
+
+def metrics_to_prometheus(metrics: Dict[MetricLabels, CallMetrics]) -> str:
+    """Render labeled metrics in the Prometheus text exposition format."""
+    counters = {
+        "autogpt_llm_calls_total": ("calls", "Number of LLM API calls."),
+        "autogpt_llm_prompt_tokens_total": ("prompt_tokens", "Prompt tokens used."),
+        "autogpt_llm_completion_tokens_total": (
+            "completion_tokens",
+            "Completion tokens used.",
+        ),
+        "autogpt_llm_cost_dollars_total": ("cost", "Cost of LLM API calls in USD."),
+    }
+    lines = []
+    for name, (attribute, description) in counters.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, m in sorted(metrics.items()):
+            lines.append(f"{name}{{{_format_labels(labels)}}} {getattr(m, attribute)}")
+
+    name = "autogpt_llm_latency_seconds"
+    lines.append(f"# HELP {name} Latency of LLM API calls in seconds.")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, m in sorted(metrics.items()):
+        label_string = _format_labels(labels)
+        for bound, bucket_count in m.latency.cumulative_buckets().items():
+            lines.append(f'{name}_bucket{{{label_string},le="{bound}"}} {bucket_count}')
+        lines.append(f"{name}_sum{{{label_string}}} {m.latency.sum}")
+        lines.append(f"{name}_count{{{label_string}}} {m.latency.count}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: MetricLabels) -> str:
+    model, call_site, status = labels
+    return f'model="{model}",call_site="{call_site}",status="{status}"'
@@ -0,0 +1,210 @@
+"""Route LLM calls between the fast and the smart model."""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+
+from autogpt.config import Config
+from autogpt.llm.api_manager import ApiManager
+from autogpt.llm.metrics import (
+    AI_FUNCTION_CALL_SITE,
+    BROWSE_SUMMARY_CALL_SITE,
+    JSON_FIX_CALL_SITE,
+    PLANNING_CALL_SITE,
+    SUMMARY_CALL_SITE,
+)
+from autogpt.llm.modelsinfo import COSTS
+from autogpt.logs import logger
+from autogpt.singleton import Singleton
+
+# Latency targets in seconds, overridable with MODEL_ROUTING_LATENCY_SLOS
+DEFAULT_LATENCY_SLOS = {
+    PLANNING_CALL_SITE: 60.0,
+    SUMMARY_CALL_SITE: 20.0,
+    AI_FUNCTION_CALL_SITE: 30.0,
+    JSON_FIX_CALL_SITE: 30.0,
+    BROWSE_SUMMARY_CALL_SITE: 20.0,
+}
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    """The model chosen for a single LLM call and why it was chosen."""
+
+    call_site: str
+    model: str
+    token_limit: int
+    reason: str
+    escalated: bool = False
+
+
+def parse_latency_slos(value: str) -> Dict[str, float]:
+    """Parse a "call_site:seconds,call_site:seconds" string into a dict.
+
+    Args:
+        value (str): The comma separated list of latency targets.
+
+    Returns:
+        Dict[str, float]: The latency target in seconds for each call site.
+    """
+    slos = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        call_site, _, seconds = item.partition(":")
+        try:
+            slos[call_site.strip()] = float(seconds)
+        except ValueError:
+            logger.warn(f"Ignoring invalid model routing latency target: {item}")
+    return slos
+
+
+class ModelRouter(metaclass=Singleton):
+    """Picks the fast or smart LLM for each call site.
+
+    Every call site starts on the fast model and only escalates to the smart
+    model when it is needed: the prompt does not fit into the fast model's
+    context, or the fast model's recently observed latency breaches the call
+    site's latency target while the smart model was observed to be faster.
+    Escalations that would exceed the remaining budget tracked by the
+    ApiManager are refused.
+    """
+
+    def __init__(self):
+        self.decisions = Counter()
+
+    def get_latency_slo(self, call_site: str) -> float:
+        """Get the latency target for a call site in seconds."""
+        cfg = Config()
+        slos = {
+            **DEFAULT_LATENCY_SLOS,
+            **parse_latency_slos(cfg.model_routing_latency_slos),
+        }
+        return slos.get(call_site, DEFAULT_LATENCY_SLOS[PLANNING_CALL_SITE])
+
+    def route(
+        self,
+        call_site: str,
+        prompt_tokens: Union[int, Callable[[], int]],
+        completion_tokens: int = 0,
+    ) -> RoutingDecision:
+        """Choose the model to use for a call.
+
+        Args:
+            call_site (str): The name of the code path making the call.
+            prompt_tokens (int | Callable[[], int]): The number of tokens in the
+                prompt, or a function counting them. The function is only
+                called when routing is enabled, so disabled routing does not
+                tokenize the prompt.
+            completion_tokens (int): The number of tokens reserved for the response.
+
+        Returns:
+            RoutingDecision: The chosen model, its token limit and the reason.
+        """
+        cfg = Config()
+        fast_model, smart_model = cfg.fast_llm_model, cfg.smart_llm_model
+
+        if not cfg.use_model_routing or fast_model == smart_model:
+            decision = RoutingDecision(
+                call_site, fast_model, cfg.fast_token_limit, "routing disabled"
+            )
+            return self._record(
+                decision, None if callable(prompt_tokens) else prompt_tokens
+            )
+
+        if callable(prompt_tokens):
+            try:
+                prompt_tokens = prompt_tokens()
+            except NotImplementedError as e:
+                # The tokenizer does not know the model, so keep the default
+                logger.debug(f"Model routing cannot count the prompt tokens: {e}")
+                decision = RoutingDecision(
+                    call_site, fast_model, cfg.fast_token_limit, "prompt size unknown"
+                )
+                return self._record(decision, None)
+
+        required_tokens = prompt_tokens + completion_tokens
+        estimated_cost = self._estimate_cost(
+            smart_model, prompt_tokens, completion_tokens
+        )
+        smart_affordable = self._is_affordable(estimated_cost)
+
+        if required_tokens > cfg.fast_token_limit:
+            if required_tokens <= cfg.smart_token_limit and smart_affordable:
+                decision = RoutingDecision(
+                    call_site,
+                    smart_model,
+                    cfg.smart_token_limit,
+                    f"{required_tokens} tokens exceed the fast model context",
+                    escalated=True,
+                )
+            else:
+                decision = RoutingDecision(
+                    call_site,
+                    fast_model,
+                    cfg.fast_token_limit,
+                    f"{required_tokens} tokens exceed the fast model context, "
+                    "but the smart model is too small or over budget",
+                )
+            return self._record(decision, prompt_tokens)
+
+        api_manager = ApiManager()
+        slo = self.get_latency_slo(call_site)
+        fast_latency = api_manager.get_average_latency(fast_model)
+        smart_latency = api_manager.get_average_latency(smart_model)
+        if (
+            fast_latency is not None
+            and fast_latency > slo
+            and smart_latency is not None
+            and smart_latency < fast_latency
+            and required_tokens <= cfg.smart_token_limit
+            and smart_affordable
+        ):
+            decision = RoutingDecision(
+                call_site,
+                smart_model,
+                cfg.smart_token_limit,
+                f"fast model latency {fast_latency:.1f}s breaches the {slo:.1f}s SLO",
+                escalated=True,
+            )
+            return self._record(decision, prompt_tokens)
+
+        decision = RoutingDecision(
+            call_site, fast_model, cfg.fast_token_limit, "within fast model limits"
+        )
+        return self._record(decision, prompt_tokens)
+
+    def get_decision_counts(self) -> Dict[tuple, int]:
+        """Get how often each (call site, model) pair has been chosen."""
+        return dict(self.decisions)
+
+    def reset(self) -> None:
+        self.decisions = Counter()
+
+    @staticmethod
+    def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        if model not in COSTS:
+            return 0.0
+        return (
+            prompt_tokens * COSTS[model]["prompt"]
+            + completion_tokens * COSTS[model]["completion"]
+        ) / 1000
+
+    @staticmethod
+    def _is_affordable(estimated_cost: float) -> bool:
+        api_manager = ApiManager()
+        total_budget = api_manager.get_total_budget()
+        if total_budget <= 0.0:
+            return True
+        return total_budget - api_manager.get_total_cost() >= estimated_cost
+
+    def _record(
+        self, decision: RoutingDecision, prompt_tokens: Optional[int]
+    ) -> RoutingDecision:
+        self.decisions[(decision.call_site, decision.model)] += 1
+        logger.debug(
+            f"Model routing: call_site={decision.call_site} model={decision.model} "
+            f"prompt_tokens={prompt_tokens} reason={decision.reason}"
+        )
+        return decision
@@ -74,3 +74,20 @@ def count_string_tokens(string: str, model_name: str) -> int:
     """
     encoding = tiktoken.encoding_for_model(model_name)
     return len(encoding.encode(string))
+
+
+def count_strings_tokens(strings: List[str], model_name: str) -> List[int]:
+    """
+    Returns the number of tokens in each of several text strings.
+
+    The strings are encoded in one batch, in parallel threads.
+
+    Args:
+        strings (list): The text strings.
+        model_name (str): The name of the encoding to use. (e.g., "gpt-3.5-turbo")
+
+    Returns:
+        list: The number of tokens in each text string.
+    """
+    encoding = tiktoken.encoding_for_model(model_name)
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(strings)]
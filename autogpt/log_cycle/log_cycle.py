@@ -11,6 +11,7 @@ NEXT_ACTION_FILE_NAME = "next_action.json"
 PROMPT_SUMMARY_FILE_NAME = "prompt_summary.json"
 SUMMARY_FILE_NAME = "summary.txt"
 USER_INPUT_FILE_NAME = "user_input.txt"
+API_USAGE_FILE_NAME = "api_usage.json"
 
 
 class LogCycleHandler:
@@ -162,14 +162,17 @@ def run_auto_gpt(
                 logger.info(f"Loaded plugin into logger: {plugin.__class__.__name__}")
                 logger.chat_plugins.append(plugin)
 
-    # Initialize memory and make sure it is empty.
+    # Initialize memory and make sure it is empty, unless the local memory of the
+    # previous run should be kept.
     # this is particularly important for indexing and referencing pinecone memory
-    memory = get_memory(cfg, init=True)
+    memory = get_memory(
+        cfg, init=cfg.memory_backend != "local" or cfg.wipe_local_memory_on_start
+    )
     logger.typewriter_log(
         "Using memory of type:", Fore.GREEN, f"{memory.__class__.__name__}"
     )
     logger.typewriter_log("Using Browser:", Fore.GREEN, cfg.selenium_web_browser)
-    system_prompt = ai_config.construct_full_prompt()
+    system_prompt = ai_config.get_system_prompt()
     if cfg.debug_mode:
         logger.typewriter_log("Prompt:", Fore.GREEN, system_prompt)
 
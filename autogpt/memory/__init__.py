@@ -1,6 +1,8 @@
 from autogpt.logs import logger
+from autogpt.memory.dedup import DedupMemory
 from autogpt.memory.local import LocalCache
 from autogpt.memory.no_memory import NoMemory
+from autogpt.memory.write_behind import WriteBehindMemory
 
 # List of supported memory backends
 # Add a backend to this list if the import attempt is successful
@@ -37,6 +39,7 @@ except ImportError:
 
 def get_memory(cfg, init=False):
     memory = None
+    clear = False
     if cfg.memory_backend == "pinecone":
         if not PineconeMemory:
             logger.warn(
@@ -45,8 +48,7 @@ def get_memory(cfg, init=False):
             )
         else:
             memory = PineconeMemory(cfg)
-            if init:
-                memory.clear()
+            clear = init
     elif cfg.memory_backend == "redis":
         if not RedisMemory:
             logger.warn(
@@ -76,8 +78,19 @@ def get_memory(cfg, init=False):
 
     if memory is None:
         memory = LocalCache(cfg)
-        if init:
-            memory.clear()
+        clear = init
+
+    if cfg.memory_backend in cfg.memory_dedup_backends:
+        memory = DedupMemory.wrap(memory, threshold=cfg.memory_dedup_threshold)
+    if cfg.memory_write_behind:
+        memory = WriteBehindMemory.wrap(
+            memory,
+            max_queue_size=cfg.memory_write_behind_queue_size,
+            batch_size=cfg.memory_write_behind_batch_size,
+        )
+    # Cleared through the wrappers, so they forget what they knew about it
+    if clear:
+        memory.clear()
     return memory
 
 
@@ -93,4 +106,6 @@ __all__ = [
     "NoMemory",
     "MilvusMemory",
     "WeaviateMemory",
+    "WriteBehindMemory",
+    "DedupMemory",
 ]
@@ -1,8 +1,64 @@
 """Base class for memory providers."""
 import abc
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
 
+from autogpt.llm import get_ada_embeddings
+from autogpt.logs import logger
 from autogpt.singleton import AbstractSingleton
 
+# How long cached memory stats are reused before they are refreshed, in seconds
+STATS_MAX_AGE = 60.0
+
+
+@dataclass
+class RelevantMemories:
+    """The memories relevant to one of the texts passed to get_relevant_many.
+
+    Times are in seconds. When the texts are embedded or searched in one batch,
+    each text gets an equal share of the batch time.
+    """
+
+    query: str
+    results: Optional[List[Any]]
+    embedding_time: float = 0.0
+    search_time: float = 0.0
+
+
+class StatsCache:
+    """The last stats of a memory provider, refreshed in a background thread."""
+
+    def __init__(self) -> None:
+        self.stats: Any = None
+        self.updated_at: Optional[float] = None
+        self._refresh: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def get(self, get_stats, max_age: float) -> Any:
+        with self._lock:
+            stats = self.stats
+            stale = (
+                self.updated_at is None or time.monotonic() - self.updated_at > max_age
+            )
+            if stale and (self._refresh is None or not self._refresh.is_alive()):
+                self._refresh = threading.Thread(
+                    target=self._update,
+                    args=(get_stats,),
+                    name="memory-stats",
+                    daemon=True,
+                )
+                self._refresh.start()
+            return stats
+
+    def _update(self, get_stats) -> None:
+        try:
+            self.stats = get_stats()
+        except Exception as e:
+            logger.warn(f"Failed to get memory stats: {e}")
+        self.updated_at = time.monotonic()
+
 
 class MemoryProviderSingleton(AbstractSingleton):
     @abc.abstractmethod
@@ -29,3 +85,109 @@ class MemoryProviderSingleton(AbstractSingleton):
     def get_stats(self):
         """Get stats from memory"""
         pass
+
+    def cached_stats(self, max_age: float = STATS_MAX_AGE):
+        """Gets the stats from memory without waiting for the provider
+
+        Returns the stats of the last refresh, or None before the first one
+        completes. Stats older than max_age seconds are refreshed in a
+        background thread, so the agent loop never waits for an index
+        introspection.
+        """
+        if "_stats_cache" not in self.__dict__:
+            self._stats_cache = StatsCache()
+        return self._stats_cache.get(self.get_stats, max_age)
+
+    def add_many(self, data, embeddings=None):
+        """Adds several texts to memory
+
+        Providers that can write several texts at once implement this, using
+        the given embeddings of the texts if they are not None.
+        """
+        return [self.add(text) for text in data]
+
+    @property
+    def supports_add_many(self) -> bool:
+        """Whether the provider writes several texts at once in add_many"""
+        return type(self).add_many is not MemoryProviderSingleton.add_many
+
+    @property
+    def supports_search_many(self) -> bool:
+        """Whether the provider searches several embeddings at once"""
+        return type(self).search_many is not MemoryProviderSingleton.search_many
+
+    @property
+    def supports_nearest_similarities(self) -> bool:
+        """Whether the provider can score embeddings against their nearest memory"""
+        return (
+            type(self).nearest_similarities
+            is not MemoryProviderSingleton.nearest_similarities
+        )
+
+    def nearest_similarities(self, embeddings) -> List[float]:
+        """Gets the cosine similarity of each embedding to its nearest memory
+
+        Used to skip near-duplicate inserts. Providers that can search with
+        scores implement this, returning 0.0 for an embedding when the memory
+        is empty. Other providers score every embedding 0.0, so nothing is
+        taken for a near duplicate.
+        """
+        return [0.0] * len(embeddings)
+
+    @property
+    def generation(self) -> int:
+        """A number that changes whenever memories are cleared or evicted
+
+        Wrappers that remember what is in memory start over when it changes.
+        Providers that clear or evict memories on their own implement this.
+        """
+        return 0
+
+    def stored_texts(self) -> Optional[Sequence[str]]:
+        """Gets all texts in memory, if the provider holds them locally"""
+        return None
+
+    def search_many(self, embeddings, num_relevant=5):
+        """Gets relevant memory for each of several query embeddings
+
+        Providers that can search several embeddings at once implement this,
+        returning a list of results per embedding. Other providers can only
+        search by text, with get_relevant, so they find nothing here.
+        """
+        return [[] for _ in embeddings]
+
+    def get_relevant_many(
+        self, data: List[str], num_relevant: int = 5
+    ) -> List[RelevantMemories]:
+        """Gets relevant memory for each of several texts
+
+        If the provider implements search_many, all texts are embedded in one
+        batch and searched with a single call, otherwise get_relevant is called
+        for each text.
+        """
+        if not data:
+            return []
+        if not self.supports_search_many:
+            relevant = []
+            for text in data:
+                start_time = time.monotonic()
+                results = self.get_relevant(text, num_relevant)
+                relevant.append(
+                    RelevantMemories(
+                        text, results, search_time=time.monotonic() - start_time
+                    )
+                )
+            return relevant
+
+        start_time = time.monotonic()
+        embeddings = get_ada_embeddings(data)
+        embedding_time = (time.monotonic() - start_time) / len(data)
+
+        start_time = time.monotonic()
+        results = self.search_many(embeddings, num_relevant)
+        search_time = (time.monotonic() - start_time) / len(data)
+
+        return [
+            RelevantMemories(text, text_results, embedding_time, search_time)
+            for text, text_results in zip(data, results)
+        ]
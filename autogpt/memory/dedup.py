@@ -0,0 +1,213 @@
+"""Skips inserts of texts that are already in memory."""
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any, Dict, List, Set
+
+import numpy as np
+
+from autogpt.llm import get_ada_embeddings
+from autogpt.logs import logger
+from autogpt.memory.base import MemoryProviderSingleton
+
+_deduplicators: Dict[int, DedupMemory] = {}
+_deduplicators_lock = threading.Lock()
+
+
+def content_hash(text: str) -> bytes:
+    """Hash a text, ignoring differences in whitespace."""
+    return hashlib.blake2b(" ".join(text.split()).encode(), digest_size=16).digest()
+
+
+class DedupMemory:
+    """
+    Wraps a memory provider so that duplicate texts are not added twice.
+
+    Texts whose content hash was already added are skipped before they are
+    embedded. If `threshold` is set, the remaining texts are embedded and skipped
+    when their cosine similarity to the nearest memory, or to a text earlier in
+    the same batch, is at least `threshold`. The similarity check needs a
+    provider that implements nearest_similarities, otherwise only exact
+    duplicates are skipped.
+
+    The hashes of a provider that holds its texts locally are read on the first
+    add, so duplicates of texts stored by a previous run are skipped too. Other
+    providers only know the hashes of the texts added since the start. The
+    hashes are read again when the provider clears or evicts memories.
+
+    Texts are embedded after the duplicates are skipped, by the provider if it
+    is not given their embeddings, so duplicates are never embedded.
+
+    All other attributes are taken from the wrapped provider.
+    """
+
+    def __init__(self, memory: MemoryProviderSingleton, threshold: float = 0) -> None:
+        """
+        Args:
+            memory: The memory provider to add to.
+            threshold: The cosine similarity from which a text is a near
+                duplicate, 0 to only skip exact duplicates.
+        """
+        self.memory = memory
+        self.threshold = threshold
+        self.skipped_exact = 0
+        self.skipped_similar = 0
+        self._hashes: Set[bytes] | None = None
+        self._generation = memory.generation
+        self._lock = threading.Lock()
+        if threshold and not memory.supports_nearest_similarities:
+            logger.warn(
+                f"{type(memory).__name__} does not support similarity checks,"
+                " only exact duplicates are skipped."
+            )
+            self.threshold = 0
+
+    @classmethod
+    def wrap(cls, memory: MemoryProviderSingleton, threshold: float) -> DedupMemory:
+        """Get the deduplicator of a memory provider, creating it once."""
+        with _deduplicators_lock:
+            deduplicator = _deduplicators.get(id(memory))
+            if deduplicator is None or deduplicator.memory is not memory:
+                deduplicator = cls(memory, threshold)
+                _deduplicators[id(memory)] = deduplicator
+            return deduplicator
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.memory, name)
+
+    @property
+    def skipped(self) -> int:
+        """The number of inserts skipped as duplicates."""
+        return self.skipped_exact + self.skipped_similar
+
+    @property
+    def supports_add_many(self) -> bool:
+        return True
+
+    def add(self, data: str) -> str:
+        """Add a text to memory, unless it is a duplicate."""
+        if self.threshold:
+            added = self.add_many([data])
+            return added[0] if added else ""
+        if not self._claim([data]):
+            self._log_skipped(1)
+            return ""
+        try:
+            added = self.memory.add(data)
+        except BaseException:
+            self._release([data])
+            raise
+        if not added:
+            # The provider dropped the text, like command errors
+            self._release([data])
+        return added
+
+    def add_many(self, data: List[str], embeddings=None) -> List[str]:
+        """
+        Add the texts that are not duplicates to memory.
+
+        Args:
+            data: The texts to add.
+            embeddings: The embeddings of the texts, computed for the texts that
+                are not exact duplicates if not given.
+
+        Returns:
+            The texts that were added.
+        """
+        skipped = self.skipped
+        added = self._add_many(data, embeddings)
+        if self.skipped > skipped:
+            self._log_skipped(self.skipped - skipped)
+        return added
+
+    def _log_skipped(self, count: int) -> None:
+        logger.debug(
+            f"Skipped {count} duplicate memory inserts, {self.skipped_exact} exact"
+            f" and {self.skipped_similar} near duplicates in total"
+        )
+
+    def _add_many(self, data: List[str], embeddings) -> List[str]:
+        keep = self._claim(data)
+        if not keep:
+            return []
+        texts = [data[i] for i in keep]
+        if embeddings is not None:
+            embeddings = [embeddings[i] for i in keep]
+        try:
+            added = self._write(texts, embeddings)
+        except BaseException:
+            # Texts that were not stored can be added again
+            self._release(texts)
+            raise
+        # The provider drops some texts on purpose, like command errors
+        stored = set(added)
+        self._release([text for text in texts if text not in stored])
+        return added
+
+    def _write(self, texts: List[str], embeddings) -> List[str]:
+        # Writes the claimed texts that are not near duplicates, returning them
+        if self.threshold:
+            if embeddings is None:
+                embeddings = get_ada_embeddings(texts)
+            similar = self._find_similar(embeddings)
+            if similar:
+                self.skipped_similar += len(similar)
+                texts = [text for i, text in enumerate(texts) if i not in similar]
+                embeddings = [e for i, e in enumerate(embeddings) if i not in similar]
+            if not texts:
+                return []
+
+        if self.memory.supports_add_many:
+            return self.memory.add_many(texts, embeddings)
+        return [text for text in texts if self.memory.add(text)]
+
+    def clear(self):
+        with self._lock:
+            self._hashes = None
+        return self.memory.clear()
+
+    def _claim(self, texts: List[str]) -> List[int]:
+        # Returns the indices of the texts whose hash is new, recording them
+        with self._lock:
+            generation = self.memory.generation
+            if self._hashes is None or generation != self._generation:
+                self._generation = generation
+                self._hashes = {
+                    content_hash(text) for text in self.memory.stored_texts() or []
+                }
+            keep = []
+            for i, text in enumerate(texts):
+                digest = content_hash(text)
+                if digest in self._hashes:
+                    self.skipped_exact += 1
+                    continue
+                self._hashes.add(digest)
+                keep.append(i)
+            return keep
+
+    def _release(self, texts: List[str]) -> None:
+        # Forgets the hashes of texts that were claimed but not added
+        with self._lock:
+            if self._hashes is not None:
+                self._hashes.difference_update(content_hash(text) for text in texts)
+
+    def _find_similar(self, embeddings) -> Set[int]:
+        similar = {
+            i
+            for i, similarity in enumerate(self.memory.nearest_similarities(embeddings))
+            if similarity >= self.threshold
+        }
+        # Texts in the same batch are not in memory yet, so compare them too
+        vectors = np.array(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1
+        vectors /= norms[:, np.newaxis]
+        similarities = vectors @ vectors.T
+        for i in range(1, len(vectors)):
+            if i in similar:
+                continue
+            earlier = [j for j in range(i) if j not in similar]
+            if earlier and similarities[i, earlier].max() >= self.threshold:
+                similar.add(i)
+        return similar
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import dataclasses
+import threading
+import time
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Sequence
 
 import numpy as np
 import orjson
 
-from autogpt.llm import get_ada_embedding
+from autogpt.llm import get_ada_embedding, get_ada_embeddings
+from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
+from autogpt.memory.local_eviction import EvictionPolicy
+from autogpt.memory.local_index import IVFIndex, exact_search, exact_search_many
+from autogpt.memory.local_lexical import (
+    BM25Index,
+    is_keyword_query,
+    reciprocal_rank_fusion,
+)
+from autogpt.memory.local_quantization import ScalarQuantizer
+from autogpt.memory.local_storage import LazyTexts, LocalStorage
 
 EMBED_DIM = 1536
 SAVE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+INITIAL_CAPACITY = 64
+# Candidates taken from each ranking per result for hybrid search
+HYBRID_CANDIDATES_PER_RESULT = 4
 
 
 def create_default_embeddings():
@@ -20,14 +35,60 @@ def create_default_embeddings():
 
 @dataclasses.dataclass
 class CacheContent:
-    texts: List[str] = dataclasses.field(default_factory=list)
-    embeddings: np.ndarray = dataclasses.field(
-        default_factory=create_default_embeddings
-    )
+    """
+    The texts and embeddings held in memory.
+
+    The embeddings are stored in a preallocated buffer whose capacity doubles
+    when it is full, so appending a row does not copy the whole matrix.
+    Only the first `count` rows of the buffer are live. A memory loaded from disk
+    starts with a read-only memory map of the stored embeddings as its buffer,
+    which is copied into memory on the first append.
+
+    If `storage` is set, the embeddings are not held in memory at all: the
+    buffer is a memory map of the stored embeddings, remapped when it grows.
+    """
+
+    texts: List[str] | LazyTexts = dataclasses.field(default_factory=list)
+    buffer: np.ndarray = dataclasses.field(default_factory=create_default_embeddings)
+    count: int = 0
+    storage: LocalStorage | None = None
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """The live rows of the embedding matrix."""
+        if self.storage is not None and self.capacity != self.count:
+            self.buffer = self.storage.map_vectors(self.count)
+        return self.buffer[: self.count]
+
+    @property
+    def capacity(self) -> int:
+        return self.buffer.shape[0]
+
+    def append(self, vectors: np.ndarray) -> None:
+        """
+        Append a block of embeddings, growing the buffer if needed.
+
+        Args:
+            vectors: The embeddings to append, with shape (n, EMBED_DIM).
+        """
+        required = self.count + vectors.shape[0]
+        if self.storage is not None:
+            # The embeddings are appended to the storage by the caller
+            self.count = required
+            return
+        if required > self.capacity:
+            capacity = max(self.capacity, INITIAL_CAPACITY)
+            while capacity < required:
+                capacity *= 2
+            buffer = np.empty((capacity, EMBED_DIM), dtype=np.float32)
+            buffer[: self.count] = self.embeddings
+            self.buffer = buffer
+        self.buffer[self.count : required] = vectors
+        self.count = required
 
 
 class LocalCache(MemoryProviderSingleton):
-    """A class that stores the memory in a local file"""
+    """A class that stores the memory in local append-only files"""
 
     def __init__(self, cfg) -> None:
         """Initialize a class instance
@@ -39,15 +100,89 @@ class LocalCache(MemoryProviderSingleton):
             None
         """
         workspace_path = Path(cfg.workspace_path)
-        self.filename = workspace_path / f"{cfg.memory_index}.json"
-
-        self.filename.touch(exist_ok=True)
-
-        file_content = b"{}"
-        with self.filename.open("w+b") as f:
-            f.write(file_content)
+        self.storage = LocalStorage(
+            workspace_path,
+            cfg.memory_index,
+            EMBED_DIM,
+            fsync_every=cfg.local_memory_fsync_every,
+        )
+        self.filename = self.storage.header_file
+        self.index = (
+            IVFIndex(nprobe=cfg.local_memory_ivf_nprobe)
+            if cfg.use_local_memory_ann_index
+            else None
+        )
+        # Quantized memories only keep compact codes in memory and re-rank
+        # against the embeddings on disk
+        self.quantizer = (
+            ScalarQuantizer(
+                cfg.local_memory_quantization,
+                rerank_factor=cfg.local_memory_rerank_factor,
+            )
+            if cfg.local_memory_quantization
+            else None
+        )
+        self.lexical_index = BM25Index() if cfg.use_local_memory_hybrid_search else None
+        self.lexical_weight = cfg.local_memory_lexical_weight
+        self.eviction = (
+            EvictionPolicy(
+                max_entries=cfg.local_memory_max_entries,
+                max_bytes=cfg.local_memory_max_bytes,
+                ttl=cfg.local_memory_ttl,
+            )
+            if cfg.local_memory_max_entries
+            or cfg.local_memory_max_bytes
+            or cfg.local_memory_ttl
+            else None
+        )
+        # Held for adds, searches and swapping in a compacted memory, but not
+        # while a compaction copies the memories it keeps
+        self._lock = threading.RLock()
+        # Bumped on every clear and compaction, so a running compaction can tell
+        # its copy is stale
+        self._generation = 0
+        self._compaction: threading.Thread | None = None
+
+        if cfg.wipe_local_memory_on_start:
+            self.storage.reset()
+            self.data = self._create_content()
+        else:
+            # Map the stored memories instead of reading them, so startup does not
+            # depend on the size of the memory
+            count = self.storage.load()
+            self.data = self._create_content(count)
+            if self.eviction:
+                self.eviction.update(self.storage.record_sizes(count), time.time())
+
+    def _create_content(self, count: int = 0) -> CacheContent:
+        if count == 0:
+            texts = []
+        else:
+            texts = self.storage.map_texts(count)
+        return CacheContent(
+            texts=texts,
+            buffer=self.storage.map_vectors(count),
+            count=count,
+            storage=self.storage if self.quantizer else None,
+        )
 
-        self.data = CacheContent()
+    def _append(self, texts: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            self.storage.append_many(texts, vectors)
+            self.data.texts.extend(texts)
+            self.data.append(vectors)
+            if self.index:
+                self.index.update(self.data.embeddings)
+            if self.quantizer:
+                self.quantizer.update(self.data.embeddings)
+            if self.lexical_index:
+                self.lexical_index.update(self.data.texts)
+            if self.eviction:
+                sizes = [len(text.encode("utf-8")) for text in texts]
+                self.eviction.update(
+                    np.array(sizes) + self.storage.row_bytes, time.time()
+                )
+        self._maybe_compact()
 
     def add(self, text: str):
         """
@@ -61,32 +196,60 @@ class LocalCache(MemoryProviderSingleton):
         """
         if "Command Error:" in text:
             return ""
-        self.data.texts.append(text)
 
         embedding = get_ada_embedding(text)
 
         vector = np.array(embedding).astype(np.float32)
-        vector = vector[np.newaxis, :]
-        self.data.embeddings = np.concatenate(
-            [
-                self.data.embeddings,
-                vector,
-            ],
-            axis=0,
-        )
-
-        with open(self.filename, "wb") as f:
-            out = orjson.dumps(self.data, option=SAVE_OPTIONS)
-            f.write(out)
+        self._append([text], vector[np.newaxis, :])
         return text
 
+    def add_many(
+        self, texts: List[str], embeddings: Sequence[Sequence[float]] | None = None
+    ) -> List[str]:
+        """
+        Add a block of texts, appending their embeddings in a single copy
+
+        Args:
+            texts: List[str]
+            embeddings: The embeddings of the texts, computed if not given
+
+        Returns: The texts that were added
+        """
+        if embeddings is None:
+            texts = [text for text in texts if "Command Error:" not in text]
+            embeddings = get_ada_embeddings(texts) if texts else []
+        added = [
+            (text, embedding)
+            for text, embedding in zip(texts, embeddings)
+            if "Command Error:" not in text
+        ]
+        if not added:
+            return []
+        texts = [text for text, _ in added]
+        vectors = np.array([embedding for _, embedding in added], dtype=np.float32)
+
+        self._append(texts, vectors)
+        return texts
+
     def clear(self) -> str:
         """
         Clears the data in memory.
 
         Returns: A message indicating that the memory has been cleared.
         """
-        self.data = CacheContent()
+        with self._lock:
+            # Makes a running compaction discard its copy
+            self._generation += 1
+            self.storage.reset()
+            self.data = self._create_content()
+            if self.index:
+                self.index.reset()
+            if self.quantizer:
+                self.quantizer.reset()
+            if self.lexical_index:
+                self.lexical_index.reset()
+            if self.eviction:
+                self.eviction.reset()
         return "Obliviated"
 
     def get(self, data: str) -> list[Any] | None:
@@ -105,19 +268,183 @@ class LocalCache(MemoryProviderSingleton):
         matrix-vector mult to find score-for-each-row-of-matrix
          get indices for top-k winning scores
          return texts for those indices
+        Uses the approximate nearest neighbour index or the quantized
+         embeddings if they are enabled
+        With hybrid search, fuses the vector ranking with a BM25 keyword
+         ranking, and answers ticker or keyword queries from BM25 alone
+         without embedding them
         Args:
             text: str
             k: int
 
         Returns: List[str]
         """
-        embedding = get_ada_embedding(text)
+        self._maybe_compact()
+        if self.lexical_index is not None and is_keyword_query(text):
+            with self._lock:
+                self.lexical_index.update(self.data.texts)
+                top_k_indices = self.lexical_index.search(text, k)
+                if len(top_k_indices):
+                    return self._retrieve(top_k_indices)
+
+        embedding = np.array(get_ada_embedding(text), dtype=np.float32)
+        with self._lock:
+            if self.lexical_index is None:
+                top_k_indices = self._search_vectors(embedding, k)
+            else:
+                self.lexical_index.update(self.data.texts)
+                candidates = k * HYBRID_CANDIDATES_PER_RESULT
+                top_k_indices = reciprocal_rank_fusion(
+                    [
+                        self._search_vectors(embedding, candidates),
+                        self.lexical_index.search(text, candidates),
+                    ],
+                    [1 - self.lexical_weight, self.lexical_weight],
+                    k,
+                )
+            return self._retrieve(top_k_indices)
+
+    def _retrieve(self, indices) -> List[str]:
+        if self.eviction:
+            self.eviction.touch(indices, time.time())
+        return [self.data.texts[i] for i in indices]
+
+    def _search_vectors(self, embedding: np.ndarray, k: int) -> np.ndarray:
+        if self.index:
+            return self.index.search(self.data.embeddings, embedding, k)
+        if self.quantizer:
+            return self.quantizer.search(self.data.embeddings, embedding, k)
+        return exact_search(self.data.embeddings, embedding, k)
+
+    def search_many(
+        self, embeddings: Sequence[Sequence[float]], k: int = 5
+    ) -> List[List[str]]:
+        """
+        matrix-matrix mult to score every row of the matrix against all queries
+         at once, then get the top-k texts for each query
+        Args:
+            embeddings: The query embeddings
+            k: int
+
+        Returns: List[List[str]]
+        """
+        queries = np.array(embeddings, dtype=np.float32)
+
+        with self._lock:
+            if self.index or self.quantizer:
+                indices = [self._search_vectors(query, k) for query in queries]
+            else:
+                indices = exact_search_many(self.data.embeddings, queries, k)
+            return [self._retrieve(top_k) for top_k in indices]
+
+    def nearest_similarities(
+        self, embeddings: Sequence[Sequence[float]]
+    ) -> List[float]:
+        """
+        Get the cosine similarity of each embedding to its nearest memory
+
+        Args:
+            embeddings: The embeddings to score
+
+        Returns: List[float]
+        """
+        similarities = []
+        with self._lock:
+            for query in np.array(embeddings, dtype=np.float32):
+                if self.data.count == 0:
+                    similarities.append(0.0)
+                    continue
+                nearest = self.data.embeddings[self._search_vectors(query, 1)[0]]
+                norm = np.linalg.norm(nearest) * np.linalg.norm(query)
+                similarities.append(
+                    float(np.dot(nearest, query) / norm) if norm else 0.0
+                )
+        return similarities
+
+    def compact(self) -> int:
+        """
+        Evict memories and rewrite the files without them
+
+        The kept memories are copied to new files and indexed without holding
+        the lock, so searches and adds go on during a compaction. Only swapping
+        in the new files waits for them. Memories added during the compaction
+        are carried over when the files are swapped.
+
+        Returns: The number of evicted memories
+        """
+        if not self.eviction:
+            return 0
+        with self._lock:
+            generation = self._generation
+            count = self.data.count
+            keep = self.eviction.select(time.time())
+            index, quantizer = self.index, self.quantizer
+        if len(keep) == count:
+            return 0
+
+        target = self.storage.compaction_target()
+        try:
+            self.storage.copy_to(target, keep, count)
+            embeddings = target.map_vectors(len(keep))
+            if index:
+                index = index.reindexed(embeddings)
+            if quantizer:
+                quantizer = ScalarQuantizer(quantizer.mode, quantizer.rerank_factor)
+                quantizer.update(embeddings)
+            lexical_index = None
+            if self.lexical_index:
+                lexical_index = BM25Index()
+                lexical_index.update(target.map_texts(len(keep)))
+
+            with self._lock:
+                if generation != self._generation:
+                    target.remove()
+                    return 0
+                self.storage.copy_to(
+                    target, np.arange(count, self.data.count), self.data.count
+                )
+                self.storage.replace_with(target)
+                self._generation += 1
+                self.eviction.compact(keep, count)
+                self.data = self._create_content(self.eviction.size)
+                self.index, self.quantizer = index, quantizer
+                self.lexical_index = lexical_index
+        except BaseException:
+            target.remove()
+            raise
+
+        evicted = count - len(keep)
+        logger.debug(f"Evicted {evicted} memories from the local memory")
+        return evicted
+
+    def _maybe_compact(self) -> None:
+        if not self.eviction or not self.eviction.needs_eviction(time.time()):
+            return
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(
+            target=self._compact_in_background,
+            name="local-memory-compaction",
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Failed to compact the local memory: {e}")
 
-        scores = np.dot(self.data.embeddings, embedding)
+    @property
+    def generation(self) -> int:
+        return self._generation
 
-        top_k_indices = np.argsort(scores)[-k:][::-1]
+    def stored_texts(self) -> Sequence[str]:
+        return self.data.texts
 
-        return [self.data.texts[i] for i in top_k_indices]
+    def cached_stats(self, max_age: float = 0) -> tuple[int, tuple[int, ...]]:
+        # The stats of the local cache are always cheap
+        return self.get_stats()
 
     def get_stats(self) -> tuple[int, tuple[int, ...]]:
         """
@@ -0,0 +1,137 @@
+"""Eviction of old and unused memories from the local memory provider."""
+from __future__ import annotations
+
+import numpy as np
+
+INITIAL_CAPACITY = 64
+# Evicting down to a fraction of the limits keeps compactions infrequent
+LOW_WATERMARK = 0.9
+
+
+class EvictionPolicy:
+    """
+    Tracks the age, size and use of every memory and picks the ones to evict.
+
+    Memories older than `ttl` seconds are evicted first. If the memory then
+    still holds more than `max_entries` memories or `max_bytes` bytes of text and
+    embeddings, the least recently retrieved memories are evicted until it is
+    back under LOW_WATERMARK of the limits. A memory that was never retrieved
+    counts as used when it was added, and ties go to the one retrieved least.
+
+    Memories loaded from disk count as added when they were loaded.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl: float = 0):
+        """
+        Args:
+            max_entries: The maximum number of memories, 0 for no limit.
+            max_bytes: The maximum size of the memories, 0 for no limit.
+            ttl: The number of seconds after which a memory expires, 0 to keep
+                memories until they are evicted for space.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.reset()
+
+    def reset(self) -> None:
+        self.size = 0
+        self.total_bytes = 0
+        self.added_at = np.zeros(0, dtype=np.float64)
+        self.last_used = np.zeros(0, dtype=np.float64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.sizes = np.zeros(0, dtype=np.int64)
+
+    def update(self, sizes: np.ndarray, now: float) -> None:
+        """
+        Track newly added memories.
+
+        Args:
+            sizes: The size in bytes of each added memory.
+            now: The time the memories were added.
+        """
+        required = self.size + len(sizes)
+        if required > len(self.added_at):
+            capacity = max(len(self.added_at), INITIAL_CAPACITY)
+            while capacity < required:
+                capacity *= 2
+            for name in ("added_at", "last_used", "hits", "sizes"):
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[: self.size] = array[: self.size]
+                setattr(self, name, grown)
+        self.added_at[self.size : required] = now
+        self.last_used[self.size : required] = now
+        self.hits[self.size : required] = 0
+        self.sizes[self.size : required] = sizes
+        self.total_bytes += int(np.sum(sizes))
+        self.size = required
+
+    def touch(self, indices, now: float) -> None:
+        """Record that the memories at indices were retrieved."""
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[indices < self.size]
+        self.last_used[indices] = now
+        self.hits[indices] += 1
+
+    def needs_eviction(self, now: float) -> bool:
+        """Check if any memory is expired or the memory is over its limits."""
+        if self.size == 0:
+            return False
+        return (
+            bool(self.max_entries and self.size > self.max_entries)
+            or bool(self.max_bytes and self.total_bytes > self.max_bytes)
+            # Memories are tracked in the order they were added
+            or bool(self.ttl and self.added_at[0] < now - self.ttl)
+        )
+
+    def select(self, now: float) -> np.ndarray:
+        """
+        Pick the memories to keep.
+
+        Args:
+            now: The current time.
+
+        Returns:
+            The sorted indices of the memories to keep.
+        """
+        keep = np.ones(self.size, dtype=bool)
+        if self.ttl:
+            keep &= self.added_at[: self.size] >= now - self.ttl
+
+        candidates = np.flatnonzero(keep)
+        sizes = self.sizes[candidates]
+        entries_over = self.max_entries and len(candidates) > self.max_entries
+        bytes_over = self.max_bytes and sizes.sum() > self.max_bytes
+        if not (entries_over or bytes_over):
+            return candidates
+
+        order = np.lexsort((self.hits[candidates], self.last_used[candidates]))
+        evicted = 0
+        if self.max_entries:
+            target = int(self.max_entries * LOW_WATERMARK)
+            evicted = max(evicted, len(candidates) - target)
+        if self.max_bytes:
+            excess = sizes.sum() - int(self.max_bytes * LOW_WATERMARK)
+            if excess > 0:
+                freed = np.cumsum(sizes[order])
+                evicted = max(evicted, int(np.searchsorted(freed, excess)) + 1)
+        keep[candidates[order[:evicted]]] = False
+        return np.flatnonzero(keep)
+
+    def compact(self, keep: np.ndarray, count: int) -> None:
+        """
+        Drop the evicted memories, keeping the same order as the compacted storage.
+
+        Args:
+            keep: The sorted indices of the kept memories, out of the first count.
+            count: The number of memories when the kept memories were selected,
+                memories added since are kept too.
+        """
+        rows = np.concatenate([keep, np.arange(count, self.size)]).astype(np.int64)
+        self.added_at = self.added_at[rows]
+        self.last_used = self.last_used[rows]
+        self.hits = self.hits[rows]
+        self.sizes = self.sizes[rows]
+        self.size = len(rows)
+        self.total_bytes = int(self.sizes.sum())
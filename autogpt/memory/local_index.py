@@ -0,0 +1,222 @@
+"""Nearest neighbour search over the embeddings of the local memory provider."""
+from __future__ import annotations
+
+import math
+from typing import List
+
+import numpy as np
+
+# The index is trained once the memory holds this many embeddings, smaller
+# memories are searched exhaustively
+IVF_MIN_TRAIN_SIZE = 4096
+# The index is retrained when the memory has grown this many times its size at
+# the last training
+IVF_RETRAIN_GROWTH = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLES_PER_LIST = 32
+ASSIGN_BATCH_SIZE = 16384
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get the indices of the k highest scores, highest first.
+
+    Uses argpartition so only the k winners are sorted.
+
+    Args:
+        scores: The scores, with shape (n,).
+        k: The number of indices to return.
+
+    Returns:
+        The indices of the top k scores.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+def exact_search(embeddings: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Score every embedding against the query and get the top k indices."""
+    return top_k_indices(np.dot(embeddings, query), k)
+
+
+def exact_search_many(
+    embeddings: np.ndarray, queries: np.ndarray, k: int
+) -> List[np.ndarray]:
+    """
+    Score every embedding against several queries with one matrix product.
+
+    Args:
+        embeddings: The embeddings to search, with shape (n, dim).
+        queries: The query embeddings, with shape (q, dim).
+        k: The number of indices to return per query.
+
+    Returns:
+        The top k indices for each query.
+    """
+    scores = np.dot(embeddings, queries.T)
+    return [top_k_indices(scores[:, i], k) for i in range(len(queries))]
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+        batch = np.asarray(vectors[start : start + ASSIGN_BATCH_SIZE])
+        assignments[start : start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return assignments
+
+
+def train_kmeans(
+    vectors: np.ndarray, nlist: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Cluster vectors with spherical k-means, which matches dot product search.
+
+    Args:
+        vectors: The vectors to cluster, with shape (n, dim).
+        nlist: The number of clusters.
+        rng: The random generator used to pick the initial centroids.
+
+    Returns:
+        The normalised centroids, with shape (nlist, dim).
+    """
+    centroids = np.array(vectors[rng.choice(len(vectors), nlist, replace=False)])
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = _assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        clusters, starts = np.unique(assignments[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[clusters] = np.add.reduceat(vectors[order], starts, axis=0)
+        empty = np.bincount(assignments, minlength=nlist) == 0
+        # Restart empty clusters from random vectors
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    An inverted file index for approximate nearest neighbour search.
+
+    The embeddings are clustered with k-means, and every embedding is added to
+    the list of its nearest centroid. A search only scores the embeddings in
+    the lists of the `nprobe` centroids nearest to the query.
+
+    The index is trained on first use once the memory is large enough, and
+    embeddings added afterwards are assigned to their list on add. Memories
+    below IVF_MIN_TRAIN_SIZE are searched exhaustively.
+    """
+
+    def __init__(
+        self, nprobe: int = 8, min_train_size: int = IVF_MIN_TRAIN_SIZE, seed: int = 0
+    ) -> None:
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.centroids = None
+        self.size = 0
+        self.trained_size = 0
+        self._lists: List[List[np.ndarray]] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def update(self, embeddings: np.ndarray) -> None:
+        """
+        Add the embeddings that are not indexed yet to their lists.
+
+        Args:
+            embeddings: All embeddings of the memory, with shape (n, dim).
+        """
+        if not self.is_trained or self.size >= len(embeddings):
+            return
+        if len(embeddings) >= self.trained_size * IVF_RETRAIN_GROWTH:
+            self.train(embeddings)
+            return
+        new_ids = np.arange(self.size, len(embeddings))
+        assignments = _assign(embeddings[self.size :], self.centroids)
+        order = np.argsort(assignments, kind="stable")
+        lists, starts = np.unique(assignments[order], return_index=True)
+        for list_id, ids in zip(lists, np.split(new_ids[order], starts[1:])):
+            self._lists[list_id].append(ids)
+        self.size = len(embeddings)
+
+    def train(self, embeddings: np.ndarray) -> None:
+        """
+        Cluster the embeddings and rebuild the lists.
+
+        Args:
+            embeddings: All embeddings of the memory, with shape (n, dim).
+        """
+        count = len(embeddings)
+        nlist = min(count, max(1, int(2 * math.sqrt(count))))
+        samples = min(count, nlist * KMEANS_SAMPLES_PER_LIST)
+        sample = np.asarray(embeddings[np.sort(self.rng.choice(count, samples, False))])
+        self.centroids = train_kmeans(sample, nlist, self.rng)
+        self.trained_size = count
+        self._lists = [[] for _ in range(nlist)]
+        self.size = 0
+        self.update(embeddings)
+
+    def reindexed(self, embeddings: np.ndarray) -> IVFIndex:
+        """
+        Get a new index of other embeddings that reuses the trained centroids.
+
+        Args:
+            embeddings: All embeddings of the memory, with shape (n, dim).
+        """
+        index = IVFIndex(self.nprobe, self.min_train_size)
+        index.rng = self.rng
+        if self.is_trained:
+            index.centroids = self.centroids
+            index.trained_size = self.trained_size
+            index._lists = [[] for _ in range(len(self.centroids))]
+            index.update(embeddings)
+        return index
+
+    def search(self, embeddings: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+        """
+        Get the indices of the k embeddings with the highest dot product with query.
+
+        Args:
+            embeddings: All embeddings of the memory, with shape (n, dim).
+            query: The query embedding, with shape (dim,).
+            k: The number of indices to return.
+
+        Returns:
+            The indices of the nearest embeddings, nearest first.
+        """
+        if len(embeddings) < self.min_train_size:
+            return exact_search(embeddings, query, k)
+        if not self.is_trained:
+            self.train(embeddings)
+        else:
+            self.update(embeddings)
+
+        probes = top_k_indices(self.centroids @ query, self.nprobe)
+        # Sorted candidates read a memory-mapped matrix front to back
+        candidates = np.sort(
+            np.concatenate([self._consolidate(list_id) for list_id in probes])
+        )
+        if len(candidates) < k:
+            return exact_search(embeddings, query, k)
+        scores = np.dot(embeddings[candidates], query)
+        return candidates[top_k_indices(scores, k)]
+
+    def _consolidate(self, list_id: int) -> np.ndarray:
+        chunks = self._lists[list_id]
+        if len(chunks) != 1:
+            self._lists[list_id] = chunks = [
+                np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+            ]
+        return chunks[0]
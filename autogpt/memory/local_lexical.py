@@ -0,0 +1,152 @@
+"""BM25 keyword search over the texts of the local memory provider."""
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from autogpt.memory.local_index import top_k_indices
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Rank constant of reciprocal rank fusion, damps the weight of the top ranks
+RRF_K = 60
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-/&][a-z0-9]+)*")
+_KEYWORD_PATTERNS = [
+    # Tickers: AAPL, $MSFT, BRK.B
+    re.compile(r"^\$?[A-Z]{1,5}(?:\.[A-Z])?$"),
+    # Form types: 10-K, 10Q, 13F, 8-K, S-1, DEF 14A
+    re.compile(r"^(?:\d{1,3}-?[A-Z]{1,2}(?:/A)?|[A-Z]{1,3}-\d{1,2}|\d{2}[A-Z])$"),
+    # CUSIPs and other identifiers mixing letters and digits
+    re.compile(r"^(?=[0-9A-Z]*\d)[0-9A-Z]{6,12}$"),
+]
+MAX_KEYWORD_QUERY_TERMS = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms, keeping tickers, form types and numbers.
+
+    Terms joined by punctuation, like "10-k" or "brk.b", are also indexed without
+    it, so "10-K" matches "10K".
+    """
+    terms = []
+    for term in _TOKEN_PATTERN.findall(text.lower()):
+        terms.append(term)
+        joined = re.sub(r"[.\-/&]", "", term)
+        if joined != term:
+            terms.append(joined)
+    return terms
+
+
+def is_keyword_query(text: str) -> bool:
+    """
+    Check if a query is a short ticker or keyword search, such as "AAPL 10-K".
+
+    Such queries are matched well by keyword search alone, without embedding them.
+    """
+    terms = text.split()
+    return 0 < len(terms) <= MAX_KEYWORD_QUERY_TERMS and all(
+        any(pattern.match(term.strip(",;:?!")) for pattern in _KEYWORD_PATTERNS)
+        for term in terms
+    )
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[np.ndarray], weights: Sequence[float], k: int
+) -> List[int]:
+    """
+    Fuse several rankings of ids into one.
+
+    Each id scores weight / (RRF_K + rank) in every ranking it appears in, which
+    needs no normalisation of the scores the rankings were made from.
+
+    Args:
+        rankings: The ranked ids, best first.
+        weights: The weight of each ranking.
+        k: The number of ids to return.
+
+    Returns:
+        The k ids with the highest fused score.
+    """
+    scores: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking):
+            doc_id = int(doc_id)
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (RRF_K + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)[:k]
+
+
+class BM25Index:
+    """
+    An inverted index of the memory texts, scored with BM25.
+
+    Texts get consecutive ids as they are added, so every posting list stays
+    sorted. Texts that are not indexed yet are indexed on the next update, so a
+    memory loaded from disk is only indexed on its first keyword search.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.size = 0
+        self.total_length = 0
+        self._doc_lengths = array("i")
+        self._postings: Dict[str, array] = {}
+        self._frequencies: Dict[str, array] = {}
+
+    def update(self, texts: Sequence[str]) -> None:
+        """
+        Index the texts that are not indexed yet.
+
+        Args:
+            texts: All texts of the memory.
+        """
+        for doc_id in range(self.size, len(texts)):
+            terms = tokenize(texts[doc_id])
+            counts: Dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                if term not in self._postings:
+                    self._postings[term] = array("i")
+                    self._frequencies[term] = array("i")
+                self._postings[term].append(doc_id)
+                self._frequencies[term].append(count)
+            self._doc_lengths.append(len(terms))
+            self.total_length += len(terms)
+        self.size = len(texts)
+
+    def search(self, query: str, k: int) -> np.ndarray:
+        """
+        Get the ids of the k texts that best match the query terms.
+
+        Args:
+            query: The query.
+            k: The maximum number of ids to return.
+
+        Returns:
+            The ids of the matching texts, best first. Texts that match no query
+            term are never returned.
+        """
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.int32)
+        average_length = max(self.total_length / self.size, 1)
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term not in self._postings:
+                continue
+            ids = np.frombuffer(self._postings[term], dtype=np.int32)
+            frequencies = np.frombuffer(self._frequencies[term], dtype=np.int32)
+            idf = math.log(1 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[ids] / average_length)
+            scores[ids] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norm)
+
+        matches = np.flatnonzero(scores)
+        return matches[top_k_indices(scores[matches], k)]
@@ -0,0 +1,130 @@
+"""Compact in-memory codes for the embeddings of the local memory provider."""
+from __future__ import annotations
+
+import numpy as np
+
+from autogpt.memory.local_index import top_k_indices
+
+QUANTIZATION_DTYPES = {"float16": np.float16, "int8": np.int8}
+INITIAL_CAPACITY = 64
+ENCODE_BATCH_SIZE = 65536
+# Small enough for the upcast batch to stay in the CPU cache
+SCORE_BATCH_SIZE = 1024
+
+
+class ScalarQuantizer:
+    """
+    Keeps a compact copy of the embeddings to score queries against.
+
+    float16 halves the memory used per embedding and int8 (with a scale per
+    embedding) quarters it. int8 codes are also faster to score, as NumPy
+    converts float16 slowly. A search scores all codes, then re-ranks the best
+    `rerank_factor * k` candidates against the full precision embeddings, which
+    can stay on disk.
+
+    Codes are computed lazily for embeddings that are not encoded yet, so a
+    memory loaded from disk is only encoded on its first search.
+    """
+
+    def __init__(self, mode: str, rerank_factor: int = 10) -> None:
+        """
+        Args:
+            mode: The type of the codes, "float16" or "int8".
+            rerank_factor: How many candidates per result are re-ranked against
+                the full precision embeddings.
+        """
+        if mode not in QUANTIZATION_DTYPES:
+            raise ValueError(
+                f"Unknown quantization {mode}, expected one of"
+                f" {', '.join(QUANTIZATION_DTYPES)}"
+            )
+        self.mode = mode
+        self.dtype = QUANTIZATION_DTYPES[mode]
+        self.rerank_factor = rerank_factor
+        self.reset()
+
+    def reset(self) -> None:
+        self.codes = np.zeros((0, 0), dtype=self.dtype)
+        self.scales = np.zeros(0, dtype=np.float32)
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the codes of the encoded embeddings."""
+        return self.size * (self.codes.shape[1] * self.codes.itemsize + 4)
+
+    def update(self, embeddings: np.ndarray) -> None:
+        """
+        Encode the embeddings that are not encoded yet.
+
+        Args:
+            embeddings: All embeddings of the memory, with shape (n, dim).
+        """
+        count = len(embeddings)
+        if self.size >= count:
+            return
+        if count > len(self.codes):
+            capacity = max(len(self.codes), INITIAL_CAPACITY)
+            while capacity < count:
+                capacity *= 2
+            codes = np.empty((capacity, embeddings.shape[1]), dtype=self.dtype)
+            scales = np.empty(capacity, dtype=np.float32)
+            if self.size:
+                codes[: self.size] = self.codes[: self.size]
+                scales[: self.size] = self.scales[: self.size]
+            self.codes, self.scales = codes, scales
+
+        for start in range(self.size, count, ENCODE_BATCH_SIZE):
+            end = min(start + ENCODE_BATCH_SIZE, count)
+            self.codes[start:end], self.scales[start:end] = self.encode(
+                np.asarray(embeddings[start:end])
+            )
+        self.size = count
+
+    def encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode vectors as codes and the scale to multiply their scores by.
+
+        Args:
+            vectors: The vectors to encode, with shape (n, dim).
+
+        Returns:
+            The codes, with shape (n, dim), and the scales, with shape (n,).
+        """
+        if self.dtype is np.float16:
+            return vectors.astype(np.float16), np.ones(len(vectors), np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        codes = np.rint(vectors / scales[:, np.newaxis]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Get the approximate dot product of every encoded embedding with query."""
+        scores = np.empty(self.size, dtype=np.float32)
+        batch = np.empty((SCORE_BATCH_SIZE, self.codes.shape[1]), dtype=np.float32)
+        for start in range(0, self.size, SCORE_BATCH_SIZE):
+            end = min(start + SCORE_BATCH_SIZE, self.size)
+            codes = batch[: end - start]
+            codes[...] = self.codes[start:end]
+            scores[start:end] = codes @ query
+        return scores * self.scales[: self.size]
+
+    def search(self, embeddings: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+        """
+        Get the indices of the k embeddings with the highest dot product with query.
+
+        Args:
+            embeddings: All full precision embeddings of the memory, with shape
+                (n, dim). Only the re-ranked candidates are read.
+            query: The query embedding, with shape (dim,).
+            k: The number of indices to return.
+
+        Returns:
+            The indices of the nearest embeddings, nearest first.
+        """
+        self.update(embeddings)
+        candidates = top_k_indices(self.scores(query), k * self.rerank_factor)
+        # Sorted candidates read a memory-mapped matrix front to back
+        candidates = np.sort(candidates)
+        scores = np.dot(embeddings[candidates], query)
+        return candidates[top_k_indices(scores, k)]
@@ -0,0 +1,339 @@
+"""Append-only on-disk storage for the local memory provider."""
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+import orjson
+
+from autogpt.logs import logger
+
+STORAGE_FORMAT = "autogpt-local-memory-v2"
+VECTOR_DTYPE = np.float32
+OFFSET_DTYPE = np.dtype("<u8")
+# Number of memories copied per write when compacting
+COPY_BATCH_SIZE = 4096
+
+
+class LazyTexts(Sequence):
+    """
+    The texts of a memory index, read from the text log on access.
+
+    Texts stored before the index was loaded are decoded from a memory map of the
+    text log when they are accessed, texts added afterwards are kept in a list.
+    """
+
+    def __init__(self, texts: np.memmap, offsets: np.ndarray) -> None:
+        self._texts = texts
+        self._offsets = offsets
+        self._added: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._added)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("text index out of range")
+        loaded = len(self._offsets)
+        if index >= loaded:
+            return self._added[index - loaded]
+        start = int(self._offsets[index - 1]) if index > 0 else 0
+        end = int(self._offsets[index])
+        return bytes(self._texts[start:end]).decode("utf-8")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, LazyTexts)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"LazyTexts({len(self)} texts)"
+
+    def append(self, text: str) -> None:
+        self._added.append(text)
+
+    def extend(self, texts: Iterable[str]) -> None:
+        self._added.extend(texts)
+
+
+class LocalStorage:
+    """
+    Stores texts and their embeddings in append-only files.
+
+    The layout of a memory index named `<index>` in the workspace is:
+
+    - `<index>.json`: a small header with the format version and vector dimension
+    - `<index>.vectors`: the embeddings as raw float32 rows
+    - `<index>.texts`: the UTF-8 encoded texts, one record after the other
+    - `<index>.offsets`: the end offset of each text record as a uint64
+
+    Adding a memory appends one record to each file, so the cost of an add does
+    not depend on the number of memories already stored.
+    """
+
+    def __init__(
+        self, directory: Path, index_name: str, dim: int, fsync_every: int = 0
+    ) -> None:
+        """
+        Args:
+            directory: The directory to store the files in.
+            index_name: The name of the memory index, used as the file name stem.
+            dim: The dimension of the embeddings.
+            fsync_every: Flush the files to disk every this many appends. 0 leaves
+                it to the operating system.
+        """
+        self.directory = directory
+        self.index_name = index_name
+        self.dim = dim
+        self.fsync_every = fsync_every
+        self.header_file = directory / f"{index_name}.json"
+        self.vectors_file = directory / f"{index_name}.vectors"
+        self.texts_file = directory / f"{index_name}.texts"
+        self.offsets_file = directory / f"{index_name}.offsets"
+        self._handles = None
+        self._appends_since_sync = 0
+
+    @property
+    def row_bytes(self) -> int:
+        return self.dim * np.dtype(VECTOR_DTYPE).itemsize
+
+    def reset(self) -> None:
+        """
+        Remove all stored memories and write a fresh header.
+
+        The files are replaced with new ones rather than truncated, so memory
+        maps of the previous files, such as those of a running compaction, stay
+        valid.
+        """
+        self.close()
+        header = {"format": STORAGE_FORMAT, "dim": self.dim, "dtype": "float32"}
+        _write_replacing(self.header_file, orjson.dumps(header))
+        for file in (self.vectors_file, self.texts_file, self.offsets_file):
+            _write_replacing(file, b"")
+
+    def load(self) -> int:
+        """
+        Validate the stored memory index and get the number of stored memories.
+
+        Records left incomplete by an interrupted append are truncated. An index
+        in the legacy JSON format is migrated, anything else unreadable is reset.
+
+        Returns:
+            The number of stored memories.
+        """
+        self.close()
+        try:
+            header = orjson.loads(self.header_file.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            header = {}
+
+        if header.get("format") != STORAGE_FORMAT or header.get("dim") != self.dim:
+            self._migrate(header)
+
+        for file in (self.vectors_file, self.texts_file, self.offsets_file):
+            file.touch(exist_ok=True)
+        count = min(
+            self.vectors_file.stat().st_size // self.row_bytes,
+            self.offsets_file.stat().st_size // OFFSET_DTYPE.itemsize,
+        )
+        self._truncate(count)
+        return count
+
+    def map_vectors(self, count: int) -> np.ndarray:
+        """
+        Memory-map the first count stored embeddings without reading them.
+
+        Args:
+            count: The number of stored memories.
+
+        Returns:
+            A read-only array of shape (count, dim).
+        """
+        if count == 0:
+            return np.zeros((0, self.dim), dtype=VECTOR_DTYPE)
+        return np.memmap(
+            self.vectors_file, dtype=VECTOR_DTYPE, mode="r", shape=(count, self.dim)
+        )
+
+    def map_texts(self, count: int) -> LazyTexts:
+        """
+        Memory-map the first count stored texts without reading them.
+
+        Args:
+            count: The number of stored memories.
+
+        Returns:
+            The texts, decoded on access.
+        """
+        if count == 0:
+            return LazyTexts(np.zeros(0, dtype=np.uint8), np.zeros(0, OFFSET_DTYPE))
+        offsets = np.memmap(
+            self.offsets_file, dtype=OFFSET_DTYPE, mode="r", shape=(count,)
+        )
+        texts = (
+            np.memmap(self.texts_file, dtype=np.uint8, mode="r")
+            if self.texts_file.stat().st_size
+            else np.zeros(0, dtype=np.uint8)
+        )
+        return LazyTexts(texts, offsets)
+
+    def record_sizes(self, count: int) -> np.ndarray:
+        """
+        Get the number of bytes each of the first count stored memories uses.
+
+        Args:
+            count: The number of stored memories.
+
+        Returns:
+            The size of the text and embedding of each memory.
+        """
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.fromfile(self.offsets_file, dtype=OFFSET_DTYPE, count=count)
+        return np.diff(offsets.astype(np.int64), prepend=0) + self.row_bytes
+
+    def compaction_target(self) -> LocalStorage:
+        """Get an empty storage next to this one to copy the kept memories to."""
+        target = LocalStorage(
+            self.directory, f"{self.index_name}.compact", self.dim, self.fsync_every
+        )
+        target.reset()
+        return target
+
+    def copy_to(self, target: LocalStorage, rows: np.ndarray, count: int) -> None:
+        """
+        Append some of the stored memories to another storage.
+
+        Args:
+            target: The storage to append to.
+            rows: The indices of the memories to copy, in the order to copy them.
+            count: The number of stored memories.
+        """
+        vectors = self.map_vectors(count)
+        texts = self.map_texts(count)
+        for start in range(0, len(rows), COPY_BATCH_SIZE):
+            batch = rows[start : start + COPY_BATCH_SIZE]
+            target.append_many([texts[i] for i in batch], vectors[batch])
+
+    def replace_with(self, source: LocalStorage) -> None:
+        """
+        Replace the stored memories with those of another storage, moving its files.
+
+        Memory maps of the previous files stay valid, as the files are replaced
+        by renaming.
+        """
+        self.close()
+        source.close()
+        for target_file, source_file in (
+            (self.vectors_file, source.vectors_file),
+            (self.texts_file, source.texts_file),
+            (self.offsets_file, source.offsets_file),
+        ):
+            os.replace(source_file, target_file)
+        source.header_file.unlink()
+
+    def remove(self) -> None:
+        """Delete the files of the storage."""
+        self.close()
+        for file in (
+            self.header_file,
+            self.vectors_file,
+            self.texts_file,
+            self.offsets_file,
+        ):
+            file.unlink(missing_ok=True)
+
+    def append(self, text: str, vector: np.ndarray) -> None:
+        """
+        Append a single memory.
+
+        Args:
+            text: The text of the memory.
+            vector: The embedding of the text, with shape (dim,).
+        """
+        self.append_many([text], vector[np.newaxis, :])
+
+    def append_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        """
+        Append a block of memories with one write per file.
+
+        Args:
+            texts: The texts of the memories.
+            vectors: The embeddings of the texts, with shape (len(texts), dim).
+        """
+        vectors_handle, texts_handle, offsets_handle = self._open()
+        encoded = [text.encode("utf-8") for text in texts]
+        start = texts_handle.tell()
+        offsets = start + np.cumsum([len(record) for record in encoded])
+
+        texts_handle.write(b"".join(encoded))
+        offsets_handle.write(offsets.astype(OFFSET_DTYPE).tobytes())
+        vectors_handle.write(np.ascontiguousarray(vectors, dtype=VECTOR_DTYPE))
+
+        self._appends_since_sync += len(texts)
+        for handle in (texts_handle, offsets_handle, vectors_handle):
+            handle.flush()
+        if self.fsync_every and self._appends_since_sync >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force all appended records to disk."""
+        if self._handles is None:
+            return
+        for handle in self._handles:
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._appends_since_sync = 0
+
+    def close(self) -> None:
+        if self._handles is None:
+            return
+        for handle in self._handles:
+            handle.close()
+        self._handles = None
+
+    def _truncate(self, count: int) -> None:
+        offsets = np.fromfile(self.offsets_file, dtype=OFFSET_DTYPE, count=count)
+        texts_size = int(offsets[-1]) if count else 0
+        sizes = {
+            self.vectors_file: count * self.row_bytes,
+            self.offsets_file: count * OFFSET_DTYPE.itemsize,
+            self.texts_file: texts_size,
+        }
+        for file, size in sizes.items():
+            if file.stat().st_size > size:
+                logger.warn(f"Truncating incomplete records in {file}")
+                os.truncate(file, size)
+
+    def _migrate(self, header: dict) -> None:
+        self.reset()
+        if not header.get("texts") or "embeddings" not in header:
+            return
+        vectors = np.array(header["embeddings"], dtype=VECTOR_DTYPE)
+        if vectors.shape != (len(header["texts"]), self.dim):
+            logger.warn(f"Discarding unreadable memory index {self.header_file}")
+            return
+        self.append_many(header["texts"], vectors)
+        self.close()
+
+    def _open(self):
+        if self._handles is None:
+            self._handles = (
+                self.vectors_file.open("ab"),
+                self.texts_file.open("ab"),
+                self.offsets_file.open("ab"),
+            )
+        return self._handles
+
+
+def _write_replacing(file: Path, data: bytes) -> None:
+    temporary = file.with_name(f"{file.name}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, file)
@@ -4,7 +4,7 @@ import re
 from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, connections
 
 from autogpt.config import Config
-from autogpt.llm import get_ada_embedding
+from autogpt.llm import get_ada_embedding, get_ada_embeddings
 from autogpt.memory.base import MemoryProviderSingleton
 
 
@@ -107,6 +107,24 @@ class MilvusMemory(MemoryProviderSingleton):
         )
         return _text
 
+    def add_many(self, data: list, embeddings: list = None) -> list:
+        """Add the embeddings of several texts into memory in one insert.
+
+        Args:
+            data (list): The raw texts to construct embedding indexes.
+            embeddings (list, optional): The embeddings of the texts, computed
+                if not given.
+
+        Returns:
+            list: The texts that were added.
+        """
+        if not data:
+            return []
+        if embeddings is None:
+            embeddings = get_ada_embeddings(data)
+        self.collection.insert([list(embeddings), list(data)])
+        return list(data)
+
     def get(self, data):
         """Return the most relevant data in memory.
         Args:
@@ -155,6 +173,47 @@ class MilvusMemory(MemoryProviderSingleton):
         )
         return [item.entity.value_of_field("raw_text") for item in result[0]]
 
+    def search_many(self, embeddings: list, num_relevant: int = 5) -> list:
+        """Return the top-k relevant data in memory for each embedding.
+        Args:
+            embeddings (list): The query embeddings, searched in one request.
+            num_relevant (int, optional): The max number of relevant data per
+                embedding. Defaults to 5.
+
+        Returns:
+            list: The top-k relevant data for each embedding.
+        """
+        search_params = {
+            "metrics_type": "IP",
+            "params": {"nprobe": 8},
+        }
+        result = self.collection.search(
+            embeddings,
+            "embeddings",
+            search_params,
+            num_relevant,
+            output_fields=["raw_text"],
+        )
+        return [
+            [item.entity.value_of_field("raw_text") for item in hits] for hits in result
+        ]
+
+    def nearest_similarities(self, embeddings: list) -> list:
+        """Return the similarity of each embedding to its nearest memory.
+        Args:
+            embeddings (list): The embeddings to score, searched in one request.
+
+        Returns:
+            list: The inner product with the nearest memory, which is the
+                cosine similarity for the normalized ada embeddings.
+        """
+        search_params = {
+            "metrics_type": "IP",
+            "params": {"nprobe": 8},
+        }
+        result = self.collection.search(embeddings, "embeddings", search_params, 1)
+        return [float(hits[0].distance) if len(hits) else 0.0 for hits in result]
+
     def get_stats(self) -> str:
         """
         Returns: The stats of the milvus cache.
@@ -1,10 +1,13 @@
 import pinecone
 from colorama import Fore, Style
 
-from autogpt.llm import get_ada_embedding
+from autogpt.llm import get_ada_embedding, get_ada_embeddings
 from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
 
+# The number of vectors sent per upsert request
+UPSERT_BATCH_SIZE = 100
+
 
 class PineconeMemory(MemoryProviderSingleton):
     def __init__(self, cfg):
@@ -54,6 +57,17 @@ class PineconeMemory(MemoryProviderSingleton):
         self.vec_num += 1
         return _text
 
+    def add_many(self, data, embeddings=None):
+        if embeddings is None:
+            embeddings = get_ada_embeddings(data)
+        vectors = []
+        for text, embedding in zip(data, embeddings):
+            vectors.append((str(self.vec_num), embedding, {"raw_text": text}))
+            self.vec_num += 1
+        for start in range(0, len(vectors), UPSERT_BATCH_SIZE):
+            self.index.upsert(vectors[start : start + UPSERT_BATCH_SIZE])
+        return list(data)
+
     def get(self, data):
         return self.get_relevant(data, 1)
 
@@ -74,5 +88,34 @@ class PineconeMemory(MemoryProviderSingleton):
         sorted_results = sorted(results.matches, key=lambda x: x.score)
         return [str(item["metadata"]["raw_text"]) for item in sorted_results]
 
+    def search_many(self, embeddings, num_relevant=5):
+        """
+        Returns the data in the memory that is relevant to each embedding, using
+        a single multi-vector query.
+        :param embeddings: The query embeddings.
+        :param num_relevant: The number of relevant data to return per embedding.
+        """
+        results = self.index.query(
+            queries=embeddings, top_k=num_relevant, include_metadata=True
+        )
+        return [
+            [
+                str(item["metadata"]["raw_text"])
+                for item in sorted(result.matches, key=lambda x: x.score)
+            ]
+            for result in results.results
+        ]
+
+    def nearest_similarities(self, embeddings):
+        """
+        Returns the cosine similarity of each embedding to its nearest memory.
+        :param embeddings: The embeddings to score.
+        """
+        results = self.index.query(queries=embeddings, top_k=1)
+        return [
+            float(result.matches[0].score) if result.matches else 0.0
+            for result in results.results
+        ]
+
     def get_stats(self):
         return self.index.describe_index_stats()
@@ -1,6 +1,8 @@
 """Redis memory provider."""
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
@@ -10,7 +12,7 @@ from redis.commands.search.field import TextField, VectorField
 from redis.commands.search.indexDefinition import IndexDefinition, IndexType
 from redis.commands.search.query import Query
 
-from autogpt.llm import get_ada_embedding
+from autogpt.llm import get_ada_embedding, get_ada_embeddings
 from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
 
@@ -22,6 +24,23 @@ SCHEMA = [
         {"TYPE": "FLOAT32", "DIM": 1536, "DISTANCE_METRIC": "COSINE"},
     ),
 ]
+# The number of HSETs sent per pipeline when writing in bulk
+BULK_PIPELINE_SIZE = 2000
+
+
+@dataclass
+class IngestStats:
+    """The outcome of a bulk write, times are in seconds."""
+
+    count: int = 0
+    embedding_time: float = 0.0
+    write_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """The number of memories written per second, embedding included."""
+        elapsed = self.embedding_time + self.write_time
+        return self.count / elapsed if elapsed else 0.0
 
 
 class RedisMemory(MemoryProviderSingleton):
@@ -74,7 +93,10 @@ class RedisMemory(MemoryProviderSingleton):
             )
         except Exception as e:
             logger.warn("Error creating Redis search index: ", e)
-        existing_vec_num = self.redis.get(f"{cfg.memory_index}-vec_num")
+        # The number of vectors ever added is kept in redis, which hands out the
+        # keys of new vectors, so several processes can share an index
+        self.vec_num_key = f"{cfg.memory_index}-vec_num"
+        existing_vec_num = self.redis.get(self.vec_num_key)
         self.vec_num = int(existing_vec_num.decode("utf-8")) if existing_vec_num else 0
 
     def add(self, data: str) -> str:
@@ -91,15 +113,88 @@ class RedisMemory(MemoryProviderSingleton):
         vector = get_ada_embedding(data)
         vector = np.array(vector).astype(np.float32).tobytes()
         data_dict = {b"data": data, "embedding": vector}
-        pipe = self.redis.pipeline()
-        pipe.hset(f"{self.cfg.memory_index}:{self.vec_num}", mapping=data_dict)
-        _text = (
-            f"Inserting data into memory at index: {self.vec_num}:\n" f"data: {data}"
-        )
-        self.vec_num += 1
-        pipe.set(f"{self.cfg.memory_index}-vec_num", self.vec_num)
-        pipe.execute()
-        return _text
+        self.vec_num = self.redis.incr(self.vec_num_key)
+        vec_id = self.vec_num - 1
+        self.redis.hset(f"{self.cfg.memory_index}:{vec_id}", mapping=data_dict)
+        return f"Inserting data into memory at index: {vec_id}:\ndata: {data}"
+
+    def add_many(
+        self, data: list[str], embeddings: list[list[float]] | None = None
+    ) -> list[str]:
+        """
+        Adds several data points to the memory in bulk, see ingest.
+
+        Args:
+            data: The data to add.
+            embeddings: The embeddings of the data, computed if not given.
+
+        Returns: The data that was added.
+        """
+        if embeddings is not None:
+            embeddings = [
+                embedding
+                for text, embedding in zip(data, embeddings)
+                if "Command Error:" not in text
+            ]
+        added = [text for text in data if "Command Error:" not in text]
+        self.ingest(added, embeddings)
+        return added
+
+    def ingest(
+        self,
+        data: list[str],
+        embeddings: np.ndarray | list[list[float]] | None = None,
+        pipeline_size: int = BULK_PIPELINE_SIZE,
+    ) -> IngestStats:
+        """
+        Writes many data points to the memory in bulk.
+
+        The keys of a block of pipeline_size data points are allocated with one
+        INCRBY, then all of their HSETs are sent in one pipeline, so a block
+        takes two round trips. Missing embeddings are requested per block.
+
+        Args:
+            data: The data to add.
+            embeddings: The embeddings of the data, as float32 rows or lists,
+                computed if not given.
+            pipeline_size: The number of data points written per pipeline.
+
+        Returns: The number of data points written and the time it took.
+        """
+        stats = IngestStats()
+        if embeddings is not None:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+        for start in range(0, len(data), pipeline_size):
+            texts = data[start : start + pipeline_size]
+            if embeddings is None:
+                embedding_start = time.monotonic()
+                vectors = np.array(get_ada_embeddings(texts), dtype=np.float32)
+                stats.embedding_time += time.monotonic() - embedding_start
+            else:
+                vectors = embeddings[start : start + pipeline_size]
+
+            write_start = time.monotonic()
+            self.vec_num = self.redis.incrby(self.vec_num_key, len(texts))
+            first_id = self.vec_num - len(texts)
+            pipe = self.redis.pipeline(transaction=False)
+            for vec_id, text, vector in zip(
+                range(first_id, self.vec_num), texts, vectors
+            ):
+                pipe.hset(
+                    f"{self.cfg.memory_index}:{vec_id}",
+                    mapping={b"data": text, "embedding": vector.tobytes()},
+                )
+            pipe.execute()
+            stats.write_time += time.monotonic() - write_start
+            stats.count += len(texts)
+
+        if stats.count:
+            logger.debug(
+                f"Wrote {stats.count} memories to Redis in"
+                f" {stats.embedding_time + stats.write_time:.2f}s"
+                f" ({stats.throughput:.0f}/s, {stats.write_time:.2f}s writing)"
+            )
+        return stats
 
     def get(self, data: str) -> list[Any] | None:
         """
@@ -149,6 +244,91 @@ class RedisMemory(MemoryProviderSingleton):
             return None
         return [result.data for result in results.docs]
 
+    def search_many(
+        self, embeddings: list[list[float]], num_relevant: int = 5
+    ) -> list[list[Any] | None]:
+        """
+        Returns the data in the memory that is relevant to each embedding.
+        All KNN queries are sent in one pipelined round trip.
+        Args:
+            embeddings: The query embeddings.
+            num_relevant: The number of relevant data to return per embedding.
+
+        Returns: A list of the most relevant data for each embedding.
+        """
+        base_query = f"*=>[KNN {num_relevant} @embedding $vector AS vector_score]"
+        query = (
+            Query(base_query)
+            .return_fields("data", "vector_score")
+            .sort_by("vector_score")
+            .dialect(2)
+        )
+        responses = self._search_pipelined(query, embeddings)
+        if responses is None:
+            return [None] * len(embeddings)
+        return [self._parse_search_response(response) for response in responses]
+
+    def nearest_similarities(self, embeddings: list[list[float]]) -> list[float]:
+        """
+        Returns the cosine similarity of each embedding to its nearest memory.
+        Args:
+            embeddings: The embeddings to score.
+
+        Returns: The similarities, 0.0 where no memory was found.
+        """
+        query = (
+            Query("*=>[KNN 1 @embedding $vector AS vector_score]")
+            .return_fields("vector_score")
+            .dialect(2)
+        )
+        responses = self._search_pipelined(query, embeddings)
+        if responses is None:
+            return [0.0] * len(embeddings)
+        similarities = []
+        for response in responses:
+            if len(response) < 3:
+                similarities.append(0.0)
+                continue
+            fields = response[2]
+            document = dict(zip(fields[::2], fields[1::2]))
+            score = document.get(b"vector_score", document.get("vector_score"))
+            # The COSINE metric scores by distance, 1 - similarity
+            similarities.append(1 - float(score))
+        return similarities
+
+    def _search_pipelined(
+        self, query: Query, embeddings: list[list[float]]
+    ) -> list[Any] | None:
+        # Sends a KNN query per embedding in one pipelined round trip
+        pipe = self.redis.pipeline(transaction=False)
+        for embedding in embeddings:
+            query_vector = np.array(embedding).astype(np.float32).tobytes()
+            pipe.execute_command(
+                "FT.SEARCH",
+                self.cfg.memory_index,
+                *query.get_args(),
+                "PARAMS",
+                2,
+                "vector",
+                query_vector,
+            )
+
+        try:
+            return pipe.execute()
+        except Exception as e:
+            logger.warn("Error calling Redis search: ", e)
+            return None
+
+    @staticmethod
+    def _parse_search_response(response) -> list[Any]:
+        # FT.SEARCH replies with the total, then the key and fields of each document
+        results = []
+        for fields in response[2::2]:
+            document = dict(zip(fields[::2], fields[1::2]))
+            data = document.get(b"data", document.get("data"))
+            results.append(data.decode("utf-8") if isinstance(data, bytes) else data)
+        return results
+
     def get_stats(self):
         """
         Returns: The stats of the memory index.
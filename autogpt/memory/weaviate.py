@@ -3,7 +3,7 @@ from weaviate import Client
 from weaviate.embedded import EmbeddedOptions
 from weaviate.util import generate_uuid5
 
-from autogpt.llm import get_ada_embedding
+from autogpt.llm import get_ada_embedding, get_ada_embeddings
 from autogpt.logs import logger
 from autogpt.memory.base import MemoryProviderSingleton
 
@@ -86,6 +86,21 @@ class WeaviateMemory(MemoryProviderSingleton):
 
         return f"Inserting data into memory at uuid: {doc_uuid}:\n data: {data}"
 
+    def add_many(self, data, embeddings=None):
+        if embeddings is None:
+            embeddings = get_ada_embeddings(data)
+
+        with self.client.batch as batch:
+            for text, vector in zip(data, embeddings):
+                batch.add_data_object(
+                    uuid=generate_uuid5(text, self.index),
+                    data_object={"raw_text": text},
+                    class_name=self.index,
+                    vector=vector,
+                )
+
+        return list(data)
+
     def get(self, data):
         return self.get_relevant(data, 1)
 
@@ -120,6 +135,26 @@ class WeaviateMemory(MemoryProviderSingleton):
             logger.warn(f"Unexpected error {err=}, {type(err)=}")
             return []
 
+    def search_many(self, embeddings, num_relevant=5):
+        """Gets the relevant data for each embedding with one multi-get query"""
+        queries = [
+            self.client.query.get(self.index, ["raw_text"])
+            .with_near_vector({"vector": embedding, "certainty": 0.7})
+            .with_limit(num_relevant)
+            .with_alias(f"query{i}")
+            for i, embedding in enumerate(embeddings)
+        ]
+        try:
+            results = self.client.query.multi_get(queries).do()
+            return [
+                [str(item["raw_text"]) for item in results["data"]["Get"][f"query{i}"]]
+                for i in range(len(embeddings))
+            ]
+
+        except Exception as err:
+            logger.warn(f"Unexpected error {err=}, {type(err)=}")
+            return [[] for _ in embeddings]
+
     def get_stats(self):
         result = self.client.query.aggregate(self.index).with_meta_count().do()
         class_data = result["data"]["Aggregate"][self.index]
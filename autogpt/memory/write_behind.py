@@ -0,0 +1,164 @@
+"""Write-behind buffer that takes memory writes off the agent loop."""
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+
+from autogpt.logs import logger
+from autogpt.memory.base import MemoryProviderSingleton
+
+# How long the flusher waits for more writes to fill a batch, in seconds
+BATCH_WAIT = 0.5
+
+_FLUSH = object()
+_STOP = object()
+
+_buffers: Dict[int, WriteBehindMemory] = {}
+_buffers_lock = threading.Lock()
+
+
+class WriteBehindMemory:
+    """
+    Wraps a memory provider so that add returns without waiting for storage.
+
+    Added texts go into a bounded queue, and a background thread writes them in
+    batches: they are written with one add_many, which requests their
+    embeddings in one call, if the provider supports it. When the queue is
+    full, add blocks until the flusher has caught up.
+
+    Reads flush the queue first, so get_relevant always sees earlier writes.
+    All other attributes are taken from the wrapped provider.
+    """
+
+    def __init__(
+        self, memory: MemoryProviderSingleton, max_queue_size: int, batch_size: int
+    ) -> None:
+        """
+        Args:
+            memory: The memory provider to write to.
+            max_queue_size: The number of queued writes at which add blocks.
+            batch_size: The maximum number of texts written in one batch.
+        """
+        self.memory = memory
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="memory-write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    @classmethod
+    def wrap(
+        cls, memory: MemoryProviderSingleton, max_queue_size: int, batch_size: int
+    ) -> WriteBehindMemory:
+        """Get the write-behind buffer of a memory provider, creating it once."""
+        with _buffers_lock:
+            buffer = _buffers.get(id(memory))
+            if buffer is None or buffer.memory is not memory or buffer._stopped:
+                buffer = cls(memory, max_queue_size, batch_size)
+                _buffers[id(memory)] = buffer
+            return buffer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.memory, name)
+
+    def add(self, data: str) -> str:
+        """Queue a text to be added to memory, blocking if the queue is full."""
+        if self._stopped:
+            return self.memory.add(data)
+        if "Command Error:" in data:
+            # Providers do not store command errors, so they are not queued
+            return ""
+        self._queue.put(data)
+        return data
+
+    def add_many(self, data: List[str], embeddings=None) -> List[str]:
+        if self._stopped or embeddings is not None:
+            self.flush()
+            return self.memory.add_many(data, embeddings)
+        added = [text for text in data if "Command Error:" not in text]
+        for text in added:
+            self._queue.put(text)
+        return added
+
+    def flush(self) -> None:
+        """Wait until all queued texts have been written."""
+        if self._stopped:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        """Write all queued texts and stop the flusher."""
+        if self._stopped:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._stopped = True
+
+    def get(self, data: str):
+        self.flush()
+        return self.memory.get(data)
+
+    def get_relevant(self, data: str, num_relevant: int = 5):
+        self.flush()
+        return self.memory.get_relevant(data, num_relevant)
+
+    def get_relevant_many(self, data: List[str], num_relevant: int = 5):
+        self.flush()
+        return self.memory.get_relevant_many(data, num_relevant)
+
+    def get_stats(self):
+        self.flush()
+        return self.memory.get_stats()
+
+    def clear(self):
+        self.flush()
+        return self.memory.clear()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch: List[str] = []
+            markers = 0
+            item = self._queue.get()
+            deadline = time.monotonic() + BATCH_WAIT
+            while True:
+                if item is _STOP:
+                    stop = True
+                if item is _FLUSH or item is _STOP:
+                    markers += 1
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+
+    def _write(self, batch: List[str]) -> None:
+        try:
+            if self.memory.supports_add_many:
+                # The provider embeds the texts in one call, after skipping the
+                # ones it does not add
+                self.memory.add_many(batch)
+            else:
+                for text in batch:
+                    self.memory.add(text)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} texts to memory: {e}")
@@ -5,6 +5,9 @@ from typing import Dict, List, Tuple
 from autogpt.agent import Agent
 from autogpt.config import Config
 from autogpt.llm.llm_utils import create_chat_completion
+from autogpt.llm.metrics import SUMMARY_CALL_SITE
+from autogpt.llm.model_router import ModelRouter
+from autogpt.llm.token_counter import count_message_tokens
 from autogpt.log_cycle.log_cycle import PROMPT_SUMMARY_FILE_NAME, SUMMARY_FILE_NAME
 from autogpt.logs import logger
 
@@ -125,7 +128,13 @@ Latest Development:
         PROMPT_SUMMARY_FILE_NAME,
     )
 
-    current_memory = create_chat_completion(messages, cfg.fast_llm_model)
+    decision = ModelRouter().route(
+        SUMMARY_CALL_SITE,
+        prompt_tokens=lambda: count_message_tokens(messages, cfg.fast_llm_model),
+    )
+    current_memory = create_chat_completion(
+        messages, decision.model, call_site=SUMMARY_CALL_SITE
+    )
 
     agent.log_cycle_handler.log_cycle(
         agent.config.ai_name,
@@ -1,9 +1,49 @@
 """HTML processing functions"""
 from __future__ import annotations
 
+import functools
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Mapping
+
+import lxml.html
 from bs4 import BeautifulSoup
+from lxml.etree import ParserError
 from requests.compat import urljoin
 
+from autogpt.logs import logger
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+# Elements that never hold text worth reading
+IGNORED_TAGS = frozenset(["script", "style"])
+# Elements removed with boilerplate removal: navigation, page furniture and widgets
+BOILERPLATE_TAGS = frozenset(
+    ["nav", "header", "footer", "aside", "form", "noscript", "iframe", "svg"]
+)
+BOILERPLATE_ROLES = frozenset(
+    ["navigation", "banner", "contentinfo", "complementary", "search"]
+)
+BOILERPLATE_PATTERN = re.compile(
+    r"(?:^|[\s_-])(?:ads?|advert\w*|banner|breadcrumbs?|comments?|consent|cookies?"
+    r"|footer|masthead|menu|modal|nav|navbar|newsletter|popup|promo|related"
+    r"|share|sidebar|social|subscribe)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+# Elements kept even if their class or id looks like boilerplate
+CONTENT_TAGS = frozenset(["html", "body", "main", "article"])
+
+
+@dataclass
+class PageContent:
+    """The readable text and the hyperlinks of a page"""
+
+    text: str = ""
+    links: list[tuple[str, str]] = field(default_factory=list)
+
 
 def extract_hyperlinks(soup: BeautifulSoup, base_url: str) -> list[tuple[str, str]]:
     """Extract hyperlinks from a BeautifulSoup object
@@ -31,3 +71,160 @@ def format_hyperlinks(hyperlinks: list[tuple[str, str]]) -> list[str]:
         List[str]: The formatted hyperlinks
     """
     return [f"{link_text} ({link_url})" for link_text, link_url in hyperlinks]
+
+
+def extract_page(
+    html: str, base_url: str, parser: str = "lxml", remove_boilerplate: bool = False
+) -> PageContent:
+    """Extract the text and the hyperlinks of a page, parsing it once
+
+    Args:
+        html (str): The HTML of the page
+        base_url (str): The URL of the page, to resolve relative links against
+        parser (str): The parser to use: "lxml", "selectolax" or "html.parser"
+        remove_boilerplate (bool): Whether to leave navigation, headers, footers,
+            forms and widgets out of the text. Links are always taken from the
+            whole page.
+
+    Returns:
+        PageContent: The text, one line per block of text, and the hyperlinks
+
+    Raises:
+        ValueError: If the parser is unknown
+    """
+    if parser not in _EXTRACTORS:
+        raise ValueError(
+            f"Unknown HTML parser {parser}, expected one of {', '.join(_EXTRACTORS)}"
+        )
+    if parser == "selectolax" and SelectolaxParser is None:
+        _warn_selectolax_missing()
+        parser = "lxml"
+    return _EXTRACTORS[parser](html, base_url, remove_boilerplate)
+
+
+def normalize_text(text: str) -> str:
+    """Put each block of text on its own line, without surrounding whitespace"""
+    return "\n".join(
+        phrase.strip()
+        for line in text.splitlines()
+        for phrase in line.split("  ")
+        if phrase.strip()
+    )
+
+
+def _is_boilerplate(tag: str, attributes: Mapping[str, str]) -> bool:
+    if tag in BOILERPLATE_TAGS:
+        return True
+    if tag in CONTENT_TAGS:
+        return False
+    if attributes.get("role", "").lower() in BOILERPLATE_ROLES:
+        return True
+    names = f"{attributes.get('id', '')} {attributes.get('class', '')}".strip()
+    return bool(names) and bool(BOILERPLATE_PATTERN.search(names))
+
+
+def _extract_with_soup(
+    html: str, base_url: str, remove_boilerplate: bool
+) -> PageContent:
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(list(IGNORED_TAGS)):
+        element.extract()
+    links = extract_hyperlinks(soup, base_url)
+
+    if remove_boilerplate:
+        for element in soup.find_all(True):
+            if element.decomposed:
+                continue
+            attributes = {
+                name: " ".join(value) if isinstance(value, list) else value
+                for name, value in element.attrs.items()
+            }
+            if _is_boilerplate(element.name, attributes):
+                element.decompose()
+    return PageContent(normalize_text(soup.get_text()), links)
+
+
+def _extract_with_lxml(
+    html: str, base_url: str, remove_boilerplate: bool
+) -> PageContent:
+    try:
+        root = lxml.html.document_fromstring(
+            html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8")
+        )
+    except ParserError:
+        # The page is empty
+        return PageContent()
+
+    links = []
+    dropped = []
+    for element in root.iter():
+        tag = element.tag
+        if not isinstance(tag, str):
+            # A comment or processing instruction
+            continue
+        if tag in IGNORED_TAGS:
+            dropped.append(element)
+            continue
+        if tag == "a" and element.get("href") is not None:
+            links.append(
+                (element.text_content(), urljoin(base_url, element.get("href")))
+            )
+        if remove_boilerplate and _is_boilerplate(tag, element.attrib):
+            dropped.append(element)
+    for element in dropped:
+        # Keeps the text that follows the element
+        element.drop_tree()
+    return PageContent(normalize_text(str(root.text_content())), links)
+
+
+def _extract_with_selectolax(
+    html: str, base_url: str, remove_boilerplate: bool
+) -> PageContent:
+    tree = SelectolaxParser(html)
+    tree.strip_tags(list(IGNORED_TAGS))
+    if tree.root is None:
+        return PageContent()
+
+    links = [
+        (node.text(), urljoin(base_url, node.attributes.get("href") or ""))
+        for node in tree.css("a[href]")
+    ]
+    if remove_boilerplate:
+        matches = [
+            node
+            for node in tree.css("*")
+            if _is_boilerplate(
+                node.tag,
+                {name: value or "" for name, value in node.attributes.items()},
+            )
+        ]
+        matched = {node.mem_id for node in matches}
+        for node in matches:
+            # A node inside a removed node is freed with it
+            if not _has_ancestor(node, matched):
+                node.decompose()
+    return PageContent(normalize_text(tree.root.text(deep=True)), links)
+
+
+def _has_ancestor(node, mem_ids: set) -> bool:
+    parent = node.parent
+    while parent is not None:
+        if parent.mem_id in mem_ids:
+            return True
+        parent = parent.parent
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_selectolax_missing() -> None:
+    logger.warn(
+        "selectolax is not installed, falling back to lxml. Install it with"
+        " 'pip install selectolax' to use it."
+    )
+
+
+_EXTRACTORS: Dict[str, Callable[[str, str, bool], PageContent]] = {
+    "lxml": _extract_with_lxml,
+    "selectolax": _extract_with_selectolax,
+    "html.parser": _extract_with_soup,
+}
@@ -0,0 +1,182 @@
+"""Sentence segmenters used to split text into chunks"""
+from __future__ import annotations
+
+import abc
+import functools
+import re
+from typing import Iterator, List
+
+# spaCy parses long texts in pieces of at most this many characters, which bounds
+# the memory the parser uses and stays under the pipeline's max_length
+SPACY_PIECE_LENGTH = 100_000
+
+# Words that end with a full stop without ending the sentence, lowercase and
+# without the final full stop. Single letters and dotted initials like "U.S"
+# or "e.g" are recognized without being listed.
+ABBREVIATIONS = frozenset(
+    [
+        "al",
+        "approx",
+        "apr",
+        "assn",
+        "aug",
+        "ave",
+        "bros",
+        "capt",
+        "cf",
+        "co",
+        "col",
+        "corp",
+        "dec",
+        "dept",
+        "dr",
+        "est",
+        "feb",
+        "fig",
+        "figs",
+        "gen",
+        "gov",
+        "inc",
+        "jan",
+        "jr",
+        "jul",
+        "jun",
+        "lt",
+        "ltd",
+        "mar",
+        "mfg",
+        "mr",
+        "mrs",
+        "ms",
+        "mt",
+        "no",
+        "nos",
+        "nov",
+        "oct",
+        "pp",
+        "prof",
+        "rep",
+        "sec",
+        "sen",
+        "sep",
+        "sept",
+        "sgt",
+        "sr",
+        "st",
+        "vol",
+        "vs",
+    ]
+)
+
+# Sentence-final punctuation, with any closing quotes and brackets, before a space
+_TERMINATOR = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s)")
+_INITIALS = re.compile(r"[A-Za-z](?:\.[A-Za-z])*")
+_OPENING = "\"'“‘(["
+
+
+class SentenceSegmenter(abc.ABC):
+    """Splits text into sentences"""
+
+    @abc.abstractmethod
+    def split(self, text: str) -> List[str]:
+        """Split text into sentences
+
+        Args:
+            text (str): The text to split
+
+        Returns:
+            List[str]: The sentences of the text, without surrounding whitespace
+        """
+
+
+class SpacySegmenter(SentenceSegmenter):
+    """Splits sentences with a spaCy pipeline, the most accurate but slowest"""
+
+    def __init__(self, language_model: str) -> None:
+        # spaCy is only imported when it is used, as importing it is slow
+        import spacy
+
+        self.nlp = spacy.load(language_model)
+        self.nlp.add_pipe("sentencizer")
+
+    def split(self, text: str) -> List[str]:
+        return [
+            sentence.text.strip()
+            for doc in self.nlp.pipe(_split_pieces(text, SPACY_PIECE_LENGTH))
+            for sentence in doc.sents
+            if sentence.text.strip()
+        ]
+
+
+class RegexSegmenter(SentenceSegmenter):
+    """Splits sentences with rules, without loading a language model
+
+    A sentence ends at a full stop, question mark or exclamation mark followed
+    by a space, unless the next sentence would start in lowercase, or the full
+    stop ends an abbreviation, an initial or dotted initials like "U.S.".
+    Full stops inside numbers and tickers like "$1.5B" or "BRK.B" are not
+    followed by a space, so they never end a sentence.
+    """
+
+    def split(self, text: str) -> List[str]:
+        sentences = []
+        start = 0
+        for match in _TERMINATOR.finditer(text):
+            if not self._ends_sentence(text, match):
+                continue
+            sentence = text[start : match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        rest = text[start:].strip()
+        if rest:
+            sentences.append(rest)
+        return sentences
+
+    @staticmethod
+    def _ends_sentence(text: str, match: re.Match) -> bool:
+        following = text[match.end() : match.end() + 32].lstrip()
+        next_char = following.lstrip(_OPENING)[:1]
+        if next_char.islower():
+            return False
+        if match.group().rstrip("\"'”’)]") != ".":
+            return True
+
+        preceding = text[max(match.start() - 32, 0) : match.start()].split()
+        word = preceding[-1].lstrip(_OPENING) if preceding else ""
+        if word.lower() in ABBREVIATIONS:
+            return False
+        return not _INITIALS.fullmatch(word)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentence_segmenter(name: str, language_model: str) -> SentenceSegmenter:
+    """Get a sentence segmenter, created once per process
+
+    Args:
+        name (str): "spacy" or "regex"
+        language_model (str): The spaCy model to load for the spacy segmenter
+
+    Returns:
+        SentenceSegmenter: The segmenter
+
+    Raises:
+        ValueError: If the segmenter is unknown
+    """
+    if name == "spacy":
+        return SpacySegmenter(language_model)
+    if name == "regex":
+        return RegexSegmenter()
+    raise ValueError(f"Unknown sentence segmenter {name}, expected spacy or regex")
+
+
+def _split_pieces(text: str, max_length: int) -> Iterator[str]:
+    # Cuts after the last full stop of each piece, so sentences stay whole
+    start = 0
+    while len(text) - start > max_length:
+        end = text.rfind(". ", start, start + max_length) + 1
+        if end <= start:
+            end = start + max_length
+        yield text[start:end]
+        start = end
+    yield text[start:]
@@ -0,0 +1,106 @@
+"""A cache of the summaries of pages and documents, keyed by their content."""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from autogpt.config import Config
+from autogpt.singleton import Singleton
+from autogpt.url_utils.validators import normalize_url
+
+
+def content_hash(text: str) -> str:
+    """Hash a text to key the cache by its content."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SummaryCache(metaclass=Singleton):
+    """
+    Keeps the summaries of pages, so revisiting a page does not summarize it again.
+
+    The final summary of a page is keyed by its normalized URL, the hash of its
+    text, the question and the model. The summary of each chunk is keyed by the
+    hash of the chunk, the question and the model, so when a page changed only
+    in part, only its changed chunks are summarized again.
+
+    Entries expire `ttl` seconds after they were stored. Beyond `max_entries`
+    entries, the least recently used are evicted.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: The maximum number of summaries kept, 0 to disable the
+                cache. Defaults to SUMMARY_CACHE_MAX_ENTRIES.
+            ttl: The number of seconds a summary is kept, 0 to keep summaries
+                until they are evicted. Defaults to SUMMARY_CACHE_TTL.
+        """
+        cfg = Config()
+        self.max_entries = (
+            cfg.summary_cache_max_entries if max_entries is None else max_entries
+        )
+        self.ttl = cfg.summary_cache_ttl if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_summary(
+        self, url: str, text: str, question: str, model: str
+    ) -> Optional[str]:
+        """Get the final summary of a page, if it is cached."""
+        return self._get(
+            ("page", normalize_url(url), content_hash(text), question, model)
+        )
+
+    def set_summary(
+        self, url: str, text: str, question: str, model: str, summary: str
+    ) -> None:
+        """Store the final summary of a page."""
+        self._set(
+            ("page", normalize_url(url), content_hash(text), question, model), summary
+        )
+
+    def get_chunk_summary(self, chunk: str, question: str, model: str) -> Optional[str]:
+        """Get the summary of a chunk of a page, if it is cached."""
+        return self._get(("chunk", content_hash(chunk), question, model))
+
+    def set_chunk_summary(
+        self, chunk: str, question: str, model: str, summary: str
+    ) -> None:
+        """Store the summary of a chunk of a page."""
+        self._set(("chunk", content_hash(chunk), question, model), summary)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Tuple[Any, ...]) -> Optional[str]:
+        if not self.max_entries:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[1] + self.ttl < time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _set(self, key: Tuple[Any, ...], summary: str) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (summary, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,17 +1,40 @@
 """Text processing functions"""
-from typing import Dict, Generator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Generator, List, Optional
 
-import spacy
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from autogpt.config import Config
-from autogpt.llm import count_message_tokens, create_chat_completion
+from autogpt.llm import (
+    count_message_tokens,
+    count_strings_tokens,
+    create_chat_completion,
+)
+from autogpt.llm.metrics import BROWSE_SUMMARY_CALL_SITE
+from autogpt.llm.model_router import ModelRouter
 from autogpt.logs import logger
 from autogpt.memory import get_memory
+from autogpt.processing.sentences import get_sentence_segmenter
+from autogpt.processing.summary_cache import SummaryCache
 
 CFG = Config()
 
 
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences with the configured sentence segmenter
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        List[str]: The sentences of the text, without surrounding whitespace
+    """
+    segmenter = get_sentence_segmenter(
+        CFG.browse_sentence_segmenter, CFG.browse_spacy_language_model
+    )
+    return segmenter.split(text)
+
+
 def split_text(
     text: str,
     max_length: int = CFG.browse_chunk_max_length,
@@ -31,34 +54,28 @@ def split_text(
         ValueError: If the text is longer than the maximum length
     """
     flattened_paragraphs = " ".join(text.split("\n"))
-    nlp = spacy.load(CFG.browse_spacy_language_model)
-    nlp.add_pipe("sentencizer")
-    doc = nlp(flattened_paragraphs)
-    sentences = [sent.text.strip() for sent in doc.sents]
+    sentences = split_sentences(flattened_paragraphs)
+
+    # The tokens of the prompt around the chunk are counted once, and each
+    # sentence once with the space that joins it to the chunk. Tokens rarely
+    # merge across sentences, so the sum slightly overestimates the chunk.
+    prompt_tokens = count_message_tokens([create_message("", question)], model) + 1
+    sentence_tokens = count_strings_tokens(
+        [" " + sentence for sentence in sentences], model
+    )
 
     current_chunk = []
+    expected_token_usage = prompt_tokens
 
-    for sentence in sentences:
-        message_with_additional_sentence = [
-            create_message(" ".join(current_chunk) + " " + sentence, question)
-        ]
-
-        expected_token_usage = (
-            count_message_tokens(messages=message_with_additional_sentence, model=model)
-            + 1
-        )
-        if expected_token_usage <= max_length:
+    for sentence, tokens in zip(sentences, sentence_tokens):
+        if expected_token_usage + tokens <= max_length:
             current_chunk.append(sentence)
+            expected_token_usage += tokens
         else:
-            yield " ".join(current_chunk)
+            if current_chunk:
+                yield " ".join(current_chunk)
             current_chunk = [sentence]
-            message_this_sentence_only = [
-                create_message(" ".join(current_chunk), question)
-            ]
-            expected_token_usage = (
-                count_message_tokens(messages=message_this_sentence_only, model=model)
-                + 1
-            )
+            expected_token_usage = prompt_tokens + tokens
             if expected_token_usage > max_length:
                 raise ValueError(
                     f"Sentence is too long in webpage: {expected_token_usage} tokens."
@@ -89,54 +106,197 @@ def summarize_text(
     text_length = len(text)
     logger.info(f"Text length: {text_length} characters")
 
-    summaries = []
+    cache = SummaryCache()
+    cached_summary = cache.get_summary(url, text, question, model)
+    if cached_summary is not None:
+        logger.info(f"Using the cached summary of {url}")
+        return cached_summary
+
     chunks = list(
         split_text(
             text, max_length=CFG.browse_chunk_max_length, model=model, question=question
         ),
     )
     scroll_ratio = 1 / len(chunks)
-
-    for i, chunk in enumerate(chunks):
-        if driver:
-            scroll_to_percentage(driver, scroll_ratio * i)
-        logger.info(f"Adding chunk {i + 1} / {len(chunks)} to memory")
-
-        memory_to_add = f"Source: {url}\n" f"Raw content part#{i + 1}: {chunk}"
-
-        memory = get_memory(CFG)
-        memory.add(memory_to_add)
-
+    memory = get_memory(CFG)
+
+    def summarize_chunk(i: int) -> str:
+        chunk = chunks[i]
+        summary = cache.get_chunk_summary(chunk, question, model)
+        if summary is not None:
+            logger.info(f"Using the cached summary of chunk {i + 1} / {len(chunks)}")
+            return summary
         messages = [create_message(chunk, question)]
         tokens_for_chunk = count_message_tokens(messages, model)
         logger.info(
             f"Summarizing chunk {i + 1} / {len(chunks)} of length {len(chunk)} characters, or {tokens_for_chunk} tokens"
         )
+        summary = summarize_messages(messages, tokens_for_chunk)
+        cache.set_chunk_summary(chunk, question, model, summary)
+        return summary
+
+    # Chunk summaries are requested concurrently, and come back in chunk order
+    with ThreadPoolExecutor(max(CFG.browse_summary_concurrency, 1)) as executor:
+        pending = executor.map(summarize_chunk, range(len(chunks)))
+        summaries = []
+        memories = []
+        for i, summary in enumerate(pending):
+            if driver:
+                scroll_to_percentage(driver, scroll_ratio * i)
+            summaries.append(summary)
+            memories.append(f"Source: {url}\nRaw content part#{i + 1}: {chunks[i]}")
+            memories.append(f"Source: {url}\nContent summary part#{i + 1}: {summary}")
+
+        logger.info(f"Summarized {len(chunks)} chunks.")
+        logger.info(f"Adding {len(chunks)} chunks and their summaries to memory")
+        add_memories(memory, memories)
+        summaries = reduce_summaries(summaries, question, model, executor)
 
-        summary = create_chat_completion(
-            model=model,
-            messages=messages,
-        )
-        summaries.append(summary)
-        logger.info(
-            f"Added chunk {i + 1} summary to memory, of length {len(summary)} characters"
-        )
+    combined_summary = "\n".join(summaries)
+    messages = [create_message(combined_summary, question)]
+    summary = summarize_messages(messages, count_message_tokens(messages, model))
+    cache.set_summary(url, text, question, model, summary)
+    return summary
 
-        memory_to_add = f"Source: {url}\n" f"Content summary part#{i + 1}: {summary}"
 
-        memory.add(memory_to_add)
+def add_memories(memory, memories: List[str]) -> None:
+    """Add memories with one embedding request and one bulk insert
 
-    logger.info(f"Summarized {len(chunks)} chunks.")
+    The provider embeds the memories itself, so duplicates it skips are not
+    embedded. With MEMORY_WRITE_BEHIND, the memories are queued and embedded
+    and written in the background, without waiting for them.
+
+    Args:
+        memory: The memory provider to add to
+        memories (List[str]): The texts to add
+    """
+    if CFG.memory_write_behind or memory.supports_add_many:
+        memory.add_many(memories)
+    else:
+        for text in memories:
+            memory.add(text)
 
-    combined_summary = "\n".join(summaries)
-    messages = [create_message(combined_summary, question)]
 
+def summarize_messages(messages: List[Dict[str, str]], prompt_tokens: int) -> str:
+    """Get a summary from the model routed for the prompt size
+
+    Args:
+        messages (List[Dict[str, str]]): The messages asking for the summary
+        prompt_tokens (int): The number of tokens in the messages
+
+    Returns:
+        str: The summary
+    """
     return create_chat_completion(
-        model=model,
+        model=ModelRouter()
+        .route(BROWSE_SUMMARY_CALL_SITE, prompt_tokens=prompt_tokens)
+        .model,
         messages=messages,
+        call_site=BROWSE_SUMMARY_CALL_SITE,
     )
 
 
+def reduce_summaries(
+    summaries: List[str], question: str, model: str, executor: ThreadPoolExecutor
+) -> List[str]:
+    """Summarize groups of summaries until they fit in one chunk
+
+    Summaries that fit in one chunk together are returned as they are. Otherwise
+    consecutive summaries are grouped into chunks and each group is summarized,
+    concurrently, level after level.
+
+    Args:
+        summaries (List[str]): The summaries, in order
+        question (str): The question to answer
+        model (str): The model used to count tokens
+        executor (ThreadPoolExecutor): The executor to summarize groups in
+
+    Returns:
+        List[str]: Summaries that fit in one chunk together, in order
+    """
+    max_length = CFG.browse_chunk_max_length
+    prompt_tokens = count_message_tokens([create_message("", question)], model) + 1
+    level = 1
+    while len(summaries) > 1:
+        # Summaries are joined by newlines, counted with the summary they precede
+        summary_tokens = count_strings_tokens(
+            ["\n" + summary for summary in summaries], model
+        )
+        if prompt_tokens + sum(summary_tokens) <= max_length:
+            break
+
+        groups: List[List[str]] = []
+        group_tokens = max_length
+        for summary, tokens in zip(summaries, summary_tokens):
+            if group_tokens + tokens > max_length:
+                groups.append([])
+                group_tokens = prompt_tokens
+            groups[-1].append(summary)
+            group_tokens += tokens
+        if len(groups) == len(summaries):
+            # Each summary fills a chunk on its own, so pair them up to make
+            # progress, cutting them to half a chunk so each pair still fits
+            half_length = prompt_tokens + (max_length - prompt_tokens) // 2
+            logger.warn("Summaries too long to reduce, cutting them to half a chunk")
+            summaries = [
+                truncate_summary(
+                    summary, tokens, half_length, prompt_tokens, question, model
+                )
+                for summary, tokens in zip(summaries, summary_tokens)
+            ]
+            groups = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+
+        logger.info(
+            f"Reducing {len(summaries)} summaries to {len(groups)}, level {level}"
+        )
+        group_messages = [
+            [create_message("\n".join(group), question)] for group in groups
+        ]
+        summaries = list(
+            executor.map(
+                lambda messages: summarize_messages(
+                    messages, count_message_tokens(messages, model)
+                ),
+                group_messages,
+            )
+        )
+        level += 1
+    return summaries
+
+
+def truncate_summary(
+    summary: str,
+    tokens: int,
+    max_length: int,
+    prompt_tokens: int,
+    question: str,
+    model: str,
+) -> str:
+    """Cut a summary to the leading sentences that fit in a chunk of max_length
+
+    Args:
+        summary (str): The summary to cut
+        tokens (int): The number of tokens in the summary
+        max_length (int): The maximum length of the chunk, with its prompt
+        prompt_tokens (int): The number of tokens in the prompt around the chunk
+        question (str): The question to answer
+        model (str): The model used to count tokens
+
+    Returns:
+        str: The summary, or its beginning if it does not fit
+    """
+    if prompt_tokens + tokens <= max_length:
+        return summary
+    try:
+        chunks = split_text(
+            summary, max_length=max_length, model=model, question=question
+        )
+        return next(iter(chunks))
+    except (StopIteration, ValueError):
+        # The first sentence alone is too long, so cut it in proportion
+        return summary[: len(summary) * (max_length - prompt_tokens) // tokens]
+
+
 def scroll_to_percentage(driver: WebDriver, ratio: float) -> None:
     """Scroll to a percentage of the page
 
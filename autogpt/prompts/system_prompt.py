@@ -0,0 +1,48 @@
+"""A rendered system prompt that remembers its own token counts."""
+from __future__ import annotations
+
+from typing import Dict, Hashable
+
+
+class SystemPrompt(str):
+    """
+    An immutable, fully rendered system prompt.
+
+    It behaves like the prompt string everywhere a string is expected, and
+    additionally caches its token count per model so the agent loop does not
+    re-encode the whole prompt on every cycle.
+
+    Attributes:
+        cache_key (Hashable): The inputs the prompt was rendered from, used to
+            decide whether it has to be rebuilt.
+    """
+
+    cache_key: Hashable
+    _token_counts: Dict[str, int]
+
+    def __new__(cls, text: str, cache_key: Hashable = None) -> "SystemPrompt":
+        prompt = super().__new__(cls, text)
+        prompt.cache_key = cache_key
+        prompt._token_counts = {}
+        return prompt
+
+    def count_tokens(self, model: str) -> int:
+        """
+        Returns the number of tokens the prompt uses as a system message.
+
+        The count includes the per-message overhead but not the reply priming,
+        so it can be added to the count of the remaining messages.
+
+        Args:
+            model (str): The name of the model to use for tokenization.
+
+        Returns:
+            int: The number of tokens used by the prompt message.
+        """
+        if model not in self._token_counts:
+            from autogpt.llm.token_counter import count_message_tokens
+
+            self._token_counts[model] = count_message_tokens(
+                [{"role": "system", "content": str(self)}], model
+            ) - count_message_tokens([], model)
+        return self._token_counts[model]
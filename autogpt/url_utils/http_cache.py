@@ -0,0 +1,337 @@
+"""A private HTTP cache for requests sessions, stored on disk."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urldefrag
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from autogpt.config import Config
+from autogpt.logs import logger
+
+# Statuses that can be cached without explicit freshness, RFC 9110 section 15.1
+CACHEABLE_STATUSES = frozenset([200, 203, 204, 300, 301, 308, 404, 405, 410, 414])
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "TRACE"])
+# Without max-age or Expires, a response with Last-Modified stays fresh for this
+# fraction of its age when it was fetched, up to MAX_HEURISTIC_LIFETIME seconds
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_LIFETIME = 24 * 3600
+# Outside the workspace, so cached pages do not show up among the agent's files
+DEFAULT_CACHE_DIR = Path(__file__).parents[2] / "http_cache"
+# Headers describing the body as it was sent, not as it is stored
+UNSTORED_HEADERS = frozenset(
+    ["content-encoding", "content-length", "transfer-encoding", "connection"]
+)
+
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into its lowercase directives and values"""
+    directives: Dict[str, Optional[str]] = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(int(value), 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """A stored response and the request headers it varies on"""
+
+    url: str
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    stored_at: float
+    vary: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def directives(self) -> Dict[str, Optional[str]]:
+        return parse_cache_control(self.headers.get("Cache-Control", ""))
+
+    def freshness_lifetime(self) -> float:
+        """The number of seconds the response is fresh for, RFC 9111 section 4.2.1"""
+        directives = self.directives
+        if "no-cache" in directives:
+            return 0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+        date = _timestamp(self.headers.get("Date")) or self.stored_at
+        if "Expires" in self.headers:
+            expires = _timestamp(self.headers["Expires"])
+            return max(expires - date, 0) if expires is not None else 0
+        last_modified = _timestamp(self.headers.get("Last-Modified"))
+        if last_modified is not None and self.status in CACHEABLE_STATUSES:
+            return min(
+                max(date - last_modified, 0) * HEURISTIC_FRACTION,
+                MAX_HEURISTIC_LIFETIME,
+            )
+        return 0
+
+    def age(self, now: float) -> float:
+        """The age of the response in seconds, counting its age when it was stored"""
+        return (_seconds(self.headers.get("Age")) or 0) + max(now - self.stored_at, 0)
+
+    def is_fresh(self, now: float, max_age: Optional[int] = None) -> bool:
+        age = self.age(now)
+        if max_age is not None and age > max_age:
+            return False
+        return age < self.freshness_lifetime()
+
+    def validators(self) -> Dict[str, str]:
+        """The conditional request headers that revalidate the response"""
+        validators = {}
+        if "ETag" in self.headers:
+            validators["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def matches(self, request: PreparedRequest) -> bool:
+        """Check if the request sends the headers the response varies on"""
+        return all(
+            request.headers.get(name, "") == value for name, value in self.vary.items()
+        )
+
+    def revalidated(self, headers: CaseInsensitiveDict, now: float) -> CacheEntry:
+        """Get the entry updated with the headers of a 304 Not Modified response"""
+        updated = CaseInsensitiveDict(self.headers)
+        for name, value in headers.items():
+            if name.lower() not in UNSTORED_HEADERS:
+                updated[name] = value
+        return CacheEntry(
+            self.url,
+            self.status,
+            self.reason,
+            dict(updated),
+            now,
+            self.vary,
+            self.body,
+        )
+
+
+class DiskCacheStore:
+    """
+    Stores cache entries as files, one header file and one body file per URL.
+
+    Beyond `max_entries` entries, the least recently stored are removed.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_entries: int = 1000):
+        """
+        Args:
+            directory: The directory of the cache. Defaults to HTTP_CACHE_DIR, or
+                http_cache next to the logs directory.
+            max_entries: The maximum number of responses kept.
+        """
+        self._directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is not None:
+            return self._directory
+        cfg = Config()
+        if cfg.http_cache_dir:
+            return Path(cfg.http_cache_dir)
+        return DEFAULT_CACHE_DIR
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        directory = self.directory
+        try:
+            fields = json.loads((directory / f"{key}.json").read_text())
+            body = (directory / f"{key}.body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(**fields, body=body)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        directory = self.directory
+        fields = asdict(entry)
+        body = fields.pop("body")
+        with self._lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            # The body is written first, so a header file always has its body
+            self._write(directory / f"{key}.body", body)
+            self._write(directory / f"{key}.json", json.dumps(fields).encode())
+            self._prune(directory)
+
+    def delete(self, key: str) -> None:
+        directory = self.directory
+        with self._lock:
+            for suffix in (".json", ".body"):
+                (directory / f"{key}{suffix}").unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        temporary = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def _prune(self, directory: Path) -> None:
+        headers = list(directory.glob("*.json"))
+        if len(headers) <= self.max_entries:
+            return
+        headers.sort(key=lambda path: path.stat().st_mtime)
+        for path in headers[: len(headers) - self.max_entries]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".body").unlink(missing_ok=True)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    A transport adapter that caches GET responses, following RFC 9111 for a
+    private cache.
+
+    Fresh responses are served from the store without a request. Stale responses
+    with an ETag or Last-Modified header are revalidated with a conditional
+    request, and a 304 Not Modified refreshes the stored response instead of
+    downloading it again. Responses marked no-store, varying on every header or
+    without freshness information or validators are not stored. Successful
+    unsafe requests remove the stored response of their URL.
+
+    Streamed responses are passed through, as storing them would read them.
+    """
+
+    def __init__(self, store: DiskCacheStore, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.store = store
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def send(self, request: PreparedRequest, stream: bool = False, **kwargs):
+        key = cache_key(request)
+        if request.method != "GET":
+            response = super().send(request, stream=stream, **kwargs)
+            if request.method not in SAFE_METHODS and response.status_code < 400:
+                self.store.delete(key)
+            return response
+
+        directives = parse_cache_control(request.headers.get("Cache-Control", ""))
+        if "no-store" in directives:
+            return super().send(request, stream=stream, **kwargs)
+
+        now = time.time()
+        entry = self.store.get(key)
+        if entry is not None and not entry.matches(request):
+            entry = None
+        if (
+            entry is not None
+            and "no-cache" not in directives
+            and entry.is_fresh(now, _seconds(directives.get("max-age")))
+        ):
+            self.hits += 1
+            return self._cached_response(request, entry, now)
+
+        if entry is not None and entry.validators():
+            conditional = request.copy()
+            conditional.headers.update(entry.validators())
+            response = super().send(conditional, stream=stream, **kwargs)
+            if response.status_code == 304:
+                response.close()
+                self.revalidations += 1
+                entry = entry.revalidated(response.headers, now)
+                self.store.set(key, entry)
+                return self._cached_response(request, entry, now)
+        else:
+            response = super().send(request, stream=stream, **kwargs)
+
+        self.misses += 1
+        if not stream and self._is_storable(response):
+            self._store(key, request, response, now)
+        return response
+
+    def _is_storable(self, response: Response) -> bool:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        if response.headers.get("Vary", "").strip() == "*":
+            return False
+        directives = parse_cache_control(response.headers.get("Cache-Control", ""))
+        if "no-store" in directives:
+            return False
+        return bool(
+            "max-age" in directives
+            or "Expires" in response.headers
+            or "ETag" in response.headers
+            or "Last-Modified" in response.headers
+        )
+
+    def _store(
+        self, key: str, request: PreparedRequest, response: Response, now: float
+    ) -> None:
+        vary = [
+            name.strip()
+            for name in response.headers.get("Vary", "").split(",")
+            if name.strip()
+        ]
+        try:
+            self.store.set(
+                key,
+                CacheEntry(
+                    url=response.url,
+                    status=response.status_code,
+                    reason=response.reason or "",
+                    headers={
+                        name: value
+                        for name, value in response.headers.items()
+                        if name.lower() not in UNSTORED_HEADERS
+                    },
+                    stored_at=now,
+                    vary={name: request.headers.get(name, "") for name in vary},
+                    body=response.content,
+                ),
+            )
+        except OSError as e:
+            logger.debug(f"Could not cache the response of {response.url}: {e}")
+
+    def _cached_response(
+        self, request: PreparedRequest, entry: CacheEntry, now: float
+    ) -> Response:
+        response = Response()
+        response.status_code = entry.status
+        response.reason = entry.reason
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers["Age"] = str(int(entry.age(now)))
+        response.url = request.url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = request
+        response.connection = self
+        response._content = entry.body
+        # There is no connection to read from or release
+        response._content_consumed = True
+        return response
+
+
+def cache_key(request: PreparedRequest) -> str:
+    """Key a request by its URL, which is what the cache stores responses by"""
+    url, _ = urldefrag(request.url or "")
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
@@ -1,6 +1,6 @@
 import functools
 from typing import Any, Callable
-from urllib.parse import urljoin, urlparse
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
 
 from requests.compat import urljoin
 
@@ -66,6 +66,31 @@ def sanitize_url(url: str) -> str:
     return urljoin(url, reconstructed_url)
 
 
+def normalize_url(url: str) -> str:
+    """Normalize the URL so that URLs of the same page compare equal
+
+    The scheme and host are lowercased, default ports, fragments and trailing
+    slashes are dropped and query parameters are sorted.
+
+    Args:
+        url (str): The URL to normalize
+
+    Returns:
+        str: The normalized URL
+    """
+    parsed_url = urlparse(url.strip())
+    scheme = parsed_url.scheme.lower()
+    netloc = parsed_url.netloc.lower()
+    default_port = {"http": ":80", "https": ":443"}.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[: -len(default_port)]
+    path = parsed_url.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parsed_url.query, keep_blank_values=True)))
+    return parsed_url._replace(
+        scheme=scheme, netloc=netloc, path=path, query=query, fragment=""
+    ).geturl()
+
+
 def check_local_file_access(url: str) -> bool:
     """Check if the URL is a local file
 
@@ -0,0 +1,120 @@
+"""Benchmark extracting the text and links of web pages with each HTML parser.
+
+Times extract_page with every parser on a corpus of saved pages, and reports
+how much of the text boilerplate removal cuts. The previous implementation,
+which parsed each page twice with html.parser, is timed as the baseline.
+
+The corpus is read from a directory of .html files if one is given, otherwise
+a large generated finance page is used. selectolax is skipped unless it is
+installed.
+
+Usage: python -m benchmark.benchmark_html_extraction [corpus_dir] [repeats]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from bs4 import BeautifulSoup
+
+from autogpt.processing import html
+from autogpt.processing.html import extract_hyperlinks, extract_page
+
+BASE_URL = "https://finance.example.com/quote/AAPL/"
+REPEATS = 5
+GENERATED_ROWS = 2_000
+
+NAVIGATION = "".join(
+    f'<li><a href="/markets/{i}">Market {i}</a></li>' for i in range(200)
+)
+FOOTER = "".join(f'<a href="/legal/{i}">Legal notice {i}</a> ' for i in range(50))
+
+
+def generate_page(rows: int) -> str:
+    table = "".join(
+        f"<tr><td>2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}</td><td>{150 + i % 40}.25"
+        f"</td><td>{1_000_000 + i * 37:,}</td><td><a href='/news/{i}'>News {i}"
+        "</a></td></tr>"
+        for i in range(rows)
+    )
+    return (
+        "<html><head><title>AAPL quote</title>"
+        "<script>window.dataLayer = [];</script><style>td { padding: 2px; }</style>"
+        f"</head><body><header class='masthead'><nav><ul>{NAVIGATION}</ul></nav>"
+        "</header><div class='cookie-consent'>We use cookies to improve your"
+        " experience.</div><main><h1>Apple Inc. (AAPL)</h1><p>Apple Inc. designs,"
+        " manufactures and markets smartphones, personal computers, tablets,"
+        " wearables and accessories.</p>"
+        f"<table>{table}</table></main><aside class='sidebar'>Related quotes"
+        f"</aside><footer>{FOOTER}</footer></body></html>"
+    )
+
+
+def legacy_extract(page: str, base_url: str):
+    soup = BeautifulSoup(page, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = "\n".join(chunk for chunk in chunks if chunk)
+
+    soup = BeautifulSoup(page, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    return text, extract_hyperlinks(soup, base_url)
+
+
+def run(name: str, extract: Callable[[str], object], corpus: List[str], repeats: int):
+    start = time.monotonic()
+    for _ in range(repeats):
+        for page in corpus:
+            extract(page)
+    elapsed = (time.monotonic() - start) / repeats
+    size = sum(len(page) for page in corpus)
+    print(
+        f"{name}: {elapsed * 1e3 / len(corpus):.1f}ms per page"
+        f" ({size / elapsed / 1e6:.1f}M characters/s)"
+    )
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        paths = sorted(Path(sys.argv[1]).glob("*.html"))
+        corpus = [path.read_text(errors="replace") for path in paths]
+    else:
+        corpus = [generate_page(GENERATED_ROWS)]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else REPEATS
+    print(f"{len(corpus)} pages, {sum(len(page) for page in corpus):,} characters")
+
+    run(
+        "legacy html.parser",
+        lambda page: legacy_extract(page, BASE_URL),
+        corpus,
+        repeats,
+    )
+    parsers = ["html.parser", "lxml"]
+    if html.SelectolaxParser is not None:
+        parsers.append("selectolax")
+    for parser in parsers:
+        for remove_boilerplate in (False, True):
+            run(
+                f"{parser}{' without boilerplate' if remove_boilerplate else ''}",
+                lambda page: extract_page(page, BASE_URL, parser, remove_boilerplate),
+                corpus,
+                repeats,
+            )
+
+    full = sum(len(extract_page(page, BASE_URL).text.split()) for page in corpus)
+    trimmed = sum(
+        len(extract_page(page, BASE_URL, remove_boilerplate=True).text.split())
+        for page in corpus
+    )
+    print(
+        f"Boilerplate removal: {full:,} words -> {trimmed:,} words"
+        f" ({1 - trimmed / max(full, 1):.0%} fewer)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the local JSON repair of malformed LLM replies.
+
+Reports the repair rate and the time spent per reply for the tolerant parser,
+and for the previous programmatic repair chain (without the LLM fallback) when
+its dependencies are installed.
+
+Usage: python -m benchmark.benchmark_json_repair
+"""
+import json
+import os
+import time
+from typing import Any, Callable, List
+
+from autogpt.json_utils.json_fix_tolerant import parse_tolerant_json
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "data", "malformed_replies.json")
+ROUNDS = 200
+
+
+def load_corpus() -> List[dict]:
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def legacy_repair(reply: str) -> Any:
+    from regex import regex
+
+    from autogpt.json_utils.json_fix_llm import fix_and_parse_json
+
+    try:
+        return fix_and_parse_json(reply, try_to_fix_with_gpt=False)
+    except Exception:
+        pass
+    # The regex step of attempt_to_fix_json_by_finding_outermost_brackets, which
+    # would otherwise ask the LLM to fix what the regex does not
+    match = regex.search(r"\{(?:[^{}]|(?R))*\}", reply)
+    if match is None:
+        return {}
+    return fix_and_parse_json(match.group(0), try_to_fix_with_gpt=False)
+
+
+def benchmark(name: str, repair: Callable[[str], Any], corpus: List[dict]) -> None:
+    repaired = []
+    for case in corpus:
+        try:
+            result = repair(case["reply"])
+        except Exception:
+            result = None
+        if result == case["expected"]:
+            repaired.append(case["name"])
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for case in corpus:
+            try:
+                repair(case["reply"])
+            except Exception:
+                pass
+    elapsed = time.perf_counter() - start
+    microseconds_per_reply = elapsed / (ROUNDS * len(corpus)) * 1e6
+
+    print(
+        f"{name}: repaired {len(repaired)}/{len(corpus)}"
+        f" ({len(repaired) / len(corpus):.0%}), {microseconds_per_reply:.1f} us/reply"
+    )
+    failed = [case["name"] for case in corpus if case["name"] not in repaired]
+    if failed:
+        print(f"  not repaired: {', '.join(failed)}")
+
+
+def benchmark_json_repair() -> None:
+    corpus = load_corpus()
+    benchmark("tolerant parser", parse_tolerant_json, corpus)
+    try:
+        benchmark("legacy repair (no LLM)", legacy_repair, corpus)
+    except ImportError as e:
+        print(f"legacy repair skipped: {e}")
+
+
+if __name__ == "__main__":
+    benchmark_json_repair()
@@ -0,0 +1,124 @@
+"""Benchmark adding memories to the LocalCache.
+
+Embeddings are replaced by random vectors so only the storage is measured.
+The previous storage, which rewrote the whole JSON file on every add, is run
+for a smaller number of adds since its cost grows with the size of the memory.
+
+Bulk inserts through add_many and loading the memory on start are measured
+as well.
+
+Usage: python -m benchmark.benchmark_local_cache [adds] [legacy_adds]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import orjson
+
+from autogpt.config import Config
+from autogpt.memory.local import (
+    EMBED_DIM,
+    SAVE_OPTIONS,
+    LocalCache,
+    create_default_embeddings,
+)
+
+ADDS = 100_000
+LEGACY_ADDS = 1_000
+REPORT_EVERY = 10
+ADD_MANY_BLOCK = 1_000
+
+
+def random_embeddings(count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.random((count, EMBED_DIM), dtype=np.float32)
+
+
+def report(name: str, latencies: list, total_bytes: int) -> None:
+    latencies = np.array(latencies)
+    print(
+        f"{name}: {len(latencies)} adds in {latencies.sum():.2f}s"
+        f" ({len(latencies) / latencies.sum():,.0f} adds/s),"
+        f" p50 {np.percentile(latencies, 50) * 1e6:.0f}us,"
+        f" p99 {np.percentile(latencies, 99) * 1e6:.0f}us,"
+        f" {total_bytes / 1e6:,.1f} MB on disk"
+    )
+
+
+def benchmark_append_only(adds: int, workspace: Path) -> None:
+    cfg = Config()
+    cfg.workspace_path = str(workspace)
+    if LocalCache in LocalCache._instances:
+        del LocalCache._instances[LocalCache]
+    cache = LocalCache(cfg)
+
+    embeddings_block = random_embeddings(adds)
+    embeddings = iter(embeddings_block)
+    latencies = []
+    with mock.patch(
+        "autogpt.memory.local.get_ada_embedding", side_effect=lambda _: next(embeddings)
+    ):
+        for i in range(adds):
+            start = time.perf_counter()
+            cache.add(f"Command google returned: result number {i}")
+            latencies.append(time.perf_counter() - start)
+            if (i + 1) % (adds // REPORT_EVERY or 1) == 0:
+                print(f"  {i + 1} adds, last add {latencies[-1] * 1e6:.0f}us")
+
+    cache.storage.close()
+    total_bytes = sum(f.stat().st_size for f in workspace.glob(f"{cfg.memory_index}.*"))
+    report("append-only storage", latencies, total_bytes)
+
+    del LocalCache._instances[LocalCache]
+    cfg.wipe_local_memory_on_start = False
+    start = time.perf_counter()
+    cache = LocalCache(cfg)
+    print(
+        f"load on start: {cache.get_stats()[0]} memories mapped in"
+        f" {(time.perf_counter() - start) * 1e3:.1f}ms"
+    )
+    cfg.wipe_local_memory_on_start = True
+
+    cache.clear()
+    texts = [f"Command google returned: result number {i}" for i in range(adds)]
+    start = time.perf_counter()
+    for i in range(0, adds, ADD_MANY_BLOCK):
+        cache.add_many(
+            texts[i : i + ADD_MANY_BLOCK], embeddings_block[i : i + ADD_MANY_BLOCK]
+        )
+    elapsed = time.perf_counter() - start
+    cache.storage.close()
+    print(
+        f"add_many in blocks of {ADD_MANY_BLOCK}: {adds} adds in {elapsed:.2f}s"
+        f" ({adds / elapsed:,.0f} adds/s)"
+    )
+
+
+def benchmark_legacy(adds: int, workspace: Path) -> None:
+    filename = workspace / "legacy.json"
+    texts, matrix = [], create_default_embeddings()
+    embeddings = random_embeddings(adds)
+    latencies = []
+    for i in range(adds):
+        start = time.perf_counter()
+        texts.append(f"Command google returned: result number {i}")
+        matrix = np.concatenate([matrix, embeddings[i : i + 1]])
+        with open(filename, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {"texts": texts, "embeddings": matrix}, option=SAVE_OPTIONS
+                )
+            )
+        latencies.append(time.perf_counter() - start)
+    report("legacy JSON rewrite", latencies, filename.stat().st_size)
+
+
+if __name__ == "__main__":
+    adds = int(sys.argv[1]) if len(sys.argv) > 1 else ADDS
+    legacy_adds = int(sys.argv[2]) if len(sys.argv) > 2 else LEGACY_ADDS
+    with tempfile.TemporaryDirectory() as workspace:
+        benchmark_append_only(adds, Path(workspace))
+        benchmark_legacy(legacy_adds, Path(workspace))
@@ -0,0 +1,110 @@
+"""Benchmark nearest neighbour search over LocalCache embeddings.
+
+Compares the previous full argsort, exact search with argpartition, the IVF
+index at several nprobe settings and quantized embeddings at several re-rank
+factors. Reports query latency, memory use and the recall@k against brute
+force search.
+
+Synthetic clustered, normalised embeddings stand in for real ones, as random
+vectors in 1536 dimensions have no neighbourhood structure to exploit.
+
+Usage: python -m benchmark.benchmark_local_index [memories] [queries]
+"""
+import sys
+import time
+
+import numpy as np
+
+from autogpt.memory.local import EMBED_DIM
+from autogpt.memory.local_index import IVFIndex, exact_search
+from autogpt.memory.local_quantization import ScalarQuantizer
+
+MEMORIES = 100_000
+QUERIES = 200
+CLUSTERS = 1_000
+K = 5
+NPROBES = (1, 4, 8, 16, 32)
+RERANK_FACTORS = (1, 4, 10)
+
+
+def clustered_embeddings(count: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((CLUSTERS, EMBED_DIM), dtype=np.float32)
+    embeddings = centers[rng.integers(CLUSTERS, size=count)]
+    embeddings += 0.5 * rng.standard_normal((count, EMBED_DIM), dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings
+
+
+def time_queries(search, queries: np.ndarray) -> tuple:
+    results, start = [], time.perf_counter()
+    for query in queries:
+        results.append(search(query))
+    elapsed_ms = (time.perf_counter() - start) / len(queries) * 1e3
+    return results, elapsed_ms
+
+
+def recall(results: list, expected: list) -> float:
+    hits = sum(
+        len(set(result.tolist()) & set(truth.tolist()))
+        for result, truth in zip(results, expected)
+    )
+    return hits / (K * len(expected))
+
+
+def benchmark_local_index(memories: int, queries: int) -> None:
+    rng = np.random.default_rng(0)
+    embeddings = clustered_embeddings(memories, rng)
+    # Queries close to, but not equal to, stored memories
+    query_vectors = embeddings[rng.choice(memories, queries, replace=False)]
+    query_vectors = query_vectors + 0.1 * rng.standard_normal(
+        query_vectors.shape, dtype=np.float32
+    )
+
+    _, argsort_ms = time_queries(
+        lambda q: np.argsort(np.dot(embeddings, q))[-K:][::-1], query_vectors
+    )
+    print(f"full argsort: {argsort_ms:.2f}ms/query")
+    expected, exact_ms = time_queries(
+        lambda q: exact_search(embeddings, q, K), query_vectors
+    )
+    print(
+        f"exact argpartition: {exact_ms:.2f}ms/query,"
+        f" {embeddings.nbytes / 1e6:,.0f} MB of float32 embeddings"
+    )
+
+    index = IVFIndex()
+    start = time.perf_counter()
+    index.train(embeddings)
+    print(
+        f"IVF training on {memories} memories: {time.perf_counter() - start:.1f}s,"
+        f" {len(index.centroids)} lists"
+    )
+    for nprobe in NPROBES:
+        index.nprobe = nprobe
+        results, ivf_ms = time_queries(
+            lambda q: index.search(embeddings, q, K), query_vectors
+        )
+        print(
+            f"IVF nprobe={nprobe}: {ivf_ms:.2f}ms/query,"
+            f" recall@{K} {recall(results, expected):.3f}"
+        )
+
+    for mode in ("float16", "int8"):
+        quantizer = ScalarQuantizer(mode)
+        quantizer.update(embeddings)
+        for rerank_factor in RERANK_FACTORS:
+            quantizer.rerank_factor = rerank_factor
+            results, quantized_ms = time_queries(
+                lambda q: quantizer.search(embeddings, q, K), query_vectors
+            )
+            print(
+                f"{mode} rerank_factor={rerank_factor}: {quantized_ms:.2f}ms/query,"
+                f" recall@{K} {recall(results, expected):.3f},"
+                f" {quantizer.nbytes / 1e6:,.0f} MB of codes"
+            )
+
+
+if __name__ == "__main__":
+    memories = int(sys.argv[1]) if len(sys.argv) > 1 else MEMORIES
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else QUERIES
+    benchmark_local_index(memories, queries)
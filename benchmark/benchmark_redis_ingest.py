@@ -0,0 +1,55 @@
+"""Benchmark writing memories to Redis one by one and in bulk.
+
+Needs a Redis Stack server configured as in .env. Embeddings are replaced by
+random vectors so only the writes are measured. The memory index is wiped.
+
+Usage: python -m benchmark.benchmark_redis_ingest [adds] [single_adds]
+"""
+import sys
+import time
+from unittest import mock
+
+import numpy as np
+
+from autogpt.config import Config
+from autogpt.memory.redismem import RedisMemory
+
+ADDS = 100_000
+SINGLE_ADDS = 1_000
+DIM = 1536
+
+
+def random_embeddings(count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.random((count, DIM), dtype=np.float32)
+
+
+def main() -> None:
+    adds = int(sys.argv[1]) if len(sys.argv) > 1 else ADDS
+    single_adds = int(sys.argv[2]) if len(sys.argv) > 2 else SINGLE_ADDS
+    cfg = Config()
+    cfg.wipe_redis_on_start = True
+    memory = RedisMemory(cfg)
+
+    embeddings = random_embeddings(single_adds)
+    with mock.patch(
+        "autogpt.memory.redismem.get_ada_embedding", side_effect=list(embeddings)
+    ):
+        start = time.monotonic()
+        for i in range(single_adds):
+            memory.add(f"memory {i}")
+        elapsed = time.monotonic() - start
+    print(f"add: {single_adds} adds in {elapsed:.2f}s ({single_adds / elapsed:,.0f}/s)")
+
+    memory.clear()
+    texts = [f"memory {i}" for i in range(adds)]
+    stats = memory.ingest(texts, random_embeddings(adds))
+    print(
+        f"ingest: {stats.count} adds in {stats.write_time:.2f}s"
+        f" ({stats.throughput:,.0f}/s)"
+    )
+    memory.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the regex sentence segmenter against the spaCy one.
+
+Measures the throughput of both segmenters, and how often the regex segmenter
+ends sentences where spaCy does: the precision, recall and F1 score of its
+sentence ends, taking spaCy as the reference.
+
+The filing is read from a text file if one is given, otherwise a 200 page
+filing is generated as in benchmark_split_text. Needs the spaCy model set in
+BROWSE_SPACY_LANGUAGE_MODEL; without it only the regex segmenter is measured.
+
+Usage: python -m benchmark.benchmark_sentence_segmenter [filing.txt]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import List, Set
+
+from autogpt.config import Config
+from autogpt.processing.sentences import (
+    RegexSegmenter,
+    SentenceSegmenter,
+    SpacySegmenter,
+)
+from benchmark.benchmark_split_text import PAGES, generate_filing
+
+CFG = Config()
+
+
+def sentence_ends(text: str, sentences: List[str]) -> Set[int]:
+    """Get the offsets in text at which the sentences end"""
+    ends = set()
+    position = 0
+    for sentence in sentences:
+        position = text.index(sentence, position) + len(sentence)
+        ends.add(position)
+    return ends
+
+
+def run(name: str, segmenter: SentenceSegmenter, text: str) -> List[str]:
+    start = time.monotonic()
+    sentences = segmenter.split(text)
+    elapsed = time.monotonic() - start
+    print(
+        f"{name}: {len(text):,} characters in {len(sentences):,} sentences,"
+        f" {elapsed:.2f}s ({len(text) / elapsed / 1e3:,.0f}k characters/s)"
+    )
+    return sentences
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        text = Path(sys.argv[1]).read_text()
+    else:
+        text = generate_filing(PAGES)
+
+    regex_sentences = run("regex", RegexSegmenter(), text)
+
+    try:
+        start = time.monotonic()
+        spacy_segmenter = SpacySegmenter(CFG.browse_spacy_language_model)
+    except OSError as e:
+        print(f"Skipping spaCy: {e}")
+        return
+    print(f"Loading the spaCy pipeline: {time.monotonic() - start:.2f}s, once")
+    spacy_sentences = run("spacy", spacy_segmenter, text)
+
+    regex_ends = sentence_ends(text, regex_sentences)
+    spacy_ends = sentence_ends(text, spacy_sentences)
+    agreed = len(regex_ends & spacy_ends)
+    precision = agreed / len(regex_ends) if regex_ends else 0.0
+    recall = agreed / len(spacy_ends) if spacy_ends else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if agreed else 0.0
+    print(
+        f"Boundary agreement with spaCy: precision {precision:.3f},"
+        f" recall {recall:.3f}, F1 {f1:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
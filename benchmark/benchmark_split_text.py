@@ -0,0 +1,107 @@
+"""Benchmark splitting a long filing into chunks for summarization.
+
+Compares split_text with the previous implementation, which loaded the spaCy
+pipeline on every call and re-counted the tokens of the whole chunk for every
+sentence. The previous implementation is run on fewer pages since its cost
+grows with the square of the chunk length.
+
+The filing is read from a text file if one is given, otherwise a 200 page
+filing is generated from boilerplate 10-K paragraphs. Needs the spaCy model and
+the tiktoken encodings, which are downloaded on first use.
+
+Usage: python -m benchmark.benchmark_split_text [filing.txt] [legacy_pages]
+"""
+import sys
+import time
+from pathlib import Path
+
+import spacy
+
+from autogpt.config import Config
+from autogpt.llm import count_message_tokens
+from autogpt.processing.sentences import get_sentence_segmenter
+from autogpt.processing.text import create_message, split_text
+
+PAGES = 200
+CHARS_PER_PAGE = 3_000
+LEGACY_PAGES = 20
+
+PARAGRAPHS = [
+    "The Company designs, manufactures and markets smartphones, personal"
+    " computers, tablets, wearables and accessories, and sells a variety of"
+    " related services. Net sales increased 8% or $29.3 billion during 2022"
+    " compared to 2021.",
+    "Item 1A. Risk Factors. The Company's business, reputation, results of"
+    " operations, financial condition and stock price can be affected by a"
+    " number of factors, whether currently known or unknown, including those"
+    " described below.",
+    "As of September 24, 2022, the Company had $48.3 billion of cash, cash"
+    " equivalents and restricted cash, e.g. money market funds and U.S."
+    " Treasury securities, and $120.8 billion of marketable securities.",
+    'See Note 4, "Financial Instruments" of the Notes to Consolidated'
+    " Financial Statements in Part II, Item 8 of this Form 10-K for more"
+    " information.",
+]
+
+CFG = Config()
+
+
+def generate_filing(pages: int) -> str:
+    paragraphs = []
+    length = 0
+    while length < pages * CHARS_PER_PAGE:
+        paragraph = PARAGRAPHS[len(paragraphs) % len(PARAGRAPHS)]
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 1
+    return "\n".join(paragraphs)
+
+
+def legacy_split_text(text: str, max_length: int, model: str, question: str = ""):
+    flattened_paragraphs = " ".join(text.split("\n"))
+    nlp = spacy.load(CFG.browse_spacy_language_model)
+    nlp.add_pipe("sentencizer")
+    doc = nlp(flattened_paragraphs)
+    sentences = [sent.text.strip() for sent in doc.sents]
+
+    current_chunk = []
+    for sentence in sentences:
+        message = [create_message(" ".join(current_chunk) + " " + sentence, question)]
+        if count_message_tokens(messages=message, model=model) + 1 <= max_length:
+            current_chunk.append(sentence)
+        else:
+            yield " ".join(current_chunk)
+            current_chunk = [sentence]
+    if current_chunk:
+        yield " ".join(current_chunk)
+
+
+def run(name: str, split, text: str) -> list:
+    start = time.monotonic()
+    chunks = list(split(text, CFG.browse_chunk_max_length, CFG.fast_llm_model))
+    elapsed = time.monotonic() - start
+    print(
+        f"{name}: {len(text):,} characters in {len(chunks)} chunks,"
+        f" {elapsed:.2f}s ({len(text) / elapsed / 1e3:,.0f}k characters/s)"
+    )
+    return chunks
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        text = Path(sys.argv[1]).read_text()
+    else:
+        text = generate_filing(PAGES)
+    legacy_pages = int(sys.argv[2]) if len(sys.argv) > 2 else LEGACY_PAGES
+    legacy_text = text[: legacy_pages * CHARS_PER_PAGE]
+
+    start = time.monotonic()
+    get_sentence_segmenter("spacy", CFG.browse_spacy_language_model)
+    print(f"Loading the spaCy pipeline: {time.monotonic() - start:.2f}s, once")
+
+    run("split_text", split_text, text)
+    run("split_text", split_text, legacy_text)
+    run("legacy split_text", legacy_split_text, legacy_text)
+
+
+if __name__ == "__main__":
+    main()
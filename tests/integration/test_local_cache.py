@@ -2,11 +2,14 @@
 """Tests for LocalCache class"""
 import unittest
 
+import numpy as np
 import orjson
 import pytest
 
-from autogpt.memory.local import EMBED_DIM, SAVE_OPTIONS
+from autogpt.memory import DedupMemory, get_memory
+from autogpt.memory.local import EMBED_DIM, INITIAL_CAPACITY, SAVE_OPTIONS
 from autogpt.memory.local import LocalCache as LocalCache_
+from autogpt.memory.local_storage import OFFSET_DTYPE, STORAGE_FORMAT
 from tests.utils import requires_api_key
 
 
@@ -24,6 +27,10 @@ def mock_embed_with_ada(mocker):
         "autogpt.memory.local.get_ada_embedding",
         return_value=[0.1] * EMBED_DIM,
     )
+    return mocker.patch(
+        "autogpt.memory.local.get_ada_embeddings",
+        side_effect=lambda texts: [[0.1] * EMBED_DIM] * len(texts),
+    )
 
 
 def test_init_without_backing_file(LocalCache, config, workspace):
@@ -32,7 +39,12 @@ def test_init_without_backing_file(LocalCache, config, workspace):
     assert not cache_file.exists()
     LocalCache(config)
     assert cache_file.exists()
-    assert cache_file.read_text() == "{}"
+    assert orjson.loads(cache_file.read_bytes()) == {
+        "format": STORAGE_FORMAT,
+        "dim": EMBED_DIM,
+        "dtype": "float32",
+    }
+    assert (workspace.root / f"{config.memory_index}.vectors").read_bytes() == b""
 
 
 def test_init_with_backing_empty_file(LocalCache, config, workspace):
@@ -42,7 +54,7 @@ def test_init_with_backing_empty_file(LocalCache, config, workspace):
     assert cache_file.exists()
     LocalCache(config)
     assert cache_file.exists()
-    assert cache_file.read_text() == "{}"
+    assert orjson.loads(cache_file.read_bytes())["format"] == STORAGE_FORMAT
 
 
 def test_init_with_backing_file(LocalCache, config, workspace):
@@ -57,7 +69,7 @@ def test_init_with_backing_file(LocalCache, config, workspace):
     assert cache_file.exists()
     LocalCache(config)
     assert cache_file.exists()
-    assert cache_file.read_text() == "{}"
+    assert orjson.loads(cache_file.read_bytes())["format"] == STORAGE_FORMAT
 
 
 def test_add(LocalCache, config, mock_embed_with_ada):
@@ -67,6 +79,36 @@ def test_add(LocalCache, config, mock_embed_with_ada):
     assert cache.data.embeddings.shape == (1, EMBED_DIM)
 
 
+def test_add_appends_records(LocalCache, config, workspace, mock_embed_with_ada):
+    cache = LocalCache(config)
+    cache.add("first")
+    cache.add("sécond")
+
+    vectors = np.fromfile(
+        workspace.root / f"{config.memory_index}.vectors", dtype=np.float32
+    )
+    assert vectors.shape == (2 * EMBED_DIM,)
+    np.testing.assert_allclose(vectors, 0.1)
+
+    offsets = np.fromfile(
+        workspace.root / f"{config.memory_index}.offsets", dtype=OFFSET_DTYPE
+    )
+    assert offsets.tolist() == [len(b"first"), len("firstsécond".encode("utf-8"))]
+    texts = (workspace.root / f"{config.memory_index}.texts").read_bytes()
+    assert texts.decode("utf-8") == "firstsécond"
+
+
+def test_add_with_fsync(LocalCache, config, mocker, mock_embed_with_ada):
+    mocker.patch.object(config, "local_memory_fsync_every", 2)
+    fsync = mocker.patch("autogpt.memory.local_storage.os.fsync")
+    cache = LocalCache(config)
+
+    cache.add("first")
+    assert fsync.call_count == 0
+    cache.add("second")
+    assert fsync.call_count == 3
+
+
 def test_clear(LocalCache, config, mock_embed_with_ada):
     cache = LocalCache(config)
     assert cache.data.texts == []
@@ -79,6 +121,7 @@ def test_clear(LocalCache, config, mock_embed_with_ada):
     cache.clear()
     assert cache.data.texts == []
     assert cache.data.embeddings.shape == (0, EMBED_DIM)
+    assert cache.storage.vectors_file.read_bytes() == b""
 
 
 def test_get(LocalCache, config, mock_embed_with_ada):
@@ -108,3 +151,288 @@ def test_get_stats(LocalCache, config, mock_embed_with_ada) -> None:
     cache.add(text)
     stats = cache.get_stats()
     assert stats == (1, cache.data.embeddings.shape)
+
+
+def test_add_grows_capacity(LocalCache, config, mock_embed_with_ada) -> None:
+    cache = LocalCache(config)
+    for i in range(INITIAL_CAPACITY + 1):
+        cache.add(f"text {i}")
+
+    assert cache.data.capacity == 2 * INITIAL_CAPACITY
+    assert cache.data.embeddings.shape == (INITIAL_CAPACITY + 1, EMBED_DIM)
+    assert cache.get_stats() == (
+        INITIAL_CAPACITY + 1,
+        (INITIAL_CAPACITY + 1, EMBED_DIM),
+    )
+
+
+def test_add_many(LocalCache, config, mock_embed_with_ada) -> None:
+    cache = LocalCache(config)
+    cache.add("first")
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+
+    added = cache.add_many(["a", "Command Error: b", "c"], embeddings)
+
+    assert added == ["a", "c"]
+    assert cache.data.texts == ["first", "a", "c"]
+    np.testing.assert_array_equal(cache.data.embeddings[1:], embeddings[[0, 2]])
+    vectors = np.fromfile(cache.storage.vectors_file, dtype=np.float32)
+    assert vectors.shape == (3 * EMBED_DIM,)
+
+
+def test_add_many_embeds_in_one_request(
+    LocalCache, config, mock_embed_with_ada
+) -> None:
+    cache = LocalCache(config)
+
+    assert cache.add_many(["a", "Command Error: b", "c"]) == ["a", "c"]
+
+    mock_embed_with_ada.assert_called_once_with(["a", "c"])
+
+
+@pytest.fixture
+def persistent_config(config, mocker):
+    mocker.patch.object(config, "wipe_local_memory_on_start", False)
+    return config
+
+
+def test_load_on_start(LocalCache, persistent_config, mock_embed_with_ada) -> None:
+    cache = LocalCache(persistent_config)
+    cache.clear()
+    cache.add_many(["first", "sécond"], np.eye(2, EMBED_DIM, dtype=np.float32))
+    cache.storage.close()
+    del LocalCache._instances[LocalCache]
+
+    cache = LocalCache(persistent_config)
+    assert cache.data.texts == ["first", "sécond"]
+    assert cache.data.texts[-1] == "sécond"
+    np.testing.assert_array_equal(
+        cache.data.embeddings, np.eye(2, EMBED_DIM, dtype=np.float32)
+    )
+
+    cache.add("third")
+    assert cache.get_stats() == (3, (3, EMBED_DIM))
+    assert cache.data.texts[2] == "third"
+
+
+def test_load_truncates_incomplete_records(
+    LocalCache, persistent_config, mock_embed_with_ada
+) -> None:
+    cache = LocalCache(persistent_config)
+    cache.clear()
+    cache.add("first")
+    cache.storage.close()
+    with cache.storage.texts_file.open("ab") as f:
+        f.write(b"interrupted")
+    del LocalCache._instances[LocalCache]
+
+    cache = LocalCache(persistent_config)
+    assert cache.data.texts == ["first"]
+    assert cache.storage.texts_file.read_bytes() == b"first"
+
+
+def test_load_migrates_json_index(LocalCache, persistent_config, workspace) -> None:
+    cache_file = workspace.root / f"{persistent_config.memory_index}.json"
+    raw_data = {"texts": ["test"], "embeddings": np.ones((1, EMBED_DIM))}
+    cache_file.write_bytes(
+        orjson.dumps(raw_data, option=SAVE_OPTIONS | orjson.OPT_SERIALIZE_NUMPY)
+    )
+
+    cache = LocalCache(persistent_config)
+    assert cache.data.texts == ["test"]
+    assert cache.data.embeddings.shape == (1, EMBED_DIM)
+    assert orjson.loads(cache_file.read_bytes())["format"] == STORAGE_FORMAT
+
+
+def test_get_memory_init_clears_loaded_memory(
+    LocalCache, persistent_config, mock_embed_with_ada
+) -> None:
+    cache = LocalCache(persistent_config)
+    cache.add("first")
+    cache.storage.close()
+    del LocalCache._instances[LocalCache]
+
+    memory = get_memory(persistent_config, init=True)
+    assert memory.get_stats() == (0, (0, EMBED_DIM))
+    assert memory.storage.texts_file.read_bytes() == b""
+
+
+def test_get_relevant_with_ann_index(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "use_local_memory_ann_index", True)
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+    mocker.patch("autogpt.memory.local.get_ada_embedding", return_value=embeddings[1])
+    cache = LocalCache(config)
+    cache.index.min_train_size = 2
+
+    cache.add_many(["a", "b", "c"], embeddings)
+
+    assert cache.get_relevant("b", 1) == ["b"]
+    assert cache.index.size == 3
+
+
+def test_get_relevant_with_quantization(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "local_memory_quantization", "int8")
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+    mocker.patch("autogpt.memory.local.get_ada_embedding", return_value=embeddings[2])
+    cache = LocalCache(config)
+
+    cache.add_many(["a", "b", "c"], embeddings)
+
+    assert cache.get_relevant("c", 2)[0] == "c"
+    assert isinstance(cache.data.buffer, np.memmap)
+    assert cache.get_stats() == (3, (3, EMBED_DIM))
+    assert cache.quantizer.nbytes == 3 * (EMBED_DIM + 4)
+
+
+def test_get_relevant_many(LocalCache, config, mocker) -> None:
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+    get_ada_embeddings = mocker.patch(
+        "autogpt.memory.base.get_ada_embeddings", return_value=embeddings[[2, 0]]
+    )
+    cache = LocalCache(config)
+    cache.add_many(["a", "b", "c"], embeddings)
+
+    relevant = cache.get_relevant_many(["c?", "a?"], 1)
+
+    get_ada_embeddings.assert_called_once_with(["c?", "a?"])
+    assert [memories.query for memories in relevant] == ["c?", "a?"]
+    assert [memories.results for memories in relevant] == [["c"], ["a"]]
+    assert all(memories.search_time >= 0 for memories in relevant)
+
+
+def test_get_relevant_keyword_query_skips_embedding(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "use_local_memory_hybrid_search", True)
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+    get_ada_embedding = mocker.patch("autogpt.memory.local.get_ada_embedding")
+    cache = LocalCache(config)
+    cache.add_many(
+        ["AAPL filed its 10-K", "MSFT earnings call", "Apple revenue grew"],
+        embeddings,
+    )
+
+    assert cache.get_relevant("AAPL 10K", 2) == ["AAPL filed its 10-K"]
+    get_ada_embedding.assert_not_called()
+
+
+def test_get_relevant_hybrid_search(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "use_local_memory_hybrid_search", True)
+    embeddings = np.eye(3, EMBED_DIM, dtype=np.float32)
+    mocker.patch("autogpt.memory.local.get_ada_embedding", return_value=embeddings[2])
+    cache = LocalCache(config)
+    cache.add_many(
+        ["AAPL filed its 10-K", "MSFT earnings call", "Apple revenue grew"],
+        embeddings,
+    )
+
+    # "apple" only matches the vector ranking, "msft" only the keyword ranking
+    results = cache.get_relevant("how did apple and msft do", 2)
+
+    assert sorted(results) == ["Apple revenue grew", "MSFT earnings call"]
+    cache.clear()
+    assert cache.lexical_index.size == 0
+
+
+def test_dedup_skips_texts_loaded_from_disk(
+    LocalCache, persistent_config, mock_embed_with_ada
+) -> None:
+    LocalCache(persistent_config).add_many(["a", "b"])
+    del LocalCache._instances[LocalCache]
+
+    memory = DedupMemory(LocalCache(persistent_config), threshold=0.99)
+
+    assert memory.add_many(["b", "c"], np.eye(2, EMBED_DIM)) == ["c"]
+    assert memory.nearest_similarities([[0.1] * EMBED_DIM]) == pytest.approx([1.0])
+    assert memory.skipped_exact == 1
+
+
+def test_get_memory_init_resets_dedup(
+    LocalCache, persistent_config, mock_embed_with_ada, mocker
+) -> None:
+    mocker.patch.object(persistent_config, "memory_dedup_backends", ["local"])
+    get_memory(persistent_config).add("first")
+
+    memory = get_memory(persistent_config, init=True)
+
+    assert memory.add("first") == "first"
+
+
+def test_dedup_forgets_evicted_texts(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "local_memory_max_entries", 3)
+    embeddings = np.eye(4, EMBED_DIM, dtype=np.float32)
+    cache = LocalCache(config)
+    mocker.patch.object(cache, "_maybe_compact")
+    memory = DedupMemory(cache)
+    memory.add_many(["a", "b", "c", "d"], embeddings)
+
+    assert cache.compact() == 2
+
+    assert memory.add_many(["a", "d"], embeddings[[0, 3]]) == ["a"]
+
+
+def test_compact_evicts_least_recently_retrieved(
+    LocalCache, persistent_config, mocker
+) -> None:
+    mocker.patch.object(persistent_config, "local_memory_max_entries", 3)
+    embeddings = np.eye(4, EMBED_DIM, dtype=np.float32)
+    mocker.patch("autogpt.memory.local.get_ada_embedding", return_value=embeddings[0])
+    cache = LocalCache(persistent_config)
+    mocker.patch.object(cache, "_maybe_compact")
+    cache.add_many(["a", "b", "c", "d"], embeddings)
+    assert cache.get_relevant("a", 1) == ["a"]
+
+    assert cache.compact() == 2
+
+    assert cache.data.texts == ["a", "d"]
+    assert cache.get_stats() == (2, (2, EMBED_DIM))
+    assert cache.get_relevant("a", 1) == ["a"]
+    del LocalCache._instances[LocalCache]
+    assert LocalCache(persistent_config).data.texts == ["a", "d"]
+    assert not (cache.storage.directory / "auto-gpt.compact.json").exists()
+
+
+def test_add_compacts_in_background(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "local_memory_max_entries", 10)
+    mocker.patch.object(config, "use_local_memory_hybrid_search", True)
+    embeddings = np.eye(11, EMBED_DIM, dtype=np.float32)
+    cache = LocalCache(config)
+
+    cache.add_many([f"memory {i}" for i in range(11)], embeddings)
+    cache._compaction.join()
+
+    assert cache.get_stats() == (9, (9, EMBED_DIM))
+    assert cache.data.texts[0] == "memory 2"
+    assert cache.lexical_index.size == 9
+
+
+def test_clear_discards_running_compaction(LocalCache, config, mocker) -> None:
+    mocker.patch.object(config, "local_memory_ttl", 60)
+    embeddings = np.eye(2, EMBED_DIM, dtype=np.float32)
+    cache = LocalCache(config)
+    mocker.patch.object(cache, "_maybe_compact")
+    cache.add_many(["a", "b"], embeddings)
+    cache.eviction.added_at[0] = 0
+    copy_to = cache.storage.copy_to
+
+    def clear_while_copying(*args):
+        copy_to(*args)
+        cache.clear()
+
+    mocker.patch.object(cache.storage, "copy_to", side_effect=clear_while_copying)
+
+    assert cache.compact() == 0
+    assert cache.get_stats() == (0, (0, EMBED_DIM))
+
+
+def test_clear_keeps_maps_of_running_compaction_valid(LocalCache, config) -> None:
+    embeddings = np.eye(2, EMBED_DIM, dtype=np.float32)
+    cache = LocalCache(config)
+    cache.add_many(["a", "b"], embeddings)
+    # A compaction copies from memory maps of the files outside of the lock
+    vectors = cache.storage.map_vectors(2)
+    texts = cache.storage.map_texts(2)
+
+    cache.clear()
+
+    assert vectors[1, 1] == 1
+    assert texts[1] == "b"
+    assert cache.get_stats() == (0, (0, EMBED_DIM))
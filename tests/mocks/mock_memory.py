@@ -0,0 +1,35 @@
+from autogpt.memory.base import MemoryProviderSingleton
+
+
+class ListMemory(MemoryProviderSingleton):
+    """A memory provider that keeps its texts in a list and writes them one by one."""
+
+    def __init__(self):
+        self.texts = []
+        self.batches = []
+
+    def add(self, data):
+        self.texts.append(data)
+        return data
+
+    def get(self, data):
+        return self.get_relevant(data, 1)
+
+    def clear(self):
+        self.texts = []
+        return "Obliviated"
+
+    def get_relevant(self, data, num_relevant=5):
+        return [text for text in self.texts if data in text][:num_relevant]
+
+    def get_stats(self):
+        return len(self.texts)
+
+
+class BatchedListMemory(ListMemory):
+    """A list memory provider that records the batches written with add_many."""
+
+    def add_many(self, data, embeddings=None):
+        self.texts.extend(data)
+        self.batches.append(list(data))
+        return data
@@ -43,3 +43,60 @@ ai_role: A hungry AI
 api_budget: 0.0
 """
     assert config_file.read_text() == yaml_content2
+
+
+def test_system_prompt_is_built_once(mocker):
+    """Test if the system prompt is only rebuilt when the command registry changes."""
+    from autogpt.commands.command import Command, CommandRegistry
+
+    ai_config = AIConfig("McFamished", "A hungry AI", ["Make a sandwich"])
+    ai_config.command_registry = CommandRegistry()
+    construct = mocker.spy(ai_config, "construct_full_prompt")
+
+    first = ai_config.get_system_prompt()
+    second = ai_config.get_system_prompt()
+
+    assert first is second
+    assert construct.call_count == 1
+
+    ai_config.command_registry.register(
+        Command(name="eat", description="Eat a sandwich", method=lambda: None)
+    )
+    third = ai_config.get_system_prompt()
+
+    assert third is not first
+    assert "eat: Eat a sandwich" in third
+    assert construct.call_count == 2
+
+
+def test_system_prompt_is_rebuilt_for_local_commands(mocker, config):
+    """Test if toggling local command execution rebuilds the system prompt."""
+    from autogpt.commands.command import CommandRegistry
+
+    ai_config = AIConfig("McFamished", "A hungry AI", ["Make a sandwich"])
+    ai_config.command_registry = CommandRegistry()
+    mocker.patch.object(config, "execute_local_commands", False)
+    first = ai_config.get_system_prompt()
+
+    mocker.patch.object(config, "execute_local_commands", True)
+    second = ai_config.get_system_prompt()
+
+    assert second is not first
+    assert "The OS you are running on is" in second
+
+
+def test_system_prompt_uses_a_passed_prompt_generator(mocker):
+    """Test if a prompt generator passed in is used even when a prompt is cached."""
+    from autogpt.commands.command import CommandRegistry
+    from autogpt.prompts.generator import PromptGenerator
+
+    ai_config = AIConfig("McFamished", "A hungry AI", ["Make a sandwich"])
+    ai_config.command_registry = CommandRegistry()
+    ai_config.get_system_prompt()
+
+    prompt_generator = PromptGenerator()
+    prompt_generator.add_constraint("Only eat sandwiches")
+    prompt = ai_config.get_system_prompt(prompt_generator)
+
+    assert "Only eat sandwiches" in prompt
+    assert ai_config.prompt_generator is prompt_generator
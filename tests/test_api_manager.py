@@ -1,3 +1,5 @@
+import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -118,3 +120,62 @@ class TestApiManager:
         assert api_manager.get_total_prompt_tokens() == 50
         assert api_manager.get_total_completion_tokens() == 100
         assert api_manager.get_total_cost() == (50 * 0.002 + 100 * 0.002) / 1000
+
+    @staticmethod
+    def test_average_latency():
+        """Test if the average latency is computed over recorded calls."""
+        assert api_manager.get_average_latency("gpt-3.5-turbo") is None
+
+        api_manager.record_latency("gpt-3.5-turbo", 1.0)
+        api_manager.record_latency("gpt-3.5-turbo", 3.0)
+
+        assert api_manager.get_average_latency("gpt-3.5-turbo") == 2.0
+
+    @staticmethod
+    def test_labeled_metrics_and_cycle_breakdown():
+        """Test if calls are recorded per model, call site and status."""
+        api_manager.update_cost(10, 20, "gpt-3.5-turbo", "planning", latency=0.3)
+        api_manager.start_cycle()
+        api_manager.update_cost(5, 5, "gpt-3.5-turbo", "summary", latency=2.0)
+        api_manager.record_error("gpt-3.5-turbo", "summary", 0.05)
+
+        calls = {
+            (c["call_site"], c["status"]): c for c in api_manager.snapshot()["calls"]
+        }
+        assert calls[("planning", "success")]["prompt_tokens"] == 10
+        assert calls[("summary", "success")]["latency_buckets"]["2.5"] == 1
+        assert calls[("summary", "error")]["calls"] == 1
+
+        breakdown = api_manager.get_cycle_breakdown()
+        assert {c["call_site"] for c in breakdown} == {"summary"}
+        assert len(breakdown) == 2
+
+    @staticmethod
+    def test_exports():
+        """Test if metrics can be exported as JSON and Prometheus text."""
+        api_manager.update_cost(10, 20, "gpt-3.5-turbo", "planning", latency=0.3)
+
+        assert json.loads(api_manager.export_json())[0]["calls"] == 1
+        prometheus = api_manager.export_prometheus()
+        assert (
+            'autogpt_llm_calls_total{model="gpt-3.5-turbo",call_site="planning",'
+            'status="success"} 1' in prometheus
+        )
+        assert 'le="+Inf"} 1' in prometheus
+
+    @staticmethod
+    def test_update_cost_is_thread_safe():
+        """Test if concurrent updates do not lose counts."""
+
+        def add_costs():
+            for _ in range(1000):
+                api_manager.update_cost(1, 1, "gpt-3.5-turbo")
+
+        threads = [threading.Thread(target=add_costs) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert api_manager.get_total_prompt_tokens() == 8000
+        assert api_manager.snapshot()["calls"][0]["calls"] == 8000
@@ -0,0 +1,167 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+from autogpt.commands import web_selenium
+from autogpt.commands.browser_pool import BrowserPool
+
+
+def make_driver():
+    driver = MagicMock()
+    driver.window_handles = ["main"]
+    del driver.execute_cdp_cmd
+    return driver
+
+
+@pytest.fixture
+def pool():
+    pool = BrowserPool(MagicMock(side_effect=make_driver), size=1, max_pages=3)
+    yield pool
+    pool.shutdown()
+
+
+def wait_for_warm_up(pool):
+    if pool._warming is not None:
+        pool._warming.join()
+
+
+def test_driver_is_reused_and_reset(pool):
+    driver = pool.acquire()
+    pool.release(driver)
+
+    assert pool.acquire() is driver
+    assert pool.created == 1
+    driver.delete_all_cookies.assert_called_once()
+    driver.get.assert_called_with("about:blank")
+    driver.quit.assert_not_called()
+
+
+def test_chromium_cookies_are_cleared_for_all_sites(pool):
+    driver = MagicMock()
+    driver.window_handles = ["main", "popup"]
+    pool.create_driver.side_effect = None
+    pool.create_driver.return_value = driver
+
+    pool.release(pool.acquire())
+
+    driver.execute_cdp_cmd.assert_called_once_with("Network.clearBrowserCookies", {})
+    driver.close.assert_called_once()
+    driver.switch_to.window.assert_called_with("main")
+
+
+def test_driver_is_recycled_after_max_pages(pool):
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.release(pool.acquire())
+    pool.release(pool.acquire())
+    wait_for_warm_up(pool)
+
+    driver.quit.assert_called_once()
+    assert pool.recycled == 1
+    # The replacement was started in the background
+    assert pool.created == 2
+    assert pool.acquire() is not driver
+    assert pool.created == 2
+
+
+def test_driver_that_fails_to_reset_is_replaced(pool):
+    driver = pool.acquire()
+    driver.get.side_effect = WebDriverException("chrome not reachable")
+
+    pool.release(driver)
+    wait_for_warm_up(pool)
+
+    driver.quit.assert_called_once()
+    assert pool.acquire() is not driver
+
+
+def test_driver_with_dead_chromedriver_frees_its_slot(pool):
+    driver = pool.acquire()
+    driver.get.side_effect = MaxRetryError(None, "http://localhost:9515")
+    pool._warming = MagicMock()
+
+    pool.release(driver)
+
+    driver.quit.assert_called_once()
+    assert pool.acquire(timeout=0.01) is not driver
+
+
+def test_dead_idle_driver_is_replaced(pool):
+    driver = pool.acquire()
+    pool.release(driver)
+    type(driver).window_handles = property(
+        lambda self: (_ for _ in ()).throw(MaxRetryError(None, "http://localhost"))
+    )
+
+    assert pool.acquire() is not driver
+    driver.quit.assert_called_once()
+
+
+def test_acquire_waits_for_a_free_driver(pool):
+    pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+
+def test_failed_start_frees_its_slot(pool):
+    pool.create_driver.side_effect = WebDriverException("no chrome")
+    with pytest.raises(WebDriverException):
+        pool.acquire()
+
+    pool.create_driver.side_effect = make_driver
+    assert pool.acquire(timeout=0.01)
+
+
+def test_shutdown_quits_all_drivers(pool):
+    idle = pool.acquire()
+    pool.release(idle)
+    in_use = pool.acquire()
+
+    pool.shutdown()
+    idle.quit.assert_not_called()
+    pool.release(in_use)
+
+    in_use.quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_browse_website_returns_browser_to_pool(mocker):
+    driver = make_driver()
+    driver.execute_script.return_value = "<body><p>Revenue rose.</p></body>"
+    pool = BrowserPool(MagicMock(return_value=driver), size=1, max_pages=0)
+    mocker.patch.object(web_selenium, "_browser_pool", pool)
+    mocker.patch.object(web_selenium, "WebDriverWait")
+    mocker.patch.object(web_selenium.CFG, "browser_pool_size", 1)
+    summarize = mocker.patch.object(
+        web_selenium.summary, "summarize_text", side_effect=RuntimeError
+    )
+
+    with pytest.raises(RuntimeError):
+        web_selenium.browse_website("https://example.com", "revenue?")
+    summarize.side_effect = None
+    summarize.return_value = "It rose."
+    result = web_selenium.browse_website("https://example.com", "revenue?")
+
+    assert "It rose." in result
+    assert pool.created == 1
+    driver.quit.assert_not_called()
+    pool.shutdown()
+
+
+def test_failed_scrape_returns_browser_to_pool(mocker):
+    driver = make_driver()
+    pool = BrowserPool(MagicMock(return_value=driver), size=1, max_pages=0)
+    mocker.patch.object(web_selenium, "_browser_pool", pool)
+    mocker.patch.object(web_selenium, "WebDriverWait")
+    mocker.patch.object(web_selenium.CFG, "browser_pool_size", 1)
+    mocker.patch.object(web_selenium, "extract_page", side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        web_selenium.scrape_page_with_selenium("https://example.com")
+
+    assert pool.acquire(timeout=0.01) is driver
+    pool.shutdown()
@@ -76,3 +76,18 @@ def test_generate_context_valid_inputs():
     assert result[1] >= 0
     assert len(result[3]) >= 2  # current_context should have at least 2 messages
     assert result[1] <= 2048  # token limit for GPT-3.5-turbo-0301 is 2048 tokens
+
+
+def test_generate_context_system_prompt_token_count(mocker):
+    """Test that a prebuilt SystemPrompt gives the same count as a plain string, using its cached count."""
+    from autogpt.prompts.system_prompt import SystemPrompt
+
+    mocker.patch("time.strftime", return_value="Sat Apr 15 00:00:00 2023")
+    model = "gpt-3.5-turbo-0301"
+    prompt = SystemPrompt("You are a helpful assistant with a long system prompt.")
+
+    expected = generate_context(str(prompt), "", [], model)
+    result = generate_context(prompt, "", [], model)
+
+    assert result[1] == expected[1]
+    assert prompt._token_counts == {model: prompt.count_tokens(model)}
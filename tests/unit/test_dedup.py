@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+
+from autogpt.memory.dedup import DedupMemory, content_hash
+from tests.mocks.mock_memory import BatchedListMemory, ListMemory
+
+EMBEDDINGS = {
+    "apple revenue grew": [1.0, 0.0, 0.0],
+    "Apple revenue grew!": [0.99, 0.1, 0.0],
+    "msft earnings call": [0.0, 1.0, 0.0],
+}
+
+
+class ScoredListMemory(BatchedListMemory):
+    def nearest_similarities(self, embeddings):
+        if not self.texts:
+            return [0.0] * len(embeddings)
+        stored = np.array([EMBEDDINGS[text] for text in self.texts])
+        return [float((stored @ np.array(e)).max()) for e in embeddings]
+
+
+class EvictingListMemory(BatchedListMemory):
+    generation = 0
+
+    def stored_texts(self):
+        return self.texts
+
+
+@pytest.fixture
+def mock_get_ada_embeddings(mocker):
+    return mocker.patch(
+        "autogpt.memory.dedup.get_ada_embeddings",
+        side_effect=lambda texts: [EMBEDDINGS[text] for text in texts],
+    )
+
+
+def make_memory(cls):
+    cls._instances.pop(cls, None)
+    return cls()
+
+
+def test_content_hash_ignores_whitespace():
+    assert content_hash("a  b\n") == content_hash("a b")
+    assert content_hash("a b") != content_hash("a c")
+
+
+def test_add_skips_exact_duplicates():
+    memory = DedupMemory(make_memory(ListMemory))
+
+    assert memory.add("a") == "a"
+    assert memory.add(" a ") == ""
+    assert memory.add_many(["b", "a", "b"]) == ["b"]
+
+    assert memory.memory.texts == ["a", "b"]
+    assert memory.skipped_exact == 3
+    assert memory.skipped == 3
+
+
+def test_exact_duplicates_are_not_embedded(mock_get_ada_embeddings):
+    memory = DedupMemory(make_memory(ScoredListMemory), threshold=0.95)
+    memory.add("apple revenue grew")
+
+    assert memory.add("apple revenue grew") == ""
+    mock_get_ada_embeddings.assert_called_once_with(["apple revenue grew"])
+
+
+def test_add_many_skips_near_duplicates(mock_get_ada_embeddings):
+    memory = DedupMemory(make_memory(ScoredListMemory), threshold=0.95)
+
+    added = memory.add_many(
+        ["apple revenue grew", "Apple revenue grew!", "msft earnings call"]
+    )
+
+    assert added == ["apple revenue grew", "msft earnings call"]
+    assert memory.add("Apple revenue grew!") == ""
+    assert memory.skipped_similar == 2
+    assert memory.skipped_exact == 0
+
+
+def test_threshold_needs_similarity_support():
+    memory = DedupMemory(make_memory(ListMemory), threshold=0.95)
+
+    assert memory.threshold == 0
+
+
+def test_clear_forgets_hashes():
+    memory = DedupMemory(make_memory(ListMemory))
+    memory.add("a")
+
+    memory.clear()
+
+    assert memory.add("a") == "a"
+
+
+def test_only_new_texts_reach_the_provider():
+    memory = DedupMemory(make_memory(BatchedListMemory))
+
+    memory.add_many(["a", "b"])
+    memory.add_many(["b", "c"])
+
+    # The provider embeds the texts it is given, so duplicates are never embedded
+    assert memory.memory.batches == [["a", "b"], ["c"]]
+
+
+def test_hashes_are_read_again_when_provider_evicts():
+    inner = make_memory(EvictingListMemory)
+    memory = DedupMemory(inner)
+    memory.add_many(["a", "b"])
+
+    inner.texts.remove("a")
+    inner.generation += 1
+
+    assert memory.add_many(["a", "b"]) == ["a"]
+
+
+def test_failed_add_can_be_retried(mocker):
+    memory = DedupMemory(make_memory(ListMemory))
+    mocker.patch.object(memory.memory, "add", side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        memory.add("a")
+
+    mocker.stopall()
+
+    assert memory.add("a") == "a"
+    assert memory.memory.texts == ["a"]
+
+
+def test_failed_add_many_can_be_retried(mocker):
+    memory = DedupMemory(make_memory(BatchedListMemory))
+    mocker.patch.object(memory.memory, "add_many", side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        memory.add_many(["a", "b"])
+
+    mocker.stopall()
+
+    assert memory.add_many(["a", "b"]) == ["a", "b"]
+
+
+def test_texts_dropped_by_the_provider_are_not_claimed(mocker):
+    memory = DedupMemory(make_memory(BatchedListMemory))
+    mocker.patch.object(memory.memory, "add_many", return_value=["a"])
+    assert memory.add_many(["a", "Command Error: b"]) == ["a"]
+
+    mocker.stopall()
+
+    assert memory.add_many(["a", "Command Error: b"]) == ["Command Error: b"]
+
+
+def test_wrap_reuses_deduplicator():
+    inner = make_memory(ListMemory)
+
+    assert DedupMemory.wrap(inner, 0) is DedupMemory.wrap(inner, 0)
@@ -266,16 +266,25 @@ def test_list_files(workspace: Workspace, test_directory: Path):
     with open(os.path.join(test_directory, file_a.name), "w") as f:
         f.write("This is file A in the subdirectory.")
 
+    # Files in hidden directories, like caches, are not listed
+    hidden_directory = workspace.get_path(".cache")
+    os.makedirs(hidden_directory)
+    with open(hidden_directory / "page.json", "w") as f:
+        f.write("{}")
+
     files = file_ops.list_files(str(workspace.root))
     assert file_a.name in files
     assert file_b.name in files
     assert os.path.join(Path(test_directory).name, file_a.name) in files
+    assert os.path.join(".cache", "page.json") not in files
 
     # Clean up
     os.remove(file_a)
     os.remove(file_b)
     os.remove(os.path.join(test_directory, file_a.name))
     os.rmdir(test_directory)
+    os.remove(hidden_directory / "page.json")
+    os.rmdir(hidden_directory)
 
     # Case 2: Search for a file that does not exist and make sure we don't throw
     non_existent_file = "non_existent_file.txt"
@@ -0,0 +1,84 @@
+import pytest
+
+from autogpt.processing import html
+from autogpt.processing.html import PageContent, extract_page
+
+PAGE = """
+<html>
+    <head><title>Apple 10-K</title><style>p { color: blue; }</style></head>
+    <body>
+        <nav><a href="/">Home</a> <a href="/markets">Markets</a></nav>
+        <div class="cookie-banner">We use cookies.</div>
+        <main>
+            <h1>Annual report</h1>
+            <!-- generated -->
+            <p>Net sales rose to <b>$394.3B</b>.</p>
+            <script>track();</script>
+            <p>See <a href="notes.html">the notes</a>  for details.</p>
+        </main>
+        <div role="complementary">Related articles</div>
+        <footer>Copyright 2023</footer>
+    </body>
+</html>
+"""
+
+PARSERS = ["lxml", "html.parser"]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_extract_page(parser):
+    page = extract_page(PAGE, "https://example.com/aapl/", parser)
+
+    assert page.text == "\n".join(
+        [
+            "Apple 10-K",
+            "Home Markets",
+            "We use cookies.",
+            "Annual report",
+            "Net sales rose to $394.3B.",
+            "See the notes",
+            "for details.",
+            "Related articles",
+            "Copyright 2023",
+        ]
+    )
+    assert page.links == [
+        ("Home", "https://example.com/"),
+        ("Markets", "https://example.com/markets"),
+        ("the notes", "https://example.com/aapl/notes.html"),
+    ]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_extract_page_without_boilerplate(parser):
+    page = extract_page(PAGE, "https://example.com/aapl/", parser, True)
+
+    assert page.text == "\n".join(
+        [
+            "Apple 10-K",
+            "Annual report",
+            "Net sales rose to $394.3B.",
+            "See the notes",
+            "for details.",
+        ]
+    )
+    # Links are taken from the whole page
+    assert len(page.links) == 3
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_extract_empty_page(parser):
+    assert extract_page("", "https://example.com", parser) == PageContent()
+
+
+def test_extract_page_with_unknown_parser():
+    with pytest.raises(ValueError):
+        extract_page(PAGE, "https://example.com", "html5lib")
+
+
+def test_selectolax_falls_back_to_lxml(mocker):
+    mocker.patch.object(html, "SelectolaxParser", None)
+
+    page = extract_page(PAGE, "https://example.com/aapl/", "selectolax")
+
+    assert page == extract_page(PAGE, "https://example.com/aapl/", "lxml")
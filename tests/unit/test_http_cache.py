@@ -0,0 +1,199 @@
+from email.utils import formatdate
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from autogpt.commands import web_requests
+from autogpt.url_utils.http_cache import (
+    DEFAULT_CACHE_DIR,
+    CacheEntry,
+    CachingHTTPAdapter,
+    DiskCacheStore,
+    parse_cache_control,
+)
+
+URL = "https://example.com/quote"
+
+
+def make_response(request, status=200, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    return response
+
+
+@pytest.fixture
+def server(mocker):
+    """Replaces the network, answering with the next queued response"""
+    responses = []
+    requests_sent = []
+
+    def send(adapter, request, **kwargs):
+        requests_sent.append(request)
+        status, body, headers = responses.pop(0)
+        return make_response(request, status, body, headers)
+
+    mocker.patch.object(HTTPAdapter, "send", autospec=True, side_effect=send)
+    return responses, requests_sent
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = requests.Session()
+    adapter = CachingHTTPAdapter(DiskCacheStore(tmp_path, max_entries=2))
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('max-age=60, No-Cache, private="Set-Cookie"') == {
+        "max-age": "60",
+        "no-cache": None,
+        "private": "Set-Cookie",
+    }
+
+
+def test_fresh_response_is_served_from_cache(server, session):
+    responses, requests_sent = server
+    session, adapter = session
+    responses.append((200, b"<p>AAPL</p>", {"Cache-Control": "max-age=60"}))
+
+    first = session.get(URL)
+    second = session.get(URL + "#news")
+
+    assert second.text == first.text == "<p>AAPL</p>"
+    assert len(requests_sent) == 1
+    assert (adapter.hits, adapter.misses) == (1, 1)
+
+
+def test_stale_response_is_revalidated(server, session):
+    responses, requests_sent = server
+    session, adapter = session
+    responses.append(
+        (200, b"<p>AAPL</p>", {"ETag": '"v1"', "Cache-Control": "no-cache"})
+    )
+    responses.append((304, b"", {"ETag": '"v1"', "X-Served": "again"}))
+
+    session.get(URL)
+    revalidated = session.get(URL)
+
+    assert revalidated.status_code == 200
+    assert revalidated.text == "<p>AAPL</p>"
+    assert revalidated.headers["X-Served"] == "again"
+    assert requests_sent[1].headers["If-None-Match"] == '"v1"'
+    assert adapter.revalidations == 1
+
+
+def test_changed_response_replaces_the_cached_one(server, session):
+    responses, requests_sent = server
+    session, _ = session
+    last_modified = formatdate(0, usegmt=True)
+    responses.append((200, b"old", {"Last-Modified": last_modified, "Expires": "0"}))
+    responses.append((200, b"new", {"Last-Modified": formatdate(usegmt=True)}))
+
+    session.get(URL)
+
+    assert session.get(URL).text == "new"
+    assert requests_sent[1].headers["If-Modified-Since"] == last_modified
+
+
+def test_uncacheable_responses_are_not_stored(server, session):
+    responses, requests_sent = server
+    session, _ = session
+    responses.append((200, b"a", {"Cache-Control": "no-store, max-age=60"}))
+    responses.append((200, b"b", {}))
+    responses.append((500, b"c", {"Cache-Control": "max-age=60"}))
+    responses.append((500, b"d", {"Cache-Control": "max-age=60"}))
+
+    assert [session.get(URL).text for _ in range(4)] == ["a", "b", "c", "d"]
+
+
+def test_request_no_cache_and_vary(server, session):
+    responses, requests_sent = server
+    session, _ = session
+    headers = {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}
+    responses.extend([(200, b"en", headers), (200, b"fresh", headers)])
+    responses.append((200, b"fr", headers))
+
+    session.get(URL, headers={"Accept-Language": "en"})
+    forced = session.get(
+        URL, headers={"Accept-Language": "en", "Cache-Control": "no-cache"}
+    )
+    other_language = session.get(URL, headers={"Accept-Language": "fr"})
+
+    assert (forced.text, other_language.text) == ("fresh", "fr")
+    assert len(requests_sent) == 3
+
+
+def test_unsafe_request_invalidates(server, session, tmp_path):
+    responses, requests_sent = server
+    session, _ = session
+    responses.append((200, b"v1", {"Cache-Control": "max-age=60"}))
+    responses.append((201, b"", {}))
+    responses.append((200, b"v2", {"Cache-Control": "max-age=60"}))
+
+    session.get(URL)
+    session.post(URL, data="update")
+
+    assert session.get(URL).text == "v2"
+
+
+def test_store_keeps_max_entries(tmp_path):
+    store = DiskCacheStore(tmp_path, max_entries=2)
+    for key in ("a", "b", "c"):
+        store.set(key, CacheEntry(URL, 200, "OK", {}, 0, body=key.encode()))
+
+    assert store.get("a") is None
+    assert store.get("c").body == b"c"
+    assert len(list(tmp_path.glob("*.body"))) == 2
+
+
+def test_store_is_kept_outside_the_workspace(mocker, workspace):
+    mocker.patch.object(web_requests.CFG, "http_cache_dir", "")
+
+    directory = DiskCacheStore().directory
+
+    assert directory == DEFAULT_CACHE_DIR
+    assert workspace.root not in directory.parents
+    mocker.patch.object(web_requests.CFG, "http_cache_dir", "/tmp/pages")
+    assert DiskCacheStore().directory == Path("/tmp/pages")
+
+
+def test_freshness_lifetime():
+    date = formatdate(1_000_000, usegmt=True)
+    entry = CacheEntry(URL, 200, "OK", {"Date": date}, 1_000_000)
+
+    assert entry.freshness_lifetime() == 0
+    entry.headers["Last-Modified"] = formatdate(0, usegmt=True)
+    assert entry.freshness_lifetime() == 24 * 3600
+    entry.headers["Expires"] = formatdate(1_000_100, usegmt=True)
+    assert entry.freshness_lifetime() == 100
+    entry.headers["Cache-Control"] = "max-age=10"
+    assert entry.freshness_lifetime() == 10
+    assert entry.is_fresh(1_000_005) and not entry.is_fresh(1_000_005, max_age=1)
+
+
+def test_page_is_fetched_once_per_cycle(mocker):
+    response = mocker.Mock(status_code=200, text="<a href='/aapl'>AAPL</a> quote")
+    get = mocker.patch("requests.Session.get", return_value=response)
+    mocker.patch.object(web_requests, "_cycle_pages", None)
+
+    web_requests.scrape_text(URL)
+    web_requests.scrape_links(URL)
+    assert get.call_count == 2
+
+    web_requests.start_cycle()
+    assert web_requests.scrape_text(URL) == "AAPL quote"
+    assert web_requests.scrape_links(URL) == ["AAPL (https://example.com/aapl)"]
+    assert get.call_count == 3
+
+    web_requests.start_cycle()
+    web_requests.scrape_links(URL)
+    assert get.call_count == 4
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from autogpt.json_utils.json_fix_llm import fix_json_using_multiple_techniques
+from autogpt.json_utils.json_fix_tolerant import parse_tolerant_json
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        ('{"a": 1, "b": [1, 2,],}', {"a": 1, "b": [1, 2]}),
+        ('```json\n{"a": {"b": "c"}}\n```', {"a": {"b": "c"}}),
+        ('Here is my reply:\n{"a": 1}\nThanks!', {"a": 1}),
+        ('{"text": "He said "hi", then left"}', {"text": 'He said "hi", then left'}),
+        ('{"text": "truncated repl', {"text": "truncated repl"}),
+        ('{"a": {"b": [1, {"c": "d"', {"a": {"b": [1, {"c": "d"}]}}),
+        ('{"path": "C:\\Users\\me"}', {"path": "C:\\Users\\me"}),
+        ("{'a': 'single', b: True, c: None}", {"a": "single", "b": True, "c": None}),
+        ('{\n  "a": "x"\n  "b": "y"\n}', {"a": "x", "b": "y"}),
+        ('{"a": "line one\nline two"}', {"a": "line one\nline two"}),
+        ('{"a": {"x": }, "b": 1}', {"a": {"x": None}, "b": 1}),
+        ('{"a":} Then I will search', {"a": None}),
+    ],
+    ids=[
+        "trailing_commas",
+        "markdown_fence",
+        "surrounding_prose",
+        "unescaped_quotes",
+        "truncated_string",
+        "missing_braces",
+        "invalid_escape",
+        "python_literals",
+        "missing_comma",
+        "raw_newline",
+        "missing_nested_value",
+        "missing_value_before_prose",
+    ],
+)
+def test_parse_tolerant_json(reply, expected):
+    assert parse_tolerant_json(reply) == expected
+
+
+def test_parse_tolerant_json_without_json():
+    with pytest.raises(json.JSONDecodeError):
+        parse_tolerant_json("I don't know what to do next.")
+
+
+def test_fix_json_using_multiple_techniques_skips_llm(mocker):
+    """Test that replies the tolerant parser can repair never reach the LLM."""
+    auto_fix_json = mocker.patch("autogpt.json_utils.json_fix_llm.auto_fix_json")
+    thoughts = {
+        "text": "t",
+        "reasoning": "r",
+        "plan": "p",
+        "criticism": "c",
+        "speak": "s",
+    }
+
+    result = fix_json_using_multiple_techniques(
+        f'{{"thoughts": {json.dumps(thoughts)}, "command": {{"name": "google",'
+        ' "args": {"query": "AAPL",},},'
+    )
+
+    assert result == {
+        "thoughts": thoughts,
+        "command": {"name": "google", "args": {"query": "AAPL"}},
+    }
+    auto_fix_json.assert_not_called()
+
+
+def test_fix_json_using_multiple_techniques_falls_back_to_llm(mocker):
+    """Test that repairs which do not match the response schema are not used."""
+    auto_fix_json = mocker.patch(
+        "autogpt.json_utils.json_fix_llm.auto_fix_json", return_value="failed"
+    )
+
+    fix_json_using_multiple_techniques('{"command": {"name": "google", "args": }')
+
+    auto_fix_json.assert_called()
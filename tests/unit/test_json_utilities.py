@@ -0,0 +1,49 @@
+import json
+
+from autogpt.json_utils import utilities
+from autogpt.json_utils.utilities import (
+    LLM_DEFAULT_RESPONSE_FORMAT,
+    get_schema_validator,
+    is_string_valid_json,
+    parse_and_validate_json,
+)
+
+VALID_REPLY = {
+    "thoughts": {
+        "text": "thought",
+        "reasoning": "reasoning",
+        "plan": "- plan",
+        "criticism": "criticism",
+        "speak": "speak",
+    },
+    "command": {"name": "do_nothing", "args": {}},
+}
+
+
+def test_schema_validator_is_built_once(mocker):
+    """Test that validating many messages never re-reads the schema file."""
+    get_schema_validator(LLM_DEFAULT_RESPONSE_FORMAT)
+    mock_open = mocker.patch("builtins.open")
+
+    for _ in range(3):
+        parse_and_validate_json(json.dumps(VALID_REPLY), LLM_DEFAULT_RESPONSE_FORMAT)
+
+    mock_open.assert_not_called()
+    assert get_schema_validator(LLM_DEFAULT_RESPONSE_FORMAT) is get_schema_validator(
+        LLM_DEFAULT_RESPONSE_FORMAT
+    )
+
+
+def test_parse_and_validate_json():
+    assert (
+        parse_and_validate_json(json.dumps(VALID_REPLY), LLM_DEFAULT_RESPONSE_FORMAT)
+        == VALID_REPLY
+    )
+    assert parse_and_validate_json("not json", LLM_DEFAULT_RESPONSE_FORMAT) is None
+
+
+def test_is_string_valid_json_logs_schema_errors(mocker):
+    error = mocker.spy(utilities.logger, "error")
+
+    assert is_string_valid_json('{"command": {}}', LLM_DEFAULT_RESPONSE_FORMAT)
+    error.assert_called_with("The JSON object is invalid.")
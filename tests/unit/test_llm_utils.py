@@ -131,3 +131,34 @@ def test_chunked_tokens():
     ]
     output = list(llm_utils.chunked_tokens(text, "cl100k_base", 8191))
     assert output == expected_output
+
+
+def test_get_ada_embeddings_batches_chunks(mocker, config):
+    mocker.patch.object(llm_utils, "EMBEDDING_BATCH_SIZE", 2)
+    # "long" is split into two chunks, weighted by their token counts
+    chunks = {"short": [(1,)], "long": [(1, 2, 3), (4,)]}
+    mocker.patch.object(
+        llm_utils,
+        "chunked_tokens",
+        side_effect=lambda text, tokenizer_name, chunk_length: iter(chunks[text]),
+    )
+    chunk_embeddings = {(1,): [1.0, 0.0], (1, 2, 3): [0.0, 1.0], (4,): [1.0, 0.0]}
+
+    def create(input, **kwargs):
+        response = mocker.MagicMock()
+        response.usage.prompt_tokens = sum(len(chunk) for chunk in input)
+        response.__getitem__.return_value = [
+            {"index": i, "embedding": chunk_embeddings[chunk]}
+            for i, chunk in reversed(list(enumerate(input)))
+        ]
+        return response
+
+    embedding_create = mocker.patch(
+        "autogpt.llm.llm_utils.openai.Embedding.create", side_effect=create
+    )
+
+    embeddings = llm_utils.get_ada_embeddings(["short", "long"])
+
+    assert embedding_create.call_count == 2
+    assert embeddings[0] == pytest.approx([1.0, 0.0])
+    assert embeddings[1] == pytest.approx([0.316228, 0.948683], abs=1e-6)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from autogpt.memory.local_eviction import EvictionPolicy
+
+
+def test_needs_eviction():
+    policy = EvictionPolicy(max_entries=2)
+    policy.update(np.array([10, 10]), now=0)
+    assert not policy.needs_eviction(now=0)
+
+    policy.update(np.array([10]), now=1)
+    assert policy.needs_eviction(now=1)
+
+
+def test_select_evicts_least_recently_retrieved():
+    policy = EvictionPolicy(max_entries=10)
+    policy.update(np.full(12, 10), now=0)
+    policy.touch([0, 1, 2], now=5)
+    policy.touch([0], now=6)
+
+    keep = policy.select(now=10)
+
+    # Back under 90% of the limit, the never retrieved memories go first
+    assert keep.tolist() == [0, 1, 2, 6, 7, 8, 9, 10, 11]
+
+
+def test_select_evicts_for_bytes():
+    policy = EvictionPolicy(max_bytes=100)
+    policy.update(np.array([50, 30, 40]), now=0)
+
+    assert policy.select(now=0).tolist() == [1, 2]
+
+
+def test_select_evicts_expired_memories():
+    policy = EvictionPolicy(ttl=10)
+    policy.update(np.array([1, 1]), now=0)
+    policy.update(np.array([1]), now=5)
+
+    assert policy.needs_eviction(now=12)
+    assert policy.select(now=12).tolist() == [2]
+
+
+def test_compact_keeps_memories_added_since_selection():
+    policy = EvictionPolicy(max_entries=2)
+    policy.update(np.array([1, 2, 3]), now=0)
+    keep = policy.select(now=0)
+    policy.update(np.array([4]), now=1)
+
+    policy.compact(keep, count=3)
+
+    assert policy.size == 2
+    assert policy.sizes.tolist() == [3, 4]
+    assert policy.total_bytes == 7
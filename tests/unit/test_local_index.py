@@ -0,0 +1,56 @@
+import numpy as np
+
+from autogpt.memory.local_index import IVFIndex, exact_search, top_k_indices
+
+
+def clustered_embeddings(count: int, dim: int = 64, clusters: int = 32, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)]
+    vectors += 0.3 * rng.standard_normal((count, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+
+    assert top_k_indices(scores, 2).tolist() == [1, 3]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 0]
+    assert top_k_indices(scores[:0], 3).tolist() == []
+
+
+def test_ivf_index_searches_small_memories_exactly():
+    embeddings = clustered_embeddings(100)
+    index = IVFIndex(min_train_size=1000)
+
+    result = index.search(embeddings, embeddings[0], 5)
+
+    assert not index.is_trained
+    assert result.tolist() == exact_search(embeddings, embeddings[0], 5).tolist()
+
+
+def test_ivf_index_recall():
+    embeddings = clustered_embeddings(5000)
+    index = IVFIndex(nprobe=8, min_train_size=1000)
+    queries = embeddings[:50]
+
+    hits = 0
+    for query in queries:
+        expected = set(exact_search(embeddings, query, 10).tolist())
+        hits += len(expected & set(index.search(embeddings, query, 10).tolist()))
+
+    assert index.is_trained
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_ivf_index_update_after_training():
+    embeddings = clustered_embeddings(2000)
+    index = IVFIndex(min_train_size=1000)
+    index.search(embeddings[:1500], embeddings[0], 1)
+    assert index.size == 1500
+
+    index.update(embeddings)
+
+    assert index.size == 2000
+    assert index.search(embeddings, embeddings[1999], 1).tolist() == [1999]
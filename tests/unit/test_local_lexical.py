@@ -0,0 +1,55 @@
+import numpy as np
+
+from autogpt.memory.local_lexical import (
+    BM25Index,
+    is_keyword_query,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def test_tokenize_keeps_tickers_and_form_types():
+    assert tokenize("BRK.B filed a 10-K, see S-1.") == [
+        "brk.b",
+        "brkb",
+        "filed",
+        "a",
+        "10-k",
+        "10k",
+        "see",
+        "s-1",
+        "s1",
+    ]
+
+
+def test_is_keyword_query():
+    assert is_keyword_query("AAPL")
+    assert is_keyword_query("AAPL 10-K")
+    assert is_keyword_query("$MSFT 10Q")
+    assert is_keyword_query("037833100")
+    assert not is_keyword_query("apple revenue")
+    assert not is_keyword_query("What did AAPL report")
+    assert not is_keyword_query("")
+
+
+def test_bm25_index_ranks_matches():
+    index = BM25Index()
+    texts = [
+        "AAPL quarterly report",
+        "AAPL AAPL annual 10-K report",
+        "MSFT annual report",
+    ]
+    index.update(texts[:2])
+    index.update(texts)
+
+    assert index.size == 3
+    assert index.search("AAPL", 5).tolist() == [1, 0]
+    assert index.search("annual 10K", 1).tolist() == [1]
+    assert index.search("GOOG", 5).tolist() == []
+
+
+def test_reciprocal_rank_fusion():
+    rankings = [np.array([0, 1, 2]), np.array([1, 3])]
+
+    assert reciprocal_rank_fusion(rankings, [0.5, 0.5], 2) == [1, 0]
+    assert reciprocal_rank_fusion(rankings, [1.0, 0.0], 3) == [0, 1, 2]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from autogpt.memory.local_index import exact_search
+from autogpt.memory.local_quantization import ScalarQuantizer
+from tests.unit.test_local_index import clustered_embeddings
+
+
+@pytest.mark.parametrize("mode, itemsize", [("float16", 2), ("int8", 1)])
+def test_scalar_quantizer_search(mode, itemsize):
+    embeddings = clustered_embeddings(2000)
+    quantizer = ScalarQuantizer(mode, rerank_factor=4)
+
+    for query in embeddings[:20]:
+        expected = exact_search(embeddings, query, 5).tolist()
+        assert quantizer.search(embeddings, query, 5).tolist() == expected
+
+    assert quantizer.size == 2000
+    assert quantizer.nbytes == 2000 * (64 * itemsize + 4)
+
+
+def test_scalar_quantizer_int8_scores():
+    embeddings = clustered_embeddings(100)
+    quantizer = ScalarQuantizer("int8")
+    quantizer.update(embeddings)
+
+    scores = quantizer.scores(embeddings[0])
+
+    np.testing.assert_allclose(scores, embeddings @ embeddings[0], atol=0.02)
+
+
+def test_scalar_quantizer_update_is_incremental():
+    embeddings = clustered_embeddings(100)
+    quantizer = ScalarQuantizer("int8")
+    quantizer.update(embeddings[:30])
+    codes = quantizer.codes[:30].copy()
+
+    quantizer.update(embeddings)
+
+    assert quantizer.size == 100
+    np.testing.assert_array_equal(quantizer.codes[:30], codes)
+
+
+def test_scalar_quantizer_unknown_mode():
+    with pytest.raises(ValueError):
+        ScalarQuantizer("int4")
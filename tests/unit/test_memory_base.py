@@ -0,0 +1,41 @@
+from autogpt.memory.no_memory import NoMemory
+
+
+def test_get_relevant_many_without_search_many(config, mocker):
+    get_ada_embeddings = mocker.patch("autogpt.memory.base.get_ada_embeddings")
+    memory = NoMemory(config)
+
+    relevant = memory.get_relevant_many(["a", "b"])
+
+    get_ada_embeddings.assert_not_called()
+    assert [(memories.query, memories.results) for memories in relevant] == [
+        ("a", None),
+        ("b", None),
+    ]
+    assert memory.get_relevant_many([]) == []
+
+
+def test_cached_stats_refresh_in_background(config, mocker):
+    memory = NoMemory(config)
+    get_stats = mocker.patch.object(
+        memory, "get_stats", side_effect=[{"n": 1}, {"n": 2}]
+    )
+
+    assert memory.cached_stats() is None
+    memory._stats_cache._refresh.join()
+    assert memory.cached_stats() == {"n": 1}
+    assert get_stats.call_count == 1
+
+    memory._stats_cache.updated_at -= 61
+    assert memory.cached_stats() == {"n": 1}
+    memory._stats_cache._refresh.join()
+    assert memory.cached_stats() == {"n": 2}
+
+
+def test_batch_search_defaults(config):
+    memory = NoMemory(config)
+
+    assert not memory.supports_search_many
+    assert memory.search_many([[1.0], [0.0]]) == [[], []]
+    assert not memory.supports_nearest_similarities
+    assert memory.nearest_similarities([[1.0], [0.0]]) == [0.0, 0.0]
@@ -0,0 +1,111 @@
+import pytest
+
+from autogpt.llm import ApiManager, ModelRouter
+from autogpt.llm.model_router import (
+    PLANNING_CALL_SITE,
+    SUMMARY_CALL_SITE,
+    parse_latency_slos,
+)
+
+
+@pytest.fixture
+def router(config, api_manager, mocker):
+    mocker.patch.multiple(
+        config,
+        use_model_routing=True,
+        fast_llm_model="gpt-3.5-turbo",
+        smart_llm_model="gpt-4",
+        fast_token_limit=4000,
+        smart_token_limit=8000,
+        model_routing_latency_slos="",
+    )
+    model_router = ModelRouter()
+    model_router.reset()
+    return model_router
+
+
+def test_routing_disabled_uses_fast_model(router, config, mocker):
+    mocker.patch.object(config, "use_model_routing", False)
+
+    decision = router.route(PLANNING_CALL_SITE, prompt_tokens=7000)
+
+    assert decision.model == "gpt-3.5-turbo"
+    assert not decision.escalated
+
+
+def test_routing_disabled_does_not_count_tokens(router, config, mocker):
+    mocker.patch.object(config, "use_model_routing", False)
+    count_tokens = mocker.Mock(side_effect=NotImplementedError)
+
+    decision = router.route(PLANNING_CALL_SITE, prompt_tokens=count_tokens)
+
+    assert decision.model == "gpt-3.5-turbo"
+    count_tokens.assert_not_called()
+
+
+def test_prompt_tokens_are_counted_when_routing(router, mocker):
+    decision = router.route(PLANNING_CALL_SITE, prompt_tokens=lambda: 5000)
+
+    assert decision.model == "gpt-4"
+    decision = router.route(
+        PLANNING_CALL_SITE, prompt_tokens=mocker.Mock(side_effect=NotImplementedError)
+    )
+    assert decision.model == "gpt-3.5-turbo"
+
+
+def test_small_prompt_stays_on_fast_model(router):
+    decision = router.route(PLANNING_CALL_SITE, prompt_tokens=1000)
+
+    assert decision.model == "gpt-3.5-turbo"
+    assert decision.token_limit == 4000
+
+
+def test_large_prompt_escalates_to_smart_model(router):
+    decision = router.route(
+        PLANNING_CALL_SITE, prompt_tokens=3500, completion_tokens=1000
+    )
+
+    assert decision.model == "gpt-4"
+    assert decision.token_limit == 8000
+    assert decision.escalated
+
+
+def test_escalation_refused_when_over_budget(router, api_manager):
+    api_manager.set_total_budget(0.01)
+
+    decision = router.route(PLANNING_CALL_SITE, prompt_tokens=5000)
+
+    assert decision.model == "gpt-3.5-turbo"
+
+
+def test_slow_fast_model_escalates(router, api_manager):
+    api_manager.record_latency("gpt-3.5-turbo", 30.0)
+    api_manager.record_latency("gpt-4", 5.0)
+
+    decision = router.route(SUMMARY_CALL_SITE, prompt_tokens=100)
+
+    assert decision.model == "gpt-4"
+    assert router.get_decision_counts() == {(SUMMARY_CALL_SITE, "gpt-4"): 1}
+
+
+def test_slow_fast_model_stays_without_smart_model_latency(router, api_manager):
+    api_manager.record_latency("gpt-3.5-turbo", 30.0)
+
+    decision = router.route(SUMMARY_CALL_SITE, prompt_tokens=100)
+
+    assert decision.model == "gpt-3.5-turbo"
+
+
+def test_latency_within_slo_does_not_escalate(router, api_manager):
+    api_manager.record_latency("gpt-3.5-turbo", 5.0)
+
+    decision = router.route(SUMMARY_CALL_SITE, prompt_tokens=100)
+
+    assert decision.model == "gpt-3.5-turbo"
+
+
+def test_parse_latency_slos():
+    assert parse_latency_slos("planning:10, summary:2.5,bogus:x,") == {
+        "planning": 10.0,
+        "summary": 2.5,
+    }
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+redismem = pytest.importorskip("autogpt.memory.redismem")
+RedisMemory = redismem.RedisMemory
+
+
+@pytest.fixture
+def redis_memory(config, mocker):
+    client = mocker.patch("autogpt.memory.redismem.redis.Redis").return_value
+    client.get.return_value = b"5"
+    RedisMemory._instances.pop(RedisMemory, None)
+    memory = RedisMemory(config)
+    yield memory
+    RedisMemory._instances.pop(RedisMemory, None)
+
+
+def test_ingest_allocates_keys_on_the_server(redis_memory, config):
+    client = redis_memory.redis
+    client.incrby.side_effect = [7, 9]
+    embeddings = np.eye(3, 1536, dtype=np.float32)
+
+    stats = redis_memory.ingest(["a", "b", "c"], embeddings, pipeline_size=2)
+
+    assert stats.count == 3
+    assert stats.throughput > 0
+    assert [call.args for call in client.incrby.call_args_list] == [
+        (f"{config.memory_index}-vec_num", 2),
+        (f"{config.memory_index}-vec_num", 1),
+    ]
+    pipe = client.pipeline.return_value
+    hsets = pipe.hset.call_args_list
+    assert [call.args[0] for call in hsets] == [
+        f"{config.memory_index}:5",
+        f"{config.memory_index}:6",
+        f"{config.memory_index}:8",
+    ]
+    assert hsets[2].kwargs["mapping"] == {
+        b"data": "c",
+        "embedding": embeddings[2].tobytes(),
+    }
+    assert pipe.execute.call_count == 2
+    assert redis_memory.vec_num == 9
+
+
+def test_add_many_embeds_missing_embeddings(redis_memory, mocker):
+    redis_memory.redis.incrby.return_value = 2
+    get_ada_embeddings = mocker.patch(
+        "autogpt.memory.redismem.get_ada_embeddings",
+        return_value=[[0.5] * 1536, [0.25] * 1536],
+    )
+
+    added = redis_memory.add_many(["a", "Command Error: b", "c"])
+
+    assert added == ["a", "c"]
+    get_ada_embeddings.assert_called_once_with(["a", "c"])
+
+
+def test_add_uses_server_counter(redis_memory, mocker, config):
+    mocker.patch("autogpt.memory.redismem.get_ada_embedding", return_value=[0.1] * 1536)
+    redis_memory.redis.incr.return_value = 12
+
+    assert redis_memory.add("a").startswith("Inserting data into memory at index: 11")
+    redis_memory.redis.hset.assert_called_once()
+    assert redis_memory.redis.hset.call_args.args[0] == f"{config.memory_index}:11"
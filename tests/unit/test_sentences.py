@@ -0,0 +1,61 @@
+import pytest
+
+from autogpt.processing.sentences import RegexSegmenter, get_sentence_segmenter
+
+
+@pytest.fixture
+def segmenter():
+    return RegexSegmenter()
+
+
+def test_regex_splits_sentences(segmenter):
+    assert segmenter.split("Sales rose. Costs fell!  Why?\nNobody knows") == [
+        "Sales rose.",
+        "Costs fell!",
+        "Why?",
+        "Nobody knows",
+    ]
+
+
+def test_regex_keeps_numbers_and_tickers(segmenter):
+    assert segmenter.split(
+        "Revenue reached $1.5B in Q3, up 12.4%. BRK.B and BF.B rose 0.5 points."
+    ) == [
+        "Revenue reached $1.5B in Q3, up 12.4%.",
+        "BRK.B and BF.B rose 0.5 points.",
+    ]
+
+
+def test_regex_keeps_abbreviations(segmenter):
+    assert segmenter.split(
+        "Apple Inc. hired Dr. Smith in Jan. 2020. See Fig. 3 for details."
+    ) == ["Apple Inc. hired Dr. Smith in Jan. 2020.", "See Fig. 3 for details."]
+
+
+def test_regex_keeps_initials(segmenter):
+    assert segmenter.split(
+        "J. P. Morgan sold U.S. bonds. Peers, e.g. Citi, did too."
+    ) == ["J. P. Morgan sold U.S. bonds.", "Peers, e.g. Citi, did too."]
+
+
+def test_regex_does_not_split_before_lowercase(segmenter):
+    assert segmenter.split("It rose approx. ten percent... then fell.") == [
+        "It rose approx. ten percent... then fell."
+    ]
+
+
+def test_regex_keeps_closing_quotes(segmenter):
+    assert segmenter.split('He said "we beat." (It did.) Shares rose.') == [
+        'He said "we beat."',
+        "(It did.)",
+        "Shares rose.",
+    ]
+
+
+def test_regex_handles_empty_text(segmenter):
+    assert segmenter.split("  \n ") == []
+
+
+def test_unknown_segmenter():
+    with pytest.raises(ValueError):
+        get_sentence_segmenter("nltk", "en_core_web_sm")
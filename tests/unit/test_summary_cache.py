@@ -0,0 +1,51 @@
+import pytest
+
+from autogpt.processing.summary_cache import SummaryCache
+
+
+@pytest.fixture
+def cache():
+    SummaryCache._instances.pop(SummaryCache, None)
+    yield SummaryCache(max_entries=2, ttl=60)
+    SummaryCache._instances.pop(SummaryCache, None)
+
+
+def test_get_summary_by_normalized_url_and_content(cache):
+    cache.set_summary("https://example.com/page/#top", "text", "q", "gpt", "summary")
+
+    assert cache.get_summary("HTTPS://example.com:443/page", "text", "q", "gpt") == (
+        "summary"
+    )
+    assert cache.get_summary("https://example.com/page", "new text", "q", "gpt") is None
+    assert cache.get_summary("https://example.com/page", "text", "q2", "gpt") is None
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_least_recently_used_summary_is_evicted(cache):
+    cache.set_chunk_summary("a", "q", "gpt", "A")
+    cache.set_chunk_summary("b", "q", "gpt", "B")
+    assert cache.get_chunk_summary("a", "q", "gpt") == "A"
+
+    cache.set_chunk_summary("c", "q", "gpt", "C")
+
+    assert len(cache) == 2
+    assert cache.get_chunk_summary("b", "q", "gpt") is None
+    assert cache.get_chunk_summary("a", "q", "gpt") == "A"
+
+
+def test_summaries_expire(cache, mocker):
+    time = mocker.patch("autogpt.processing.summary_cache.time.time", return_value=0)
+    cache.set_chunk_summary("a", "q", "gpt", "A")
+
+    time.return_value = 61
+
+    assert cache.get_chunk_summary("a", "q", "gpt") is None
+    assert len(cache) == 0
+
+
+def test_disabled_cache_stores_nothing(cache):
+    cache.max_entries = 0
+    cache.set_chunk_summary("a", "q", "gpt", "A")
+
+    assert cache.get_chunk_summary("a", "q", "gpt") is None
@@ -0,0 +1,175 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import spacy
+
+from autogpt.memory.no_memory import NoMemory
+from autogpt.processing import sentences, text
+from autogpt.processing.summary_cache import SummaryCache
+
+
+@pytest.fixture(autouse=True)
+def blank_spacy(mocker):
+    mocker.patch.object(spacy, "load", side_effect=lambda _: spacy.blank("en"))
+    sentences.get_sentence_segmenter.cache_clear()
+    yield
+    sentences.get_sentence_segmenter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def summary_cache():
+    SummaryCache._instances.pop(SummaryCache, None)
+    yield SummaryCache(max_entries=100, ttl=0)
+    SummaryCache._instances.pop(SummaryCache, None)
+
+
+@pytest.fixture
+def word_tokens(mocker):
+    # One token per word, and 10 tokens for the prompt around the chunk
+    mocker.patch.object(
+        text,
+        "count_message_tokens",
+        side_effect=lambda messages, model: 10 if messages[0]["content"] else 0,
+    )
+    return mocker.patch.object(
+        text,
+        "count_strings_tokens",
+        side_effect=lambda strings, model: [len(s.split()) for s in strings],
+    )
+
+
+def test_sentence_segmenter_is_loaded_once():
+    segmenter = sentences.get_sentence_segmenter("spacy", "model")
+
+    assert sentences.get_sentence_segmenter("spacy", "model") is segmenter
+    assert spacy.load.call_count == 1
+
+
+def test_split_sentences_in_pieces(mocker):
+    mocker.patch.object(sentences, "SPACY_PIECE_LENGTH", 30)
+
+    split = text.split_sentences("First one is here. Second one. Third one is here.")
+
+    assert split == ["First one is here.", "Second one.", "Third one is here."]
+
+
+def test_split_sentences_with_regex_segmenter(mocker):
+    mocker.patch.object(text.CFG, "browse_sentence_segmenter", "regex")
+
+    split = text.split_sentences("Revenue was $1.5B. Mr. Cook said so.")
+
+    assert split == ["Revenue was $1.5B.", "Mr. Cook said so."]
+    assert spacy.load.call_count == 0
+
+
+def test_split_text_counts_tokens_per_sentence(word_tokens):
+    chunks = list(
+        text.split_text(
+            "One two three. Four five.\nSix seven eight nine.", max_length=16
+        )
+    )
+
+    assert chunks == ["One two three. Four five.", "Six seven eight nine."]
+    word_tokens.assert_called_once()
+
+
+def test_split_text_rejects_long_sentence(word_tokens):
+    with pytest.raises(ValueError):
+        list(text.split_text("One two three four five six seven.", max_length=14))
+
+
+@pytest.fixture
+def summarize_mocks(mocker, word_tokens, config):
+    mocker.patch.object(text, "get_memory")
+    mocker.patch.object(text, "split_text", side_effect=lambda t, **_: t.split("|"))
+
+    def create_chat_completion(model, messages, call_site):
+        content = messages[0]["content"].split('"""')[1]
+        # Later chunks finish first
+        time.sleep({"a": 0.03, "b": 0.02, "c": 0.01}.get(content, 0))
+        calls.append(content)
+        return f"S({content})"
+
+    calls = []
+    mocker.patch.object(
+        text, "create_chat_completion", side_effect=create_chat_completion
+    )
+    mocker.patch.object(text, "ModelRouter")
+    return calls
+
+
+def test_summarize_text_keeps_chunk_order(summarize_mocks, mocker):
+    mocker.patch.object(text.CFG, "browse_summary_concurrency", 4)
+
+    summary = text.summarize_text("url", "a|b|c|d", "question")
+
+    assert summary == "S(S(a)\nS(b)\nS(c)\nS(d))"
+    assert summarize_mocks[:4] == ["d", "c", "b", "a"]
+    assert len(summarize_mocks) == 5
+    add_many = text.get_memory.return_value.add_many
+    add_many.assert_called_once()
+    added = add_many.call_args.args[0]
+    assert len(added) == 8
+    assert added[:2] == [
+        "Source: url\nRaw content part#1: a",
+        "Source: url\nContent summary part#1: S(a)",
+    ]
+
+
+def test_summarize_text_reduces_long_summaries(summarize_mocks, mocker):
+    mocker.patch.object(text.CFG, "browse_chunk_max_length", 12)
+
+    summary = text.summarize_text("url", "a|b|c|d", "question")
+
+    # With the 10 prompt tokens, the 4 one-word summaries are reduced in pairs,
+    # then the 2 two-word summaries are reduced to one before the final summary
+    assert summary == "S(S(S(S(a)\nS(b))\nS(S(c)\nS(d))))"
+    assert len(summarize_mocks) == 8
+
+
+def test_reduce_summaries_cuts_summaries_that_fill_a_chunk(word_tokens, mocker):
+    mocker.patch.object(text.CFG, "browse_chunk_max_length", 15)
+    mocker.patch.object(text.CFG, "browse_sentence_segmenter", "regex")
+    summarize = mocker.patch.object(text, "summarize_messages", return_value="S")
+
+    with ThreadPoolExecutor() as executor:
+        summary = text.reduce_summaries(
+            ["One two. Three four.", "Five six. Seven eight."], "q", "model", executor
+        )
+
+    # Each summary fills the 4 tokens left after the 11 prompt tokens, so they
+    # are cut to 2 tokens before they are paired
+    assert summary == ["S"]
+    messages, _ = summarize.call_args.args
+    assert '"""One two.\nFive six."""' in messages[0]["content"]
+
+
+def test_summarize_text_reuses_cached_summaries(summarize_mocks):
+    assert text.summarize_text("https://a.com/x", "a|b", "q") == "S(S(a)\nS(b))"
+    assert text.summarize_text("https://A.com/x/", "a|b", "q") == "S(S(a)\nS(b))"
+    assert len(summarize_mocks) == 3
+
+    # Only the changed chunk and the final summary are requested again
+    assert text.summarize_text("https://a.com/x", "a|c", "q") == "S(S(a)\nS(c))"
+    assert summarize_mocks[3:] == ["c", "S(a)\nS(c)"]
+
+
+@pytest.mark.parametrize("write_behind", [True, False])
+def test_add_memories_adds_in_bulk(mocker, write_behind):
+    mocker.patch.object(text.CFG, "memory_write_behind", write_behind)
+    memory = mocker.Mock()
+
+    text.add_memories(memory, ["a", "b"])
+
+    # The provider, or the write-behind buffer, embeds what it adds
+    memory.add_many.assert_called_once_with(["a", "b"])
+
+
+def test_add_memories_without_bulk_insert(config, mocker):
+    memory = NoMemory(config)
+    add = mocker.patch.object(memory, "add")
+
+    text.add_memories(memory, ["a", "b"])
+
+    assert add.call_count == 2
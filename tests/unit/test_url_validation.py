@@ -1,7 +1,7 @@
 import pytest
 from pytest import raises
 
-from autogpt.url_utils.validators import validate_url
+from autogpt.url_utils.validators import normalize_url, validate_url
 
 
 @validate_url
@@ -57,3 +57,15 @@ local_file = (
 def test_url_validation_fails_local_path(url):
     with raises(ValueError, match="Access to local files is restricted"):
         dummy_method(url)
+
+
+normalized_urls = (
+    ("HTTPS://Example.com:443/a/?b=2&a=1#top", "https://example.com/a?a=1&b=2"),
+    ("http://example.com:80", "http://example.com/"),
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+)
+
+
+@pytest.mark.parametrize("url, expected", normalized_urls)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
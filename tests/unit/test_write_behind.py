@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from autogpt.memory.write_behind import WriteBehindMemory
+from tests.mocks.mock_memory import BatchedListMemory, ListMemory
+
+
+@pytest.fixture
+def batched_memory():
+    BatchedListMemory._instances.pop(BatchedListMemory, None)
+    memory = WriteBehindMemory(BatchedListMemory(), max_queue_size=10, batch_size=3)
+    yield memory
+    memory.shutdown()
+
+
+def test_add_batches_writes(batched_memory):
+    for text in ["a", "bb", "ccc", "dddd"]:
+        assert batched_memory.add(text) == text
+
+    batched_memory.flush()
+
+    assert batched_memory.memory.texts == ["a", "bb", "ccc", "dddd"]
+    assert batched_memory.memory.batches == [["a", "bb", "ccc"], ["dddd"]]
+    assert batched_memory.written == 4
+
+
+def test_command_errors_are_not_added(batched_memory):
+    # Like the providers, which do not store command errors
+    assert batched_memory.add("Command Error: c") == ""
+    assert batched_memory.add_many(["a", "Command Error: c"]) == ["a"]
+
+    batched_memory.flush()
+
+    assert batched_memory.memory.texts == ["a"]
+
+
+def test_get_relevant_reads_own_writes(batched_memory):
+    batched_memory.add("AAPL 10-K")
+
+    assert batched_memory.get_relevant("AAPL", 1) == ["AAPL 10-K"]
+    assert batched_memory.get_stats() == 1
+
+
+def test_add_blocks_when_queue_is_full(mocker):
+    BatchedListMemory._instances.pop(BatchedListMemory, None)
+    provider = BatchedListMemory()
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_add_many(data, embeddings=None):
+        writing.set()
+        release.wait()
+        provider.texts.extend(data)
+
+    mocker.patch.object(provider, "add_many", side_effect=slow_add_many)
+    memory = WriteBehindMemory(provider, max_queue_size=1, batch_size=1)
+    memory.add("first")
+    writing.wait(timeout=5)
+    memory.add("second")
+
+    third = threading.Thread(target=memory.add, args=("third",))
+    third.start()
+    third.join(timeout=0.2)
+    assert third.is_alive()
+
+    release.set()
+    third.join(timeout=5)
+    memory.shutdown()
+    assert provider.texts == ["first", "second", "third"]
+
+
+def test_provider_without_add_many():
+    ListMemory._instances.pop(ListMemory, None)
+    memory = WriteBehindMemory(ListMemory(), max_queue_size=10, batch_size=10)
+
+    memory.add("a")
+    memory.add("b")
+    memory.shutdown()
+
+    assert memory.memory.texts == ["a", "b"]
+    # Writes after shutdown go straight to the provider
+    memory.add("c")
+    assert memory.memory.texts == ["a", "b", "c"]
+
+
+def test_failed_writes_are_counted(batched_memory, mocker):
+    mocker.patch.object(batched_memory.memory, "add_many", side_effect=IOError)
+
+    batched_memory.add("a")
+    batched_memory.flush()
+
+    assert batched_memory.failed == 1
+    assert batched_memory.written == 0